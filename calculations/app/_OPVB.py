@@ -128,8 +128,8 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Tuple
+from dataclasses import dataclass, field
+from typing import ClassVar, List, Tuple
 import math
 
 
@@ -230,6 +230,76 @@ def _require_non_negative(name: str, value: float) -> None:
         raise ValueError(f"{name} должно быть >= 0, получено: {value}")
 
 
+# ======================================================================
+# ТРАССИРОВКА РАСЧЁТА (подробный вывод промежуточных величин)
+# ======================================================================
+
+@dataclass
+class Trace:
+    """
+    Накопитель трассировки.
+
+    Идея:
+    - функции расчёта добавляют в Trace сырые записи (имя, значение, ед., комментарий)
+    - текст "имя = значение (ед.)" собирается только в dump()
+
+    Это удобно для проверки "цепочки расчётов" и сопоставления с методикой.
+    Без трассировки функции получают NO_TRACE: вызовы add() ничего не делают.
+    """
+    entries: List[tuple] = field(default_factory=list)
+
+    enabled: ClassVar[bool] = True
+
+    def add(self, name: str, value, unit: str = "", comment: str = "") -> None:
+        self.entries.append((name, value, unit, comment))
+
+    def add_sep(self, title: str) -> None:
+        self.entries.append((None, title))
+
+    def add_text(self, text: str) -> None:
+        self.entries.append((text,))
+
+    @property
+    def lines(self) -> List[str]:
+        lines: List[str] = []
+        for entry in self.entries:
+            if len(entry) == 1:
+                lines.append(entry[0])
+            elif len(entry) == 2:
+                lines.append("")
+                lines.append(f"--- {entry[1]} ---")
+            else:
+                name, value, unit, comment = entry
+                unit_str = f" {unit}" if unit else ""
+                comment_str = f" — {comment}" if comment else ""
+                lines.append(f"{name} = {value}{unit_str}{comment_str}")
+        return lines
+
+    def dump(self) -> str:
+        return "\n".join(self.lines)
+
+
+class NullTrace:
+    """Трассировка выключена: записи не создаются."""
+
+    enabled = False
+
+    def add(self, name: str, value, unit: str = "", comment: str = "") -> None:
+        pass
+
+    def add_sep(self, title: str) -> None:
+        pass
+
+    def add_text(self, text: str) -> None:
+        pass
+
+    def dump(self) -> str:
+        return ""
+
+
+NO_TRACE = NullTrace()
+
+
 # ======================================================================
 # П. 1.1 — РАСЧЁТНЫЕ ФУНКЦИИ
 # ======================================================================
@@ -253,7 +323,7 @@ def beta1(P_mpa: float, P0_mpa: float, k: float) -> float:
     return (1.0 / (k - 1.0)) * (1.0 - (P0_mpa / P_mpa) ** ((k - 1.0) / k))
 
 
-def adiabatic_expansion_energy_kj(data: BlockData) -> float:
+def adiabatic_expansion_energy_kj(data: BlockData, tr: Trace | NullTrace = NO_TRACE) -> float:
     """
     Энергия адиабатического расширения A, кДж.
 
@@ -266,21 +336,31 @@ def adiabatic_expansion_energy_kj(data: BlockData) -> float:
     _require_positive("V_m3", data.V_m3)
     _require_positive("k", data.k)
 
+    tr.add("P", data.P_mpa, "МПа", "абсолютное давление в блоке")
+    tr.add("P0", data.P0_mpa, "МПа", "атмосферное/опорное абсолютное давление")
+    tr.add("V'", data.V_m3, "м³", "объём ПГФ в блоке")
+    tr.add("k", data.k, "", "показатель адиабаты")
+
     P_excess_mpa = data.P_mpa - data.P0_mpa  # избыточное давление, МПа
     PV_mpa_m3 = data.P_mpa * data.V_m3  # P*V', МПа·м³
+    tr.add("Pизб", P_excess_mpa, "МПа", "избыточное давление")
+    tr.add("P*V'", PV_mpa_m3, "МПа·м³", "проверка малости для A")
 
     # Условие методики: A можно не учитывать при малости Pизб и PV.
     if P_excess_mpa < 0.07 and PV_mpa_m3 < 0.02:
+        tr.add("A", 0.0, "кДж", "не учитываем по условию (малые Pизб и PV)")
         return 0.0
 
     b1 = beta1(data.P_mpa, data.P0_mpa, data.k)
+    tr.add("β1", b1, "", "коэффициент для A = β1·P·V'")
 
     # 1 МПа·м³ = 1000 кДж
     A_kj = b1 * PV_mpa_m3 * 1000.0
+    tr.add("A", A_kj, "кДж", "1 МПа·м³ = 1000 кДж")
     return A_kj
 
 
-def mass_after_expansion_kg(data: BlockData) -> float:
+def mass_after_expansion_kg(data: BlockData, tr: Trace | NullTrace = NO_TRACE) -> float:
     """
     Масса ПГФ G1', кг, по формулам методики:
 
@@ -299,21 +379,44 @@ def mass_after_expansion_kg(data: BlockData) -> float:
     _require_positive("rho_kg_m3", data.rho_kg_m3)
     _require_positive("k", data.k)
 
+    tr.add("T1", data.T1_K, "К", "температура в блоке")
+    tr.add("ρ", data.rho_kg_m3, "кг/м³", "плотность при P и T1")
+
     # Температура после адиабатического расширения
     T_K = data.T1_K * (data.P0_mpa / data.P_mpa) ** ((data.k - 1.0) / data.k)
+    tr.add("T", T_K, "К", "после адиабатического расширения")
 
     # Плотность после расширения
     rho0_kg_m3 = data.rho_kg_m3 * (data.P0_mpa / data.P_mpa) ** (1.0 / data.k)
+    tr.add("ρ0'", rho0_kg_m3, "кг/м³", "после расширения")
 
     # Приведение объёма к «нормальным/опорным» условиям, как в методике
     V0_m3 = (data.P_mpa / data.P0_mpa) * (data.V_m3 / data.T1_K) * T_K
+    tr.add("V0'", V0_m3, "м³", "приведённый объём")
 
     # Масса
     G1_kg = V0_m3 * rho0_kg_m3
+    tr.add("G1'", G1_kg, "кг", "масса ПГФ для E1'")
+
+    if tr.enabled:
+        # Контрольная проверка: при определённой трактовке ρ формулы могут сократиться,
+        # и получится тождество G1' = V' * ρ.
+        # Если вы задаёте ρ как плотность при P и T1 (внутри блока),
+        # то это равенство будет выполняться почти точно.
+        # Если же по методике ρ должна быть при других условиях (например, при опорных/нормальных),
+        # тождество нарушится — и это будет индикатором корректной трактовки входных данных.
+        G1_check = data.V_m3 * data.rho_kg_m3
+        tr.add("G1_check = V'·ρ", G1_check, "кг", "контроль: V' * ρ")
+        rel = abs(G1_kg - G1_check) / max(abs(G1_check), 1e-12)
+        tr.add("rel_err", rel, "", "относит. расхождение G1' и V'·ρ")
+        if rel < 1e-6:
+            tr.add("ПРИМЕЧАНИЕ", "G1'≈V'·ρ", "",
+                   "проверьте, что ρ задана в тех условиях, которые подразумевает методика")
+
     return G1_kg
 
 
-def energy_in_block_kj(data: BlockData) -> Tuple[float, float, float]:
+def energy_in_block_kj(data: BlockData, tr: Trace | NullTrace = NO_TRACE) -> Tuple[float, float, float]:
     """
     Итог для п. 1.1:
         E1' = G1' * q + A
@@ -322,10 +425,17 @@ def energy_in_block_kj(data: BlockData) -> Tuple[float, float, float]:
         (E1_kj, G1_kg, A_kj)
     """
     _require_positive("q_kj_kg", data.q_kj_kg)
+    tr.add_sep("П.1.1 — ПГФ в блоке")
+
+    A = adiabatic_expansion_energy_kj(data, tr)
+    G1 = mass_after_expansion_kg(data, tr)
 
-    G1 = mass_after_expansion_kg(data)
-    A = adiabatic_expansion_energy_kj(data)
-    E1 = G1 * data.q_kj_kg + A
+    tr.add("q", data.q_kj_kg, "кДж/кг", "удельная теплота сгорания")
+    E_comb = G1 * data.q_kj_kg
+    tr.add("G1'*q", E_comb, "кДж", "энергия сгорания массы G1'")
+
+    E1 = E_comb + A
+    tr.add("E1'", E1, "кДж", "итог п.1.1")
     return E1, G1, A
 
 
@@ -333,7 +443,7 @@ def energy_in_block_kj(data: BlockData) -> Tuple[float, float, float]:
 # П. 1.2 — РАСЧЁТНЫЕ ФУНКЦИИ
 # ======================================================================
 
-def outflow_velocity_m_s(flow: FlowData, P0_mpa: float) -> float:
+def outflow_velocity_m_s(flow: FlowData, P0_mpa: float, tr: Trace | NullTrace = NO_TRACE) -> float:
     """
     Скорость истечения wi' по методике (две формулы).
 
@@ -352,24 +462,26 @@ def outflow_velocity_m_s(flow: FlowData, P0_mpa: float) -> float:
         raise ValueError("Ожидается Pi_mpa >= P0_mpa (абсолютные давления)")
 
     P_excess_mpa = flow.Pi_mpa - P0_mpa
+    tr.add("Pизб", P_excess_mpa, "МПа", "для выбора формулы скорости")
 
     Pi_pa = flow.Pi_mpa * 1_000_000.0
     P0_pa = P0_mpa * 1_000_000.0
+    tr.add("Pi", Pi_pa, "Па", "перевод: 1 МПа = 1e6 Па")
 
     if P_excess_mpa <= 0.07:
         # Упрощённая формула при малом избыточном давлении
         w = math.sqrt((2.0 * flow.k / (flow.k + 1.0)) * (Pi_pa / flow.rho_kg_m3))
+        tr.add("wi'", w, "м/с", "упрощённая формула (Pизб <= 0.07 МПа)")
     else:
         # Общая формула
-        w = math.sqrt(
-            (2.0 * flow.k / (flow.k - 1.0))
-            * (Pi_pa / flow.rho_kg_m3)
-            * (1.0 - (P0_pa / Pi_pa) ** ((flow.k - 1.0) / flow.k))
-        )
+        term = 1.0 - (P0_pa / Pi_pa) ** ((flow.k - 1.0) / flow.k)
+        tr.add("term", term, "", "[1 - (P0/P)^((k-1)/k)]")
+        w = math.sqrt((2.0 * flow.k / (flow.k - 1.0)) * (Pi_pa / flow.rho_kg_m3) * term)
+        tr.add("wi'", w, "м/с", "общая формула")
     return w
 
 
-def flow_mass_kg(flow: FlowData, P0_mpa: float) -> float:
+def flow_mass_kg(flow: FlowData, P0_mpa: float, tr: Trace | NullTrace = NO_TRACE) -> float:
     """
     Масса i-го потока:
         Gi' = ρi' * wi' * Si' * τi
@@ -377,12 +489,14 @@ def flow_mass_kg(flow: FlowData, P0_mpa: float) -> float:
     _require_positive("S_m2", flow.S_m2)
     _require_non_negative("tau_s", flow.tau_s)
 
-    w = outflow_velocity_m_s(flow, P0_mpa)
+    w = outflow_velocity_m_s(flow, P0_mpa, tr)
     G = flow.rho_kg_m3 * w * flow.S_m2 * flow.tau_s
+    tr.add("Gi'", G, "кг", "масса потока")
     return G
 
 
-def energy_from_adjacent_blocks_kj(flows: List[FlowData], P0_mpa: float) -> Tuple[float, List[float]]:
+def energy_from_adjacent_blocks_kj(flows: List[FlowData], P0_mpa: float,
+                                   tr: Trace | NullTrace = NO_TRACE) -> Tuple[float, List[float]]:
     """
     Энергия по п. 1.2:
         E2' = Σ(Gi' * qi')
@@ -392,15 +506,30 @@ def energy_from_adjacent_blocks_kj(flows: List[FlowData], P0_mpa: float) -> Tupl
     где masses_kg — список масс потоков Gi' (по порядку входного списка).
     """
     _require_positive("P0_mpa", P0_mpa)
+    tr.add_sep("П.1.2 — Потоки ПГФ от смежных блоков")
+    tr.add("P0", P0_mpa, "МПа", "опорное абсолютное давление")
 
     total = 0.0
     masses: List[float] = []
 
     for idx, flow in enumerate(flows, start=1):
         _require_positive(f"flows[{idx}].q_kj_kg", flow.q_kj_kg)
-        Gi = flow_mass_kg(flow, P0_mpa)
+        tr.add_sep(f"П.1.2 — Поток {idx}")
+        tr.add("Pi", flow.Pi_mpa, "МПа", "абсолютное давление потока")
+        tr.add("ρi'", flow.rho_kg_m3, "кг/м³", "плотность потока")
+        tr.add("Si'", flow.S_m2, "м²", "площадь сечения")
+        tr.add("τi", flow.tau_s, "с", "время поступления")
+        tr.add("k", flow.k, "", "показатель адиабаты")
+        tr.add("qi'", flow.q_kj_kg, "кДж/кг", "теплота сгорания")
+
+        Gi = flow_mass_kg(flow, P0_mpa, tr)
         masses.append(Gi)
-        total += Gi * flow.q_kj_kg
+        Ei = Gi * flow.q_kj_kg
+        tr.add("Gi'*qi'", Ei, "кДж", "энергия потока")
+        total += Ei
+
+    tr.add_sep("Итог п.1.2")
+    tr.add("E2'", total, "кДж", "сумма по потокам")
 
     return total, masses
 
@@ -498,22 +627,30 @@ def liquid_outflow_velocity_m_s(deltaP_mpa: float, rho_kg_m3: float, mu: float)
     return mu * math.sqrt(2.0 * deltaP_pa / rho_kg_m3)
 
 
-def liquid_flow_mass_kg(flow: LiquidFlowData) -> float:
+def liquid_flow_mass_kg(flow: LiquidFlowData, tr: Trace | NullTrace = NO_TRACE) -> float:
     """
     Масса поступившей ЖФ (формула (8)):
         Gi'' = ρi'' * wi'' * Si'' * τi
+
+    Si'' = 0 допускается (поток не поступает, Gi'' = 0).
     """
     _require_positive("rho_kg_m3", flow.rho_kg_m3)
-    _require_positive("S_m2", flow.S_m2)
+    _require_non_negative("S_m2", flow.S_m2)
     _require_non_negative("tau_s", flow.tau_s)
 
+    tr.add("ΔP", flow.deltaP_mpa * 1_000_000.0, "Па", "перевод: 1 МПа = 1e6 Па")
     w = liquid_outflow_velocity_m_s(flow.deltaP_mpa, flow.rho_kg_m3, flow.mu)
-    return flow.rho_kg_m3 * w * flow.S_m2 * flow.tau_s
+    tr.add("wi''", w, "м/с", "w'' = μ*sqrt(2ΔP/ρ)")
+
+    G = flow.rho_kg_m3 * w * flow.S_m2 * flow.tau_s
+    tr.add("Gi''", G, "кг", "масса ЖФ, поступившая за τi")
+    return G
 
 
 def energy_from_overheated_liquid_kj(
         in_block: OverheatedLiquidInBlock | None,
-        incoming_flows: List[LiquidFlowData] | None
+        incoming_flows: List[LiquidFlowData] | None,
+        tr: Trace | NullTrace = NO_TRACE,
 ) -> Tuple[float, float, List[float]]:
     """
     Энергия по п. 1.3 (условное имя E3').
@@ -526,6 +663,8 @@ def energy_from_overheated_liquid_kj(
     - G1_kg      — масса перегретой ЖФ в блоке (0 если in_block=None)
     - Gi_list_kg — список масс ЖФ по входящим потокам (пустой список если incoming_flows=None)
     """
+    tr.add_sep("П.1.3 — Перегретая ЖФ")
+
     total = 0.0
     G1 = 0.0
     Gi_list: List[float] = []
@@ -535,9 +674,19 @@ def energy_from_overheated_liquid_kj(
         _require_non_negative("G_kg (in_block)", in_block.G_kg)
         _require_positive("q_kj_kg (in_block)", in_block.q_kj_kg)
 
+        tr.add_sep("П.1.3 — Перегретая ЖФ в блоке")
+        tr.add("G1''", in_block.G_kg, "кг")
+        tr.add("q1", in_block.q_kj_kg, "кДж/кг")
+        tr.add("c1", in_block.c1, "")
+        tr.add("θ", in_block.theta_s, "с")
+        tr.add("r1", in_block.r_m, "м")
+
         f1 = _fraction_evaporated(in_block.c1, in_block.theta_s, in_block.r_m)
+        tr.add("f1", f1, "", "f=1-exp(-c1*θ/r)")
         G1 = in_block.G_kg
-        total += G1 * f1 * in_block.q_kj_kg
+        E_block = G1 * f1 * in_block.q_kj_kg
+        tr.add("E_block", E_block, "кДж", "вклад от ЖФ в блоке")
+        total += E_block
 
     # 2) Поступившие потоки ЖФ
     if incoming_flows:
@@ -545,11 +694,28 @@ def energy_from_overheated_liquid_kj(
             _require_positive(f"incoming_flows[{idx}].q_kj_kg", flow.q_kj_kg)
             _require_positive(f"incoming_flows[{idx}].mu", flow.mu)
 
-            Gi = liquid_flow_mass_kg(flow)
+            tr.add_sep(f"П.1.3 — Поток ЖФ {idx}")
+            tr.add("ρi''", flow.rho_kg_m3, "кг/м³")
+            tr.add("Si''", flow.S_m2, "м²")
+            tr.add("τi", flow.tau_s, "с")
+            tr.add("ΔP", flow.deltaP_mpa, "МПа")
+            tr.add("μ", flow.mu, "")
+            tr.add("qi", flow.q_kj_kg, "кДж/кг")
+            tr.add("c1", flow.c1, "")
+            tr.add("θ", flow.theta_s, "с")
+            tr.add("ri", flow.r_m, "м")
+
+            Gi = liquid_flow_mass_kg(flow, tr)
             Gi_list.append(Gi)
 
             fi = _fraction_evaporated(flow.c1, flow.theta_s, flow.r_m)
-            total += Gi * fi * flow.q_kj_kg
+            tr.add("fi", fi, "", "f=1-exp(-c1*θ/r)")
+            Ei = Gi * fi * flow.q_kj_kg
+            tr.add("Ei", Ei, "кДж", "вклад потока ЖФ")
+            total += Ei
+
+    tr.add_sep("Итог п.1.3")
+    tr.add("E3'", total, "кДж")
 
     return total, G1, Gi_list
 
@@ -699,7 +865,8 @@ def eta_from_table_1(air_speed_m_s: float, air_temp_c: float) -> float:
     return lerp(y00, y10, xv)
 
 
-def spill_energy_kj(data: SpillEvaporationData) -> tuple[float, float, float, float]:
+def spill_energy_kj(data: SpillEvaporationData,
+                    tr: Trace | NullTrace = NO_TRACE) -> tuple[float, float, float, float]:
     """
     Расчёт п. 1.6.
 
@@ -711,22 +878,64 @@ def spill_energy_kj(data: SpillEvaporationData) -> tuple[float, float, float, fl
         G_total_kg  — суммарная масса парогазовой фазы GΣ'', кг
         G4_kg       — вклад от теплопередачи от подстилающей поверхности, кг
         G5_kg       — вклад от испарения в атмосферу, кг
+
+    В трассировке особенно важно проследить цепочку:
+      mн (формула 14) -> G5'' -> GΣ'' -> E4'
     """
     _require_positive("r", data.r)
     _require_positive("Fp_m2", data.Fp_m2)
     _require_non_negative("tau_s", data.tau_s)
     _require_positive("q_kj_kg", data.q_kj_kg)
 
+    tr.add_sep("П.1.6 — Пролив ЖФ на твёрдую поверхность")
+    tr.add("T0", data.T0_K, "К", "температура поверхности")
+    tr.add("Tk", data.Tk_K, "К", "температура кипения жидкости")
+    tr.add("r", data.r, "Дж/кг", "теплота фазового перехода")
+    tr.add("λ", data.lambda_W, "Вт/(м·К)", "теплопроводность")
+    tr.add("ρс", data.rho_kg_m3, "кг/м³", "плотность материала поверхности")
+    tr.add("c", data.c, "Дж/(кг·К)", "удельная теплоёмкость")
+    tr.add("Fп", data.Fp_m2, "м²", "площадь пролива")
+    tr.add("τи", data.tau_s, "с", "время испарения/контакта")
+
+    eta = data.eta
+    if getattr(data, "use_table_eta", False):
+        eta = eta_from_table_1(data.air_speed_m_s, data.air_temp_c)
+        tr.add("η", eta, "", "взято по таблице №1 (интерполяция)")
+        tr.add("v_воздуха", data.air_speed_m_s, "м/с")
+        tr.add("t_воздуха", data.air_temp_c, "°C")
+    else:
+        tr.add("η", eta, "", "задано вручную")
+
+    Pn_kpa = data.Pn_kpa
+    if getattr(data, "use_calc_Pn", False) and getattr(data, "r_j_mol", None) is not None:
+        Tp = data.Tp_K
+        if Tp is None:
+            # Если пользователь не задал Tp, берём грубую оценку: максимум из температур в данных
+            Tp = max(data.T0_K, data.Tk_K)
+        Pn_kpa = saturated_vapor_pressure_kpa(data.P0_kpa, data.r_j_mol, data.R_j_mol_K, data.Tk_K, Tp)
+        tr.add("Tp", Tp, "К", "расчётная температура для Pн")
+        tr.add("P0", data.P0_kpa, "кПа", "база для Pн")
+        tr.add("r", data.r_j_mol, "Дж/моль", "для формулы Pн")
+        tr.add("R", data.R_j_mol_K, "Дж/(моль·К)")
+        tr.add("Pн", Pn_kpa, "кПа", "рассчитано по формуле насыщенного пара")
+    else:
+        tr.add("Pн", Pn_kpa, "кПа", "задано вручную")
+    tr.add("M", data.M, "кг/кмоль", "молярная масса")
+    tr.add("q", data.q_kj_kg, "кДж/кг", "теплота сгорания")
+
     # ε = sqrt(λ ρ c)
     epsilon = (data.lambda_W * data.rho_kg_m3 * data.c) ** 0.5
+    tr.add("ε", epsilon, "Дж/(м²·К·√с)", "sqrt(λ·ρ·c)")
 
     # G4'' (формула 13)
     # Физический смысл: тепло передаётся ОТ поверхности К жидкости.
     # Если поверхность холоднее температуры кипения (T0 <= Tk),
     # вклад теплопередачи в испарение не должен давать отрицательную массу.
     deltaT = data.T0_K - data.Tk_K
+    tr.add("ΔT", deltaT, "К", "T0 - Tk (если <=0, теплопередача не испаряет)")
     if deltaT <= 0:
         G4 = 0.0
+        tr.add("G4''", G4, "кг", "T0<=Tk => отрицательный вклад не допускаем, принимаем 0")
     else:
         G4 = (
                 2 * deltaT / data.r
@@ -734,61 +943,61 @@ def spill_energy_kj(data: SpillEvaporationData) -> tuple[float, float, float, fl
                 * data.Fp_m2
                 * math.sqrt(data.tau_s)
         )
+        tr.add("G4''", G4, "кг", "вклад от теплопередачи поверхности")
 
-    # mн = 10^-6 * η * Pн / sqrt(M)
-    eta = data.eta
-    if getattr(data, "use_table_eta", False):
-        eta = eta_from_table_1(data.air_speed_m_s, data.air_temp_c)
-
-    Pn_kpa = data.Pn_kpa
-    if getattr(data, "use_calc_Pn", False) and getattr(data, "r_j_mol", None) is not None:
-        Tp = data.Tp_K
-        if Tp is None:
-            Tp = max(data.T0_K, data.Tk_K)
-        Pn_kpa = saturated_vapor_pressure_kpa(data.P0_kpa, data.r_j_mol, data.R_j_mol_K, data.Tk_K, Tp)
-
+    # mн = 10^-6 * η * Pн * sqrt(M) (формула 14)
     m_n = 1e-6 * eta * math.sqrt(data.M) * Pn_kpa
+    tr.add("mн", m_n, "кг/(м²·с)", "10^-6 * η * Pн * sqrt(M)")
 
     # G5''
     G5 = m_n * data.Fp_m2 * data.tau_s
+    tr.add("G5''", G5, "кг", "вклад от испарения в атмосферу")
 
     G_total = G4 + G5
     if G_total < 0:
+        # На практике это не должно происходить (масса не бывает отрицательной).
+        # Оставляем защиту на случай некорректного набора исходных данных.
+        tr.add("ПРЕДУПРЕЖДЕНИЕ", "GΣ''<0", "", "масса не может быть отрицательной; принимаем 0")
         G_total = 0.0
+    tr.add("GΣ''", G_total, "кг", "суммарная масса парогазовой фазы")
 
     E4 = G_total * data.q_kj_kg
+    tr.add("E4'", E4, "кДж", "энергия сгорания ПГФ от пролива")
 
     return E4, G_total, G4, G5
 
 
 # ======================================================================
-# ТРАССИРОВКА РАСЧЁТА (подробный вывод промежуточных величин)
+# П.2 — КАТЕГОРИЯ ВЗРЫВООПАСНОСТИ
 # ======================================================================
 
-@dataclass
-class Trace:
+def block_category(E_sum_kj: float) -> tuple[float, float, str]:
     """
-    Накопитель строк трассировки.
+    Приведённая масса, относительный энергетический потенциал и категория блока.
 
-    Идея:
-    - функции расчёта могут добавлять в Trace пары "имя = значение (ед.)"
-    - затем весь Trace печатается одним блоком
-
-    Это удобно для проверки "цепочки расчётов" и сопоставления с методикой.
+    Возвращает кортеж:
+        (m_pr_kg, Qv, category)
     """
-    lines: List[str]
+    # 2.1 Приведённая масса (формула 17)
+    # m = E / (4.6 * 10^4)
+    m_pr = E_sum_kj / (4.6 * 10 ** 4)
 
-    def add(self, name: str, value, unit: str = "", comment: str = "") -> None:
-        unit_str = f" {unit}" if unit else ""
-        comment_str = f" — {comment}" if comment else ""
-        self.lines.append(f"{name} = {value}{unit_str}{comment_str}")
+    # 2.2 Относительный энергетический потенциал (формула 18)
+    # Qв = (1 / 16.534) * E^(1/3)
+    if E_sum_kj > 0:
+        Qv = (1.0 / 16.534) * (E_sum_kj ** (1.0 / 3.0))
+    else:
+        Qv = 0.0
 
-    def add_sep(self, title: str) -> None:
-        self.lines.append("")
-        self.lines.append(f"--- {title} ---")
+    # Определение категории (таблица №3)
+    if Qv > 37 and m_pr > 5000:
+        category = "I"
+    elif 27 <= Qv <= 37 and 2000 <= m_pr <= 5000:
+        category = "II"
+    else:
+        category = "III"
 
-    def dump(self) -> str:
-        return "\n".join(self.lines)
+    return m_pr, Qv, category
 
 
 # ======================================================================
@@ -879,139 +1088,17 @@ class UnifiedInputData:
 # ======================================================================
 # ДЕТАЛЬНЫЕ РАСЧЁТЫ С ТРАССИРОВКОЙ (проверка всей цепочки)
 # ======================================================================
+# Те же функции расчёта, что и выше, с включённой трассировкой Trace.
 
 def energy_in_block_kj_detailed(data: BlockData, tr: Trace) -> tuple[float, float, float]:
-    """
-    П.1.1 с подробной трассировкой всех промежуточных величин.
-    """
-    tr.add_sep("П.1.1 — ПГФ в блоке")
-
-    P = data.P_mpa
-    P0 = data.P0_mpa
-    V = data.V_m3
-    k = data.k
-
-    tr.add("P", P, "МПа", "абсолютное давление в блоке")
-    tr.add("P0", P0, "МПа", "атмосферное/опорное абсолютное давление")
-    tr.add("V'", V, "м³", "объём ПГФ в блоке")
-    tr.add("k", k, "", "показатель адиабаты")
-
-    P_excess = P - P0
-    PV = P * V
-    tr.add("Pизб", P_excess, "МПа", "избыточное давление")
-    tr.add("P*V'", PV, "МПа·м³", "проверка малости для A")
-
-    # β1
-    b1 = beta1(P, P0, k)
-    tr.add("β1", b1, "", "коэффициент для A = β1·P·V'")
-
-    # A
-    if P_excess < 0.07 and PV < 0.02:
-        A = 0.0
-        tr.add("A", A, "кДж", "не учитываем по условию (малые Pизб и PV)")
-    else:
-        A = b1 * PV * 1000.0
-        tr.add("A", A, "кДж", "1 МПа·м³ = 1000 кДж")
-
-    # Температура/плотность/приведённый объём и масса
-    T1 = data.T1_K
-    rho = data.rho_kg_m3
-    tr.add("T1", T1, "К", "температура в блоке")
-    tr.add("ρ", rho, "кг/м³", "плотность при P и T1")
-
-    T = T1 * (P0 / P) ** ((k - 1.0) / k)
-    tr.add("T", T, "К", "после адиабатического расширения")
-
-    rho0 = rho * (P0 / P) ** (1.0 / k)
-    tr.add("ρ0'", rho0, "кг/м³", "после расширения")
-
-    V0 = (P / P0) * (V / T1) * T
-    tr.add("V0'", V0, "м³", "приведённый объём")
-
-    G1 = V0 * rho0
-    tr.add("G1'", G1, "кг", "масса ПГФ для E1'")
-
-    # Контрольная проверка: при определённой трактовке ρ формулы могут сократиться,
-    # и получится тождество G1' = V' * ρ.
-    # Если вы задаёте ρ как плотность при P и T1 (внутри блока),
-    # то это равенство будет выполняться почти точно.
-    # Если же по методике ρ должна быть при других условиях (например, при опорных/нормальных),
-    # тождество нарушится — и это будет индикатором корректной трактовки входных данных.
-    G1_check = data.V_m3 * data.rho_kg_m3
-    tr.add("G1_check = V'·ρ", G1_check, "кг", "контроль: V' * ρ")
-    rel = abs(G1 - G1_check) / max(abs(G1_check), 1e-12)
-    tr.add("rel_err", rel, "", "относит. расхождение G1' и V'·ρ")
-    if rel < 1e-6:
-        tr.add("ПРИМЕЧАНИЕ", "G1'≈V'·ρ", "", "проверьте, что ρ задана в тех условиях, которые подразумевает методика")
-
-    q = data.q_kj_kg
-    tr.add("q", q, "кДж/кг", "удельная теплота сгорания")
-
-    E_comb = G1 * q
-    tr.add("G1'*q", E_comb, "кДж", "энергия сгорания массы G1'")
-
-    E1 = E_comb + A
-    tr.add("E1'", E1, "кДж", "итог п.1.1")
-
-    return E1, G1, A
+    """П.1.1 с подробной трассировкой всех промежуточных величин."""
+    return energy_in_block_kj(data, tr)
 
 
 def energy_from_adjacent_blocks_kj_detailed(flows: List[FlowData], P0_mpa: float, tr: Trace) -> tuple[
     float, List[float]]:
-    """
-    П.1.2 с подробной трассировкой.
-    """
-    tr.add_sep("П.1.2 — Потоки ПГФ от смежных блоков")
-    tr.add("P0", P0_mpa, "МПа", "опорное абсолютное давление")
-
-    total = 0.0
-    masses: List[float] = []
-
-    for i, flow in enumerate(flows, start=1):
-        tr.add_sep(f"П.1.2 — Поток {i}")
-
-        Pi = flow.Pi_mpa
-        rho = flow.rho_kg_m3
-        S = flow.S_m2
-        tau = flow.tau_s
-        k = flow.k
-        q = flow.q_kj_kg
-
-        tr.add("Pi", Pi, "МПа", "абсолютное давление потока")
-        tr.add("ρi'", rho, "кг/м³", "плотность потока")
-        tr.add("Si'", S, "м²", "площадь сечения")
-        tr.add("τi", tau, "с", "время поступления")
-        tr.add("k", k, "", "показатель адиабаты")
-        tr.add("qi'", q, "кДж/кг", "теплота сгорания")
-
-        P_excess = Pi - P0_mpa
-        tr.add("Pизб", P_excess, "МПа", "для выбора формулы скорости")
-
-        Pi_pa = Pi * 1_000_000.0
-        tr.add("Pi", Pi_pa, "Па", "перевод: 1 МПа = 1e6 Па")
-
-        if P_excess <= 0.07:
-            w = ((2.0 * k / (k + 1.0)) * (Pi_pa / rho)) ** 0.5
-            tr.add("wi'", w, "м/с", "упрощённая формула (Pизб <= 0.07 МПа)")
-        else:
-            P0_pa = P0_mpa * 1_000_000.0
-            term = 1.0 - (P0_pa / Pi_pa) ** ((k - 1.0) / k)
-            tr.add("term", term, "", "[1 - (P0/P)^((k-1)/k)]")
-            w = ((2.0 * k / (k - 1.0)) * (Pi_pa / rho) * term) ** 0.5
-            tr.add("wi'", w, "м/с", "общая формула")
-
-        Gi = rho * w * S * tau
-        tr.add("Gi'", Gi, "кг", "масса потока")
-        masses.append(Gi)
-
-        Ei = Gi * q
-        tr.add("Gi'*qi'", Ei, "кДж", "энергия потока")
-        total += Ei
-
-    tr.add_sep("Итог п.1.2")
-    tr.add("E2'", total, "кДж", "сумма по потокам")
-
-    return total, masses
+    """П.1.2 с подробной трассировкой."""
+    return energy_from_adjacent_blocks_kj(flows, P0_mpa, tr)
 
 
 def energy_from_overheated_liquid_kj_detailed(
@@ -1019,155 +1106,13 @@ def energy_from_overheated_liquid_kj_detailed(
         incoming_flows: List[LiquidFlowData] | None,
         tr: Trace
 ) -> tuple[float, float, List[float]]:
-    """
-    П.1.3 с подробной трассировкой.
-    """
-    tr.add_sep("П.1.3 — Перегретая ЖФ")
-
-    total = 0.0
-    G1 = 0.0
-    Gi_list: List[float] = []
-
-    def frac(c1: float, theta: float, r: float) -> float:
-        f = 1.0 - math.exp(-c1 * theta / r)
-        return f
-
-    # В блоке
-    if in_block is not None:
-        tr.add_sep("П.1.3 — Перегретая ЖФ в блоке")
-        tr.add("G1''", in_block.G_kg, "кг")
-        tr.add("q1", in_block.q_kj_kg, "кДж/кг")
-        tr.add("c1", in_block.c1, "")
-        tr.add("θ", in_block.theta_s, "с")
-        tr.add("r1", in_block.r_m, "м")
-
-        f1 = frac(in_block.c1, in_block.theta_s, in_block.r_m)
-        tr.add("f1", f1, "", "f=1-exp(-c1*θ/r)")
-
-        G1 = in_block.G_kg
-        E1 = G1 * f1 * in_block.q_kj_kg
-        tr.add("E_block", E1, "кДж", "вклад от ЖФ в блоке")
-        total += E1
-
-    # Поступившие ЖФ
-    if incoming_flows:
-        for i, flow in enumerate(incoming_flows, start=1):
-            tr.add_sep(f"П.1.3 — Поток ЖФ {i}")
-            tr.add("ρi''", flow.rho_kg_m3, "кг/м³")
-            tr.add("Si''", flow.S_m2, "м²")
-            tr.add("τi", flow.tau_s, "с")
-            tr.add("ΔP", flow.deltaP_mpa, "МПа")
-            tr.add("μ", flow.mu, "")
-            tr.add("qi", flow.q_kj_kg, "кДж/кг")
-            tr.add("c1", flow.c1, "")
-            tr.add("θ", flow.theta_s, "с")
-            tr.add("ri", flow.r_m, "м")
-
-            deltaP_pa = flow.deltaP_mpa * 1_000_000.0
-            tr.add("ΔP", deltaP_pa, "Па", "перевод: 1 МПа = 1e6 Па")
-
-            w = flow.mu * (2.0 * deltaP_pa / flow.rho_kg_m3) ** 0.5
-            tr.add("wi''", w, "м/с", "w'' = μ*sqrt(2ΔP/ρ)")
-
-            Gi = flow.rho_kg_m3 * w * flow.S_m2 * flow.tau_s
-            tr.add("Gi''", Gi, "кг", "масса ЖФ, поступившая за τi")
-            Gi_list.append(Gi)
-
-            fi = frac(flow.c1, flow.theta_s, flow.r_m)
-            tr.add("fi", fi, "", "f=1-exp(-c1*θ/r)")
-
-            Ei = Gi * fi * flow.q_kj_kg
-            tr.add("Ei", Ei, "кДж", "вклад потока ЖФ")
-            total += Ei
-
-    tr.add_sep("Итог п.1.3")
-    tr.add("E3'", total, "кДж")
-
-    return total, G1, Gi_list
+    """П.1.3 с подробной трассировкой."""
+    return energy_from_overheated_liquid_kj(in_block, incoming_flows, tr)
 
 
 def spill_energy_kj_detailed(data: SpillEvaporationData, tr: Trace) -> tuple[float, float, float, float]:
-    """
-    П.1.6 с подробной трассировкой.
-
-    Здесь особенно важно проследить цепочку:
-      mн (формула 14) -> G5'' -> GΣ'' -> E4'
-    """
-    tr.add_sep("П.1.6 — Пролив ЖФ на твёрдую поверхность")
-
-    tr.add("T0", data.T0_K, "К", "температура поверхности")
-    tr.add("Tk", data.Tk_K, "К", "температура кипения жидкости")
-    tr.add("r", data.r, "Дж/кг", "теплота фазового перехода")
-    tr.add("λ", data.lambda_W, "Вт/(м·К)", "теплопроводность")
-    tr.add("ρс", data.rho_kg_m3, "кг/м³", "плотность материала поверхности")
-    tr.add("c", data.c, "Дж/(кг·К)", "удельная теплоёмкость")
-    tr.add("Fп", data.Fp_m2, "м²", "площадь пролива")
-    tr.add("τи", data.tau_s, "с", "время испарения/контакта")
-    eta = data.eta
-    if getattr(data, "use_table_eta", False):
-        eta = eta_from_table_1(data.air_speed_m_s, data.air_temp_c)
-        tr.add("η", eta, "", "взято по таблице №1 (интерполяция)")
-        tr.add("v_воздуха", data.air_speed_m_s, "м/с")
-        tr.add("t_воздуха", data.air_temp_c, "°C")
-    else:
-        tr.add("η", eta, "", "задано вручную")
-
-    Pn_kpa = data.Pn_kpa
-    if getattr(data, "use_calc_Pn", False) and getattr(data, "r_j_mol", None) is not None:
-        Tp = data.Tp_K
-        if Tp is None:
-            # Если пользователь не задал Tp, берём грубую оценку: максимум из температур в данных
-            Tp = max(data.T0_K, data.Tk_K)
-        Pn_kpa = saturated_vapor_pressure_kpa(data.P0_kpa, data.r_j_mol, data.R_j_mol_K, data.Tk_K, Tp)
-        tr.add("Tp", Tp, "К", "расчётная температура для Pн")
-        tr.add("P0", data.P0_kpa, "кПа", "база для Pн")
-        tr.add("r", data.r_j_mol, "Дж/моль", "для формулы Pн")
-        tr.add("R", data.R_j_mol_K, "Дж/(моль·К)")
-        tr.add("Pн", Pn_kpa, "кПа", "рассчитано по формуле насыщенного пара")
-    else:
-        tr.add("Pн", Pn_kpa, "кПа", "задано вручную")
-    tr.add("M", data.M, "кг/кмоль", "молярная масса")
-    tr.add("q", data.q_kj_kg, "кДж/кг", "теплота сгорания")
-
-    # ε = sqrt(λ ρ c)
-    epsilon = (data.lambda_W * data.rho_kg_m3 * data.c) ** 0.5
-    tr.add("ε", epsilon, "Дж/(м²·К·√с)", "sqrt(λ·ρ·c)")
-
-    # G4'' (формула 13)
-    deltaT = data.T0_K - data.Tk_K
-    tr.add("ΔT", deltaT, "К", "T0 - Tk (если <=0, теплопередача не испаряет)")
-    if deltaT <= 0:
-        G4 = 0.0
-        tr.add("G4''", G4, "кг", "T0<=Tk => отрицательный вклад не допускаем, принимаем 0")
-    else:
-        G4 = (
-                2.0 * deltaT / data.r
-                * (epsilon / math.sqrt(math.pi))
-                * data.Fp_m2
-                * math.sqrt(data.tau_s)
-        )
-        tr.add("G4''", G4, "кг", "вклад от теплопередачи поверхности")
-
-    # mн (формула 14)
-    m_n = 1e-6 * eta * Pn_kpa * (data.M ** 0.5)
-    tr.add("mн", m_n, "кг/(м²·с)", "10^-6 * η * Pн * sqrt(M)")
-
-    # G5''
-    G5 = m_n * data.Fp_m2 * data.tau_s
-    tr.add("G5''", G5, "кг", "вклад от испарения в атмосферу")
-
-    Gsum = G4 + G5
-    if Gsum < 0:
-        # На практике это не должно происходить (масса не бывает отрицательной).
-        # Оставляем защиту на случай некорректного набора исходных данных.
-        tr.add("ПРЕДУПРЕЖДЕНИЕ", "GΣ''<0", "", "масса не может быть отрицательной; принимаем 0")
-        Gsum = 0.0
-    tr.add("GΣ''", Gsum, "кг", "суммарная масса парогазовой фазы")
-
-    E4 = Gsum * data.q_kj_kg
-    tr.add("E4'", E4, "кДж", "энергия сгорания ПГФ от пролива")
-
-    return E4, Gsum, G4, G5
+    """П.1.6 с подробной трассировкой."""
+    return spill_energy_kj(data, tr)
 
 
 def calculate_all_energies_detailed(inp: UnifiedInputData) -> dict:
@@ -1178,76 +1123,21 @@ def calculate_all_energies_detailed(inp: UnifiedInputData) -> dict:
       - 'trace' : текст трассировки
       - 'results': численные результаты (E1, E2, E3, E4, E_sum и др.)
     """
-    tr = Trace(lines=[])
+    tr = Trace()
 
     # Печатаем исходные данные как часть протокола
     tr.add_sep("Исходные данные")
     for line in inp.pretty().splitlines():
-        tr.lines.append(line)
-
-    # 1.1
-    E1, G1, A = energy_in_block_kj_detailed(inp.block, tr)
-
-    # 1.2
-    E2, masses_gas = energy_from_adjacent_blocks_kj_detailed(inp.flows_gas, inp.block.P0_mpa,
-                                                             tr) if inp.flows_gas else (0.0, [])
-
-    # 1.3
-    E3, G1_liq, masses_liq = energy_from_overheated_liquid_kj_detailed(inp.overheated_liq, inp.flows_liq, tr)
-
-    # 1.6
-    if inp.spill is not None:
-        E4, Gsum, G4, G5 = spill_energy_kj_detailed(inp.spill, tr)
-    else:
-        E4, Gsum, G4, G5 = 0.0, 0.0, 0.0, 0.0
-        tr.add_sep("П.1.6 — Пролив ЖФ")
-        tr.lines.append("(не рассчитывается)")
-
-    E_sum = E1 + E2 + E3 + E4
-    tr.add_sep("ИТОГ")
-    tr.add("E_sum", E_sum, "кДж", "E1'+E2'+E3'+E4' (реализованные пункты)")
-
-    # ==================================================================
-    # П.2 — Категория взрывоопасности
-    # ==================================================================
-    tr.add_sep("П.2 — Категория взрывоопасности технологического блока")
-
-    # 2.1 Приведённая масса (формула 17)
-    # m = E / (4.6 * 10^4)
-    m_pr = E_sum / (4.6 * 10 ** 4)
-    tr.add("m", m_pr, "кг", "приведённая масса (E / 4.6·10^4)")
-
-    # 2.2 Относительный энергетический потенциал (формула 18)
-    # Qв = (1 / 16.534) * E^(1/3)
-    if E_sum > 0:
-        Qv = (1.0 / 16.534) * (E_sum ** (1.0 / 3.0))
-    else:
-        Qv = 0.0
-
-    tr.add("Qв", Qv, "", "(1/16.534)*E^(1/3)")
-
-    # Определение категории
-    if Qv > 37 and m_pr > 5000:
-        category = "I"
-    elif 27 <= Qv <= 37 and 2000 <= m_pr <= 5000:
-        category = "II"
-    else:
-        category = "III"
-
-    tr.add("Категория", category, "", "по таблице №3")
-
-    results = {
-        "E1_kj": E1, "G1_kg": G1, "A_kj": A,
-        "E2_kj": E2, "masses_gas_kg": masses_gas,
-        "E3_kj": E3, "G1_liquid_kg": G1_liq, "masses_liquid_kg": masses_liq,
-        "E4_kj": E4, "Gsum_spill_kg": Gsum, "G4_spill_kg": G4, "G5_spill_kg": G5,
-        "E_sum_kj": E_sum,
-    }
-    results.update({
-        "m_pr_kg": m_pr,
-        "Qv": Qv,
-        "category": category,
-    })
+        tr.add_text(line)
+
+    results = calculate_all_energies(
+        inp.block,
+        flows_gas=inp.flows_gas,
+        overheated_in_block=inp.overheated_liq,
+        flows_liquid=inp.flows_liq,
+        spill=inp.spill,
+        tr=tr,
+    )
 
     return {"trace": tr.dump(), "results": results}
 
@@ -1257,50 +1147,63 @@ def calculate_all_energies_detailed(inp: UnifiedInputData) -> dict:
 # ======================================================================
 
 def calculate_all_energies(
-        block: BlockData,
+        block: BlockData | None,
         flows_gas: List[FlowData] | None = None,
         overheated_in_block: OverheatedLiquidInBlock | None = None,
         flows_liquid: List[LiquidFlowData] | None = None,
         spill: SpillEvaporationData | None = None,
+        tr: Trace | NullTrace = NO_TRACE,
 ) -> dict:
     """
     Унифицированный расчёт всех реализованных пунктов методики.
 
     Возвращает словарь с ключами:
         E1_kj, E2_kj, E3_kj, E4_kj, E_sum_kj
-    а также диагностическими величинами (массы и т.п.).
+    а также диагностическими величинами (массы и т.п.)
+    и показателями категории (m_pr_kg, Qv, category).
 
     Примечание:
-    - Если какой-то набор данных не передан (None), соответствующий вклад считается нулевым.
+    - Если какой-то набор данных не передан (None), соответствующий вклад считается нулевым
+      (block=None — в блоке нет ПГФ; потоки ПГФ тогда не задаются, т.к. P0 берётся из block).
     - E4 соответствует п. 1.6 (пролив ЖФ на твёрдую поверхность).
+    - tr — трассировка промежуточных величин (Trace); по умолчанию не ведётся.
     """
     result: dict = {}
 
     # 1.1
-    E1, G1, A = energy_in_block_kj(block)
+    if block is not None:
+        E1, G1, A = energy_in_block_kj(block, tr)
+    elif flows_gas:
+        raise ValueError("Для потоков ПГФ (п.1.2) нужен block (опорное давление P0)")
+    else:
+        E1, G1, A = 0.0, 0.0, 0.0
+        tr.add_sep("П.1.1 — ПГФ в блоке")
+        tr.add_text("(нет ПГФ)")
     result["E1_kj"] = E1
     result["G1_kg"] = G1
     result["A_kj"] = A
 
     # 1.2
     if flows_gas:
-        E2, masses_g = energy_from_adjacent_blocks_kj(flows_gas, P0_mpa=block.P0_mpa)
+        E2, masses_g = energy_from_adjacent_blocks_kj(flows_gas, block.P0_mpa, tr)
     else:
         E2, masses_g = 0.0, []
     result["E2_kj"] = E2
     result["masses_gas_kg"] = masses_g
 
     # 1.3
-    E3, G1_liq, Gi_liq = energy_from_overheated_liquid_kj(overheated_in_block, flows_liquid)
+    E3, G1_liq, Gi_liq = energy_from_overheated_liquid_kj(overheated_in_block, flows_liquid, tr)
     result["E3_kj"] = E3
     result["G1_liquid_kg"] = G1_liq
     result["masses_liquid_kg"] = Gi_liq
 
     # 1.6
     if spill is not None:
-        E4, Gsum, G4, G5 = spill_energy_kj(spill)
+        E4, Gsum, G4, G5 = spill_energy_kj(spill, tr)
     else:
         E4, Gsum, G4, G5 = 0.0, 0.0, 0.0, 0.0
+        tr.add_sep("П.1.6 — Пролив ЖФ")
+        tr.add_text("(не рассчитывается)")
     result["E4_kj"] = E4
     result["Gsum_spill_kg"] = Gsum
     result["G4_spill_kg"] = G4
@@ -1308,6 +1211,15 @@ def calculate_all_energies(
 
     # Сумма
     result["E_sum_kj"] = E1 + E2 + E3 + E4
+    tr.add_sep("ИТОГ")
+    tr.add("E_sum", result["E_sum_kj"], "кДж", "E1'+E2'+E3'+E4' (реализованные пункты)")
+
+    # П.2
+    result["m_pr_kg"], result["Qv"], result["category"] = block_category(result["E_sum_kj"])
+    tr.add_sep("П.2 — Категория взрывоопасности технологического блока")
+    tr.add("m", result["m_pr_kg"], "кг", "приведённая масса (E / 4.6·10^4)")
+    tr.add("Qв", result["Qv"], "", "(1/16.534)*E^(1/3)")
+    tr.add("Категория", result["category"], "", "по таблице №3")
 
     return result
 
@@ -1,14 +1,26 @@
+V0, Y0 = 0.1, 100.0
+VB = 1000.0
+M1 = 1.0
+V_MAX, Y_MAX = 10000.0, 25000.0
+
+
 def approx_equipment_cost(V: float) -> float:
     if V <= 0:
         return 0.0
 
-    V0, y0 = 0.1, 100.0
-    Vb = 1000.0
-    m1 = 1.0
+    if V <= VB:
+        return Y0 + M1 * (V - V0)
+
+    yb = Y0 + M1 * (VB - V0)
+    m2 = (Y_MAX - yb) / (V_MAX - VB)
+    return yb + m2 * (V - VB)
+
 
-    if V <= Vb:
-        return y0 + m1 * (V - V0)
+def approx_equipment_cost_array(V):
+    """approx_equipment_cost для массива numpy (те же операции поэлементно)."""
+    import numpy as np
 
-    yb = y0 + m1 * (Vb - V0)
-    m2 = (25000.0 - yb) / (10000.0 - Vb)
-    return yb + m2 * (V - Vb)
\ No newline at end of file
+    yb = Y0 + M1 * (VB - V0)
+    m2 = (Y_MAX - yb) / (V_MAX - VB)
+    cost = np.where(V <= VB, Y0 + M1 * (V - V0), yb + m2 * (V - VB))
+    return np.where(V <= 0, 0.0, cost)
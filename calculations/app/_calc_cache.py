@@ -0,0 +1,67 @@
+# -----------------------------------------------------------
+# Файлы предрасчёта зон в CALC_CACHE_DIR
+#
+# Поверхность пожара пролива и таблица огненного шара строятся один раз
+# и хранятся на диске вместе с описанием (JSON). В описании — ключ:
+# версия формата, параметры сетки и хэш исходников с формулами; файл,
+# построенный для другого ключа, не используется (строится заново).
+# Запись — через временный файл и os.replace: параллельный расчёт не
+# увидит недописанный файл.
+#
+# check_zones — сверка быстрого расчёта зон с перебором *_class_zone_march.
+# -----------------------------------------------------------
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+
+def source_hash(*paths: Path) -> str:
+    """Хэш исходников: правка формул в любом из них пересобирает файл."""
+    h = hashlib.sha256()
+    for p in paths:
+        h.update(Path(p).read_bytes())
+    return h.hexdigest()
+
+
+def tmp_path(path: Path) -> Path:
+    """Временный файл рядом с path (для записи с последующим os.replace)."""
+    return path.with_name(f"{path.stem}.tmp{os.getpid()}{path.suffix}")
+
+
+def write_json(path: Path, data: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = tmp_path(path)
+    tmp.write_text(json.dumps(data), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def read_json(path: Path, key: dict):
+    """Описание из файла или None, если файла нет или он построен для другого ключа."""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if any(data.get(k) != v for k, v in key.items()):
+        return None
+    return data
+
+
+def check_zones(cases, fast, march) -> float:
+    """
+    Сверка зон fast(*case) с перебором march(*case).
+    fast возвращает None, если быстрый расчёт неприменим, — такие случаи пропускаются.
+    Возвращает долю совпавших случаев (печатает несовпадения).
+    """
+    same = total = 0
+    for case in cases:
+        zones = fast(*case)
+        if zones is None:
+            continue
+        reference = march(*case)
+        total += 1
+        same += zones == reference
+        if zones != reference:
+            print(f"{case}: {zones} / {reference}")
+    return same / total if total else 1.0
@@ -7,8 +7,9 @@
 # -----------------------------------------------------------
 
 import math
-from calculations.app._probit import Probit
-from calculations.app._found_nearest_value import get_nearest_value
+from calculations.app._lethality_profile import fireball_profile
+from calculations.app._threshold import nearest_indices
+from core.config import FIREBALL_TABLE_ENABLED, ZONE_INTERPOLATION_ENABLED, ZONE_INTERPOLATION_STEP_FACTOR
 
 
 class Fireball:
@@ -28,21 +29,30 @@ class Fireball:
         if 0 in (mass, ef, radius):
             raise ValueError(f'Фукнция не может принимать нулевые параметры')
 
+        t_s = 0.92 * pow(mass, 0.303)
+
+        q_ball = round(self.q_term(mass, ef, radius), 2)
+        d_term = round(q_ball * t_s, 2)
+
+        res = (q_ball, d_term)
+
+        return res
+
+    @staticmethod
+    def q_term(mass: float, ef: float, radius: float) -> float:
+        """
+        Интенсивность теплового излучения без округления, кВт/м2
+        (формула fireball_point; нужна таблице зон для поиска радиусов).
+        """
         D_eff = 5.33 * pow(mass, 0.327)
         H_eff = D_eff / 2
-        t_s = 0.92 * pow(mass, 0.303)
 
         Fq = (H_eff / D_eff + 0.5) / (4 * ((((H_eff / D_eff + 0.5) ** 2) +
                                             ((radius / D_eff) ** 2)) ** 1.5))
 
         tay = math.exp(-7 * (10 ** (-4) * (((radius ** 2 + H_eff ** 2) ** (1 / 2)) - D_eff / 2)))
 
-        q_ball = round(ef * Fq * tay, 2)
-        d_term = round(q_ball * t_s, 2)
-
-        res = (q_ball, d_term)
-
-        return res
+        return ef * Fq * tay
 
     def fireball_array(self, mass: float, ef: float) -> tuple:
 
@@ -54,41 +64,39 @@ class Fireball:
         :@raise проверка функции на введенные нулевые значения
         """
 
-        radius_arr = []
-        q_term_arr = []
-        d_term_arr = []
-        probit_arr = []
-        probability_arr = []
-
-        # максимальная интенсивность теплового излучения
-        radius = 1
-        q_term = self.fireball_point(mass, ef, radius)[0]
-        t_s = 0.92 * (mass ** 0.303)
-
-        # просчитаем значения пока интенсивность теплового излучения больше 1.2 кВт/м2
-        while q_term > 1.2:
-            res = self.fireball_point(mass, ef, radius)
-            q_term = res[0]
-            d_term = res[1]
-            probit = Probit().probit_fireball(t_s, q_term)
-            probability = Probit().probability(probit)
-            # append
-            radius_arr.append(radius)
-            q_term_arr.append(q_term)
-            d_term_arr.append(d_term)
-            probit_arr.append(probit)
-            probability_arr.append(probability)
-            radius += 0.5
-
-        result = (radius_arr, q_term_arr, d_term_arr, probit_arr, probability_arr)
-
-        return result
+        # один проход по сетке радиусов — fireball_profile
+        profile = fireball_profile(mass, ef)
+        return (profile.radius.tolist(), profile.intensity.tolist(), profile.dose.tolist(),
+                profile.probit.tolist(), profile.probability.tolist())
 
     def termal_class_zone(self, mass: float, ef: float) -> list:
         """
         :@param mass: масса огненного шара, кг
         :@param ef: ср.поверхностная плотность теплового излучения, кВт/м2 (например ef = 450)
 
+        :@return: : list: [radius_CZA]: список отсортированных зон
+
+        При ZONE_INTERPOLATION_ENABLED зоны интерполируются (termal_class_zone_interpolated).
+        Иначе при FIREBALL_TABLE_ENABLED зоны берутся из таблицы по массе
+        (_fireball_table.py), вне диапазона таблицы — перебором.
+        """
+        if ZONE_INTERPOLATION_ENABLED:
+            return self.termal_class_zone_interpolated(mass, ef)
+        if FIREBALL_TABLE_ENABLED:
+            from calculations.app._fireball_table import get_fireball_table
+
+            radius_CZA = get_fireball_table(ef).class_zone(mass)
+            if radius_CZA is not None:
+                return radius_CZA
+        return self.termal_class_zone_march(mass, ef)
+
+    def termal_class_zone_march(self, mass: float, ef: float) -> list:
+        """
+        Зоны перебором радиусов (fireball_array) с шагом 0.5 м.
+
+        :@param mass: масса огненного шара, кг
+        :@param ef: ср.поверхностная плотность теплового излучения, кВт/м2 (например ef = 450)
+
         :@return: : list: [radius_CZA]: список отсортированных зон
         """
 
@@ -100,11 +108,22 @@ class Fireball:
         d_term_array = res_list[2]
         radius_array = res_list[0]
 
-        for CZA in classified_zone_array:
-            ind = d_term_array.index(get_nearest_value(d_term_array, CZA))
+        for ind in nearest_indices(d_term_array, classified_zone_array):
             radius_CZA.append(radius_array[ind])
         return radius_CZA
 
+    def termal_class_zone_interpolated(self, mass: float, ef: float) -> list:
+        """
+        Зоны интерполяцией по логарифму дозы между узлами сетки с шагом
+        0.5 * ZONE_INTERPOLATION_STEP_FACTOR м (LethalityProfile.zone_radii).
+        Доза выше порога и на краю профиля (q <= 1.2) — последний узел, как у перебора.
+
+        :@return: : list: [radius_CZA]: список отсортированных зон
+        """
+        profile = fireball_profile(mass, ef, step=0.5 * ZONE_INTERPOLATION_STEP_FACTOR)
+        return [profile.max_radius if math.isnan(r) else round(r, 2)
+                for r in profile.zone_radii([600, 320, 220, 120], profile.dose, log=True)]
+
 
 if __name__ == '__main__':
     # ev_class = Fireball()
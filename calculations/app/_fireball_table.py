@@ -0,0 +1,274 @@
+# -----------------------------------------------------------
+# Таблица зон "огненного шара" по массе
+#
+# Радиусы доз 600/320/220/120 кДж/м2 зависят только от массы и EF.
+# Для заданного EF радиусы один раз считаются на логарифмической сетке масс
+# (поиск корня по непрерывной дозе, без шага 0.5 м), хранятся в
+# CALC_CACHE_DIR и интерполируются монотонным кубическим сплайном
+# (Fritsch–Carlson) по log(mass). Интерполируется квадрат радиуса,
+# продолженный в отрицательные значения (см. _q_of_r2), — у радиуса
+# в точке появления порога корневая особенность. Таблица пересобирается сама, если
+# изменились EF, сетка или формулы (_fireball.py, этот модуль) — см. _calc_cache.
+#
+# Табличные радиусы — только начальное приближение: зоны уточняются
+# по узлам сетки перебора termal_class_zone_march (радиусы 1 + 0.5*k,
+# не дальше точки, где q <= 1.2 кВт/м2) — выбирается узел с ближайшей
+# округлённой дозой fireball_point (march_index).
+# -----------------------------------------------------------
+
+import bisect
+import math
+from pathlib import Path
+
+from calculations.app._calc_cache import check_zones, read_json, source_hash, write_json
+from calculations.app._fireball import Fireball
+from calculations.app._threshold import first_index_le, march_index
+from core.config import FIREBALL_TABLE_MASS_RANGE_KG, FIREBALL_TABLE_POINTS_PER_DECADE
+from core.path import FIREBALL_TABLE_PATH
+
+# меняем при несовместимом изменении формата файла
+FIREBALL_TABLE_VERSION = 1
+
+DOSE_THRESHOLDS = (600, 320, 220, 120)  # кДж/м2, как в termal_class_zone
+Q_STOP = 1.2  # кВт/м2: перебор fireball_array останавливается на q <= 1.2
+
+# сетка перебора радиусов fireball_array
+_MARCH_R0 = 1.0
+_MARCH_STEP = 0.5
+
+_BISECT_ITER = 60
+
+_TABLES: dict = {}
+
+
+def _t_s(mass: float) -> float:
+    return 0.92 * pow(mass, 0.303)
+
+
+def _q_of_r2(mass: float, ef: float, r2: float) -> float:
+    """
+    q из Fireball.q_term как функция квадрата радиуса r2 = radius^2.
+    Формула зависит от радиуса только через radius^2, поэтому её можно
+    продолжить на r2 < 0 (до -H_eff^2): так радиус порога гладко
+    проходит через ноль там, где порог появляется у центра шара.
+    """
+    D_eff = 5.33 * pow(mass, 0.327)
+    H_eff = D_eff / 2
+    Fq = (H_eff / D_eff + 0.5) / (4 * ((((H_eff / D_eff + 0.5) ** 2) + r2 / D_eff ** 2) ** 1.5))
+    tay = math.exp(-7 * (10 ** (-4) * (((r2 + H_eff ** 2) ** (1 / 2)) - D_eff / 2)))
+    return ef * Fq * tay
+
+
+def _r2_for_q(mass: float, ef: float, q_target: float) -> float:
+    """r2, на котором q равна q_target (q убывает с r2). Отрицательное — порог не достигается и у центра."""
+    h2 = (5.33 * pow(mass, 0.327) / 2) ** 2
+    lo = -h2 * (1 - 1e-9)
+    if _q_of_r2(mass, ef, lo) <= q_target:
+        return lo
+    hi = 1.0
+    while _q_of_r2(mass, ef, hi) > q_target:
+        hi *= 2
+    for _ in range(_BISECT_ITER):
+        mid = (lo + hi) / 2
+        if _q_of_r2(mass, ef, mid) > q_target:
+            lo = mid
+        else:
+            hi = mid
+    return (lo + hi) / 2
+
+
+def _exact_row(mass: float, ef: float) -> list:
+    """r2 порогов доз + r2 остановки перебора (q = Q_STOP)."""
+    t_s = _t_s(mass)
+    row = [_r2_for_q(mass, ef, dose / t_s) for dose in DOSE_THRESHOLDS]
+    row.append(_r2_for_q(mass, ef, Q_STOP))
+    return row
+
+
+def _march_node(r: float) -> int:
+    """Ближайший сверху к радиусу r узел сетки перебора."""
+    return max(0, math.ceil((r - _MARCH_R0) / _MARCH_STEP))
+
+
+def _radius(r2: float) -> float:
+    return math.sqrt(r2) if r2 > 0 else 0.0
+
+
+def _monotone_slopes(x: list, y: list) -> list:
+    """Наклоны монотонного кубического Эрмита (Fritsch–Carlson)."""
+    n = len(x)
+    h = [x[i + 1] - x[i] for i in range(n - 1)]
+    d = [(y[i + 1] - y[i]) / h[i] for i in range(n - 1)]
+    m = [d[0]] + [(d[i - 1] + d[i]) / 2 for i in range(1, n - 1)] + [d[-1]]
+    for i in range(n - 1):
+        if d[i] == 0:
+            m[i] = m[i + 1] = 0.0
+            continue
+        a, b = m[i] / d[i], m[i + 1] / d[i]
+        s = a * a + b * b
+        if s > 9:
+            t = 3 / math.sqrt(s)
+            m[i] = t * a * d[i]
+            m[i + 1] = t * b * d[i]
+    return m
+
+
+def _hermite(x: list, y: list, m: list, xq: float) -> float:
+    i = min(max(bisect.bisect_right(x, xq) - 1, 0), len(x) - 2)
+    h = x[i + 1] - x[i]
+    t = (xq - x[i]) / h
+    t2, t3 = t * t, t * t * t
+    return ((2 * t3 - 3 * t2 + 1) * y[i] + (t3 - 2 * t2 + t) * h * m[i]
+            + (-2 * t3 + 3 * t2) * y[i + 1] + (t3 - t2) * h * m[i + 1])
+
+
+class FireballTable:
+
+    def __init__(self, ef: float, log_mass: list, columns: list, max_error_m: float):
+        """
+        :@param ef: ср.поверхностная плотность теплового излучения, кВт/м2
+        :@param log_mass: узлы сетки, ln(масса, кг)
+        :@param columns: квадраты радиусов по узлам: 4 порога доз + остановка перебора, м2
+        :@param max_error_m: оценка погрешности интерполяции (середины интервалов), м
+        """
+        self.ef = ef
+        self.log_mass = log_mass
+        self.columns = columns
+        self.slopes = [_monotone_slopes(log_mass, col) for col in columns]
+        self.max_error_m = max_error_m
+
+    # ---------------------------
+    # построение / хранение
+    # ---------------------------
+
+    @staticmethod
+    def _key(ef: float) -> dict:
+        m_min, m_max = FIREBALL_TABLE_MASS_RANGE_KG
+        return {
+            "version": FIREBALL_TABLE_VERSION,
+            "ef": float(ef),
+            "mass_range": [float(m_min), float(m_max)],
+            "points_per_decade": int(FIREBALL_TABLE_POINTS_PER_DECADE),
+            "source": source_hash(Path(__file__).with_name("_fireball.py"), Path(__file__)),
+        }
+
+    @classmethod
+    def build(cls, ef: float) -> "FireballTable":
+        m_min, m_max = FIREBALL_TABLE_MASS_RANGE_KG
+        n = max(2, int(round(math.log10(m_max / m_min) * FIREBALL_TABLE_POINTS_PER_DECADE)) + 1)
+        log_mass = [math.log(m_min) + (math.log(m_max) - math.log(m_min)) * i / (n - 1) for i in range(n)]
+
+        rows = [_exact_row(math.exp(lm), ef) for lm in log_mass]
+        columns = [list(col) for col in zip(*rows)]
+        table = cls(ef, log_mass, columns, 0.0)
+
+        # погрешность: сравнение с точным расчётом в серединах интервалов
+        max_error = 0.0
+        for i in range(n - 1):
+            lm = (log_mass[i] + log_mass[i + 1]) / 2
+            exact = [_radius(r2) for r2 in _exact_row(math.exp(lm), ef)]
+            approx = table.radii(math.exp(lm))
+            max_error = max(max_error, max(abs(a - b) for a, b in zip(exact, approx)))
+        table.max_error_m = max_error
+        return table
+
+    def save(self, path: Path) -> None:
+        write_json(path, dict(self._key(self.ef), log_mass=self.log_mass, columns=self.columns,
+                              max_error_m=self.max_error_m))
+
+    @classmethod
+    def load(cls, path: Path, ef: float):
+        """Таблица из файла или None, если файла нет или он построен для других EF/сетки/формул."""
+        data = read_json(path, cls._key(ef))
+        if data is None:
+            return None
+        return cls(ef, data["log_mass"], data["columns"], data["max_error_m"])
+
+    # ---------------------------
+    # запросы
+    # ---------------------------
+
+    def contains(self, mass: float) -> bool:
+        return mass > 0 and self.log_mass[0] <= math.log(mass) <= self.log_mass[-1]
+
+    def radii(self, mass: float) -> list:
+        """Непрерывные радиусы (4 порога доз + остановка перебора), м."""
+        lm = math.log(mass)
+        return [_radius(_hermite(self.log_mass, col, m, lm)) for col, m in zip(self.columns, self.slopes)]
+
+    def class_zone(self, mass: float):
+        """
+        Зоны как у termal_class_zone_march: радиусы на сетке 1 + 0.5*k.
+        None — масса вне таблицы или перебор неприменим (считать перебором).
+        """
+        if not self.contains(mass):
+            return None
+
+        fb = Fireball()
+        nodes = {}
+
+        def node(k: int) -> tuple:
+            # (q, доза) в узле сетки перебора, округлённые как в fireball_array
+            res = nodes.get(k)
+            if res is None:
+                res = nodes[k] = fb.fireball_point(mass, self.ef, _MARCH_R0 + _MARCH_STEP * k)
+            return res
+
+        def q_at(k: int) -> float:
+            return node(k)[0]
+
+        def dose_at(k: int) -> float:
+            return node(k)[1]
+
+        # перебор начинается, только если q(1 м) > 1.2 — иначе пусть ошибку выдаст перебор
+        if q_at(0) <= Q_STOP:
+            return None
+
+        *zones, r_stop = self.radii(mass)
+        # последний узел перебора — первый, где q <= Q_STOP
+        k_last = first_index_le(q_at, Q_STOP, _march_node(r_stop))
+
+        return [_MARCH_R0 + _MARCH_STEP * march_index(dose_at, dose, _march_node(r), k_last)
+                for dose, r in zip(DOSE_THRESHOLDS, zones)]
+
+
+def get_fireball_table(ef: float, path: Path = FIREBALL_TABLE_PATH) -> FireballTable:
+    """Таблица для данного EF: из памяти, с диска или построенная заново (и сохранённая)."""
+    table = _TABLES.get(ef)
+    if table is None:
+        table = FireballTable.load(path, ef)
+        if table is None:
+            table = FireballTable.build(ef)
+            table.save(path)
+            print(f"Таблица огненного шара (EF={ef}) построена: {path}, погрешность до {table.max_error_m:.3f} м")
+        _TABLES[ef] = table
+    return table
+
+
+def check_class_zone(ef: float, masses) -> float:
+    """
+    Сверка табличных зон с перебором termal_class_zone_march.
+    Возвращает долю совпавших сценариев (печатает несовпадения).
+    """
+    table = get_fireball_table(ef)
+    fb = Fireball()
+    return check_zones(((mass,) for mass in masses), table.class_zone,
+                       lambda mass: fb.termal_class_zone_march(mass, ef))
+
+
+if __name__ == '__main__':
+    import random
+    import time
+    from core.config import EF
+
+    table = get_fireball_table(EF)
+    print(f"Погрешность интерполяции до {table.max_error_m:.4f} м")
+
+    t0 = time.perf_counter()
+    for _ in range(10000):
+        table.class_zone(2000.0)
+    print(f"class_zone: {(time.perf_counter() - t0) / 10000 * 1e6:.1f} мкс")
+
+    random.seed(0)
+    masses = [10 ** random.uniform(0, 5) for _ in range(100)]
+    print(f"Совпадение с перебором: {check_class_zone(EF, masses):.1%}")
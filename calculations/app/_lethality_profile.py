@@ -0,0 +1,207 @@
+# -----------------------------------------------------------
+# Профили поражения по расстоянию (пожар пролива, взрыв ТВС, огненный шар)
+#
+# Один проход по сетке радиусов (без поиска по спискам внутри цикла и без
+# создания Probit() на каждом шаге). Результат — компактные массивы float
+# (array('d')); termal_radiation_array, explosion_array и fireball_array
+# отдают те же значения списками.
+# -----------------------------------------------------------
+
+import bisect
+from array import array
+from dataclasses import dataclass
+from typing import Optional
+
+from calculations.app._probit import Probit
+
+_PROBIT = Probit()
+
+
+@dataclass(frozen=True)
+class LethalityProfile:
+    """
+    Профиль поражения: значения в узлах сетки радиусов (по возрастанию).
+
+    radius      — расстояние, м
+    intensity   — интенсивность теплового излучения, кВт/м2 (пожар, шар)
+                  или избыточное давление, кПа (взрыв)
+    probit      — пробит-функция
+    probability — вероятность гибели
+    dose        — доза теплового излучения, кДж/м2 (огненный шар)
+    impulse     — импульс, Па*с (взрыв)
+    """
+    radius: array
+    intensity: array
+    probit: array
+    probability: array
+    dose: Optional[array] = None
+    impulse: Optional[array] = None
+
+    def __len__(self) -> int:
+        return len(self.radius)
+
+    @property
+    def max_radius(self) -> float:
+        """Последний узел сетки (интенсивность/давление ниже порога перебора), м."""
+        return self.radius[-1] if self.radius else 0.0
+
+    def probability_at(self, radius: float) -> float:
+        """Вероятность гибели на расстоянии radius: значение ближайшего узла не дальше radius (0 за сеткой)."""
+        if not self.radius or radius > self.radius[-1]:
+            return 0.0
+        i = bisect.bisect_right(self.radius, radius) - 1
+        return self.probability[max(i, 0)]
+
+    def zone_radii(self, thresholds, values: Optional[array] = None, log: bool = False) -> list:
+        """
+        Радиусы порогов с интерполяцией между узлами (_threshold.interpolate_radii).
+
+        :@param thresholds: пороги (кВт/м2, кПа или кДж/м2 — в единицах values)
+        :@param values: профиль, по которому ищутся пороги (по умолчанию intensity; например dose)
+        :@param log: интерполяция по логарифму значения
+        """
+        from calculations.app._threshold import interpolate_radii
+
+        return interpolate_radii(self.radius, self.intensity if values is None else values, thresholds, log=log)
+
+
+def strait_fire_profile(S_spill: float, m_sg: float, mol_mass: float,
+                        t_boiling: float, wind_velocity: float, step: float = 0.1) -> LethalityProfile:
+    """
+    Профиль пожара пролива (Strait_fire.termal_radiation_array — списками).
+
+    :@param S_spill: площадь пролива, м2
+    :@param m_sg: удельная плотность выгорания, кг/(с*м2) (например m_sg = 0.06)
+    :@param mol_mass: молекулярная масса, кг/кмоль (например mol_mass = 95.3)
+    :@param t_boiling: температура кипения, град.С (например t_boiling = 68)
+    :@param wind_velocity: скорость ветра, м/с (например wind_velocity = 2)
+    :@param step: шаг сетки радиусов, м (0.1 — как в termal_radiation_array)
+
+    :@return: LethalityProfile
+    """
+    from calculations.app._strait_fire import Strait_fire
+
+    point = Strait_fire().termal_radiation_point
+    radius_arr = array("d")
+    q_term_arr = array("d")
+
+    # просчитаем значения пока интенсивность теплового излучения больше 1.2 кВт/м2
+    radius = 0.1
+    q_term = point(S_spill, m_sg, mol_mass, t_boiling, wind_velocity, radius)
+    while q_term > 1.2:
+        q_term = round(point(S_spill, m_sg, mol_mass, t_boiling, wind_velocity, radius), 2)
+        q_term_arr.append(q_term)
+        radius_arr.append(round(radius, 2))
+        radius += step
+
+    # расстояние, на котором интенсивность впервые < 4 кВт/м2
+    r_4_kw = 0
+    for r, q in zip(radius_arr, q_term_arr):
+        if q < 4:
+            r_4_kw = r
+            break
+
+    D_eff = (4 * S_spill / 3.14) ** (1 / 2)
+    probit_strait_fire = _PROBIT.probit_strait_fire
+    probability_of = _PROBIT.probability
+    probit_arr = array("d")
+    probability_arr = array("d")
+    for r, q in zip(radius_arr, q_term_arr):
+        dist = r_4_kw - r  # расстояние до точки на которой интенсивность = 4 кВт/м2
+        if r < D_eff:
+            probit, probability = 8.09, 0.99
+        elif dist < 0:
+            probit, probability = 0, 0
+        else:
+            probit = probit_strait_fire(dist, q)
+            probability = probability_of(probit)
+        probit_arr.append(probit)
+        probability_arr.append(probability)
+
+    return LethalityProfile(radius_arr, q_term_arr, probit_arr, probability_arr)
+
+
+def explosion_profile(class_substance: int, view_space: int, mass: float,
+                      heat_of_combustion: float, sigma: int, energy_level: int,
+                      step: float = 0.5) -> LethalityProfile:
+    """
+    Профиль взрыва ТВС (Explosion.explosion_array — списками).
+
+    :@param class_substance: класс взрывоопасности вещества (1-4)
+    :@param view_space: класс окружающего пространства (1-4)
+    :@param mass: масса испарившегося вещества, кг
+    :@param heat_of_combustion: теплота сгорания, кДж/кг (например heat_of_combustion = 46000)
+    :@param sigma: тип смеси  (4- парогазовая, 7 - газовая)
+    :@param energy_level: тип ТВС  (1- легкая, 2 - тяжелая)
+    :@param step: шаг сетки радиусов, м (0.5 — как в explosion_array)
+
+    :@return: LethalityProfile (intensity — избыточное давление, кПа; impulse — импульс, Па*с)
+    """
+    from calculations.app._tvs_explosion import Explosion
+
+    point = Explosion().explosion_point
+    probit_explosion = _PROBIT.probit_explosion
+    probability_of = _PROBIT.probability
+    radius_arr, delta_p_arr, impulse_arr, probit_arr, probability_arr = (array("d") for _ in range(5))
+
+    # просчитаем значения пока избыточное давление больше 1.9 кПа
+    radius = 0.1
+    delta_p = point(class_substance, view_space, mass, heat_of_combustion, sigma, energy_level, radius)[0]
+    while delta_p > 1.9:
+        delta_p, impulse = point(class_substance, view_space, mass, heat_of_combustion, sigma, energy_level, radius)
+        probit = round(probit_explosion(delta_p, impulse), 3)
+        radius_arr.append(radius)
+        delta_p_arr.append(delta_p)
+        impulse_arr.append(impulse)
+        probit_arr.append(probit)
+        probability_arr.append(round(probability_of(probit), 3))
+        radius += step
+
+    return LethalityProfile(radius_arr, delta_p_arr, probit_arr, probability_arr, impulse=impulse_arr)
+
+
+def fireball_profile(mass: float, ef: float, step: float = 0.5) -> LethalityProfile:
+    """
+    Профиль огненного шара (Fireball.fireball_array — списками).
+
+    :@param mass: масса огненного шара, кг
+    :@param ef: ср.поверхностная плотность теплового излучения, кВт/м2 (например ef = 450)
+    :@param step: шаг сетки радиусов, м (0.5 — как в fireball_array)
+
+    :@return: LethalityProfile (dose — доза теплового излучения, кДж/м2)
+    """
+    from calculations.app._fireball import Fireball
+
+    point = Fireball().fireball_point
+    probit_fireball = _PROBIT.probit_fireball
+    probability_of = _PROBIT.probability
+    radius_arr, q_term_arr, d_term_arr, probit_arr, probability_arr = (array("d") for _ in range(5))
+
+    # просчитаем значения пока интенсивность теплового излучения больше 1.2 кВт/м2
+    radius = 1
+    q_term = point(mass, ef, radius)[0]
+    t_s = 0.92 * (mass ** 0.303)
+    while q_term > 1.2:
+        q_term, d_term = point(mass, ef, radius)
+        probit = probit_fireball(t_s, q_term)
+        radius_arr.append(radius)
+        q_term_arr.append(q_term)
+        d_term_arr.append(d_term)
+        probit_arr.append(probit)
+        probability_arr.append(probability_of(probit))
+        radius += step
+
+    return LethalityProfile(radius_arr, q_term_arr, probit_arr, probability_arr, dose=d_term_arr)
+
+
+if __name__ == '__main__':
+    import time
+
+    for name, build, args in (
+            ("пожар пролива", strait_fire_profile, (2000, 0.06, 100, 63, 1)),
+            ("взрыв ТВС", explosion_profile, (2, 3, 5000, 46000, 4, 1)),
+            ("огненный шар", fireball_profile, (20000, 350)),
+    ):
+        t0 = time.perf_counter()
+        profile = build(*args)
+        print(f"{name}: {len(profile)} узлов до {profile.max_radius} м, {(time.perf_counter() - t0) * 1e3:.1f} мс")
@@ -66,3 +66,22 @@ def evaporation_intensity_kg_m2_s(
     molar_mass_g_per_mol = molar_mass_kg_per_mol * 1_000.0
     Pn_kpa = Pn_pa / 1_000.0
     return 1e-6 * eta * Pn_kpa * math.sqrt(molar_mass_g_per_mol)
+
+
+def saturated_vapor_pressure_pa_array(Tk_C, Tp_C, evaporation_heat_J_per_kg, molar_mass_kg_per_mol, P_ref_pa=P0):
+    """saturated_vapor_pressure_pa для массивов numpy (те же операции поэлементно, без проверок)."""
+    import numpy as np
+
+    Tk = Tk_C + 273.15
+    Tp = Tp_C + 273.15
+    delta_h_molar = evaporation_heat_J_per_kg * molar_mass_kg_per_mol  # Дж/моль
+    return P_ref_pa * np.exp(-(delta_h_molar / R) * (1.0 / Tk - 1.0 / Tp))
+
+
+def evaporation_intensity_kg_m2_s_array(Pn_pa, molar_mass_kg_per_mol, eta=1.0):
+    """evaporation_intensity_kg_m2_s для массивов numpy (без проверок)."""
+    import numpy as np
+
+    molar_mass_g_per_mol = molar_mass_kg_per_mol * 1_000.0
+    Pn_kpa = Pn_pa / 1_000.0
+    return 1e-6 * eta * Pn_kpa * np.sqrt(molar_mass_g_per_mol)
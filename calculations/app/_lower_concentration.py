@@ -6,6 +6,10 @@
 # email kuznetsovkm@yandex.ru
 # -----------------------------------------------------------
 
+# ближе этого к границе округления (в сотых долях метра) радиус пересчитывается скалярно
+_ROUND_GUARD = 1e-6
+
+
 class LCLP:
 
     def lower_concentration_limit(self, mass: float, mol_mass: float, t_boiling: float,
@@ -33,6 +37,48 @@ class LCLP:
 
         return [R_LCLP, R_f]
 
+    def lower_concentration_limits(self, mass, mol_mass, t_boiling, lower_concentration) -> tuple:
+        """
+        lower_concentration_limit для массивов numpy — те же округлённые радиусы.
+        Степень на массивах отличается от скалярной в последних битах, поэтому
+        радиусы у границы округления пересчитываются lower_concentration_limit.
+
+        :@return: tuple: (R_LCLP, R_f) — массивы формы broadcast аргументов
+        :@raise проверка функции на введенные нулевые значения
+        """
+        import numpy as np
+
+        mass, mol_mass, t_boiling, lower_concentration = np.broadcast_arrays(
+            *(np.asarray(v, dtype=float) for v in (mass, mol_mass, t_boiling, lower_concentration)))
+        if ((mass == 0) | (mol_mass == 0) | (lower_concentration == 0)).any():
+            raise ValueError(f'Фукнция не может принимать нулевые параметры')
+
+        def round_2(x):
+            # round(x, 2) и признак "у границы округления"
+            scaled = x * 100
+            return np.round(scaled) / 100, np.abs(scaled - np.floor(scaled) - 0.5) < _ROUND_GUARD
+
+        R_LCLP, near = round_2(lower_concentration_radii(mass, mol_mass, t_boiling, lower_concentration)[0])
+        R_f, near_f = round_2(R_LCLP * 1.2)
+        for i in zip(*np.nonzero(near | near_f)):
+            R_LCLP[i], R_f[i] = self.lower_concentration_limit(mass[i], mol_mass[i], t_boiling[i],
+                                                               lower_concentration[i])
+        return R_LCLP, R_f
+
+
+def lower_concentration_radii(mass, mol_mass, t_boiling, lower_concentration):
+    """
+    LCLP.lower_concentration_limit для массивов numpy (без округления):
+    радиусы НКПР и пожара-вспышки, при нулевой массе — 0.
+
+    :@return: tuple: (R_LCLP, R_f) — массивы формы broadcast аргументов
+    """
+    import numpy as np
+
+    vapour_density = mol_mass / (22.413 * (1 + 0.00367 * t_boiling))
+    R_LCLP = 7.8 * (np.maximum(mass, 0.0) / (vapour_density * lower_concentration)) ** 0.33
+    return R_LCLP, R_LCLP * 1.2
+
 
 if __name__ == '__main__':
     ev_class = LCLP()
@@ -8,8 +8,14 @@
 # -----------------------------------------------------------
 
 import math
-from calculations.app._probit import Probit
-from calculations.app._found_nearest_value import get_nearest_value
+from calculations.app._lethality_profile import strait_fire_profile
+from calculations.app._threshold import nearest_indices
+from core.config import (
+    BATCH_CALC_MIN_ROWS,
+    POOL_FIRE_SURFACE_ENABLED,
+    ZONE_INTERPOLATION_ENABLED,
+    ZONE_INTERPOLATION_STEP_FACTOR,
+)
 
 
 class Strait_fire:
@@ -110,49 +116,10 @@ class Strait_fire:
         :@return: : tuple: (radius, q_term, probit, probability): кортеж списков параметров
         """
 
-        radius_arr = []
-        q_term_arr = []
-        probit_arr = []
-        probability_arr = []
-
-        # максимальная интенсивность теплового излучения
-        radius = 0.1
-        q_term = self.termal_radiation_point(S_spill, m_sg, mol_mass, t_boiling, wind_velocity, radius)
-
-        # просчитаем значения пока интенсивность теплового излучения больше 1.2 кВт/м2
-        while q_term > 1.2:
-            q_term = round(self.termal_radiation_point(S_spill, m_sg, mol_mass,
-                                                       t_boiling, wind_velocity, radius), 2)
-            q_term_arr.append(q_term)
-            radius_arr.append(round(radius, 2))
-            radius += 0.1
-        # расчитаем пробит функцию и вероятность поражения
-        D_eff = (4 * S_spill / 3.14) ** (1 / 2)
-        # Определим расстояние на котором интенсивность = 4 кВт/м2
-        r_4_kw = 0
-        for q in q_term_arr:
-            if q < 4:
-                r_4_kw = radius_arr[q_term_arr.index(q)]
-                break
-
-        for i in radius_arr:
-            dist = r_4_kw - i  # расстояние до точки на которой интенсивность = 4 кВт/м2
-
-            if i < D_eff:
-                probit = 8.09
-                probability = 0.99
-            elif dist < 0:
-                probit = 0
-                probability = 0
-            else:
-                probit = Probit().probit_strait_fire(dist, q_term_arr[radius_arr.index(i)])
-                probability = Probit().probability(probit)
-            probit_arr.append(probit)
-            probability_arr.append(probability)
-
-        result = (radius_arr, q_term_arr, probit_arr, probability_arr)
-
-        return result
+        # один проход по сетке радиусов — strait_fire_profile
+        profile = strait_fire_profile(S_spill, m_sg, mol_mass, t_boiling, wind_velocity)
+        return (profile.radius.tolist(), profile.intensity.tolist(),
+                profile.probit.tolist(), profile.probability.tolist())
 
     def termal_class_zone(self, S_spill: float, m_sg: float, mol_mass: float,
                           t_boiling: float, wind_velocity: float):
@@ -163,6 +130,63 @@ class Strait_fire:
         :@param t_boiling: температура кипения, град.С (например t_boiling = 68)
         :@param wind_velocity: скорость ветра, м/с (например wind_velocity = 2)
 
+        :@return: : list: [radius_CZA]: список отсортированных зон
+
+        При ZONE_INTERPOLATION_ENABLED зоны интерполируются (termal_class_zone_interpolated).
+        Иначе при POOL_FIRE_SURFACE_ENABLED зоны берутся с поверхности отклика
+        (_strait_fire_surface.py), вне её сетки — перебором.
+        """
+        if ZONE_INTERPOLATION_ENABLED:
+            return self.termal_class_zone_interpolated(S_spill, m_sg, mol_mass, t_boiling, wind_velocity)
+        if POOL_FIRE_SURFACE_ENABLED:
+            from calculations.app._strait_fire_surface import get_pool_fire_surface
+
+            radius_CZA = get_pool_fire_surface().class_zone(S_spill, m_sg, mol_mass, t_boiling, wind_velocity)
+            if radius_CZA is not None:
+                return radius_CZA
+        return self.termal_class_zone_march(S_spill, m_sg, mol_mass, t_boiling, wind_velocity)
+
+    def termal_class_zones(self, S_spill, m_sg, mol_mass, t_boiling, wind_velocity):
+        """
+        termal_class_zone для массивов numpy: зоны, м, форма (..., 4).
+        Одинаковые входные данные считаются один раз. От BATCH_CALC_MIN_ROWS
+        случаев при POOL_FIRE_SURFACE_ENABLED — сразу все по поверхности отклика
+        (PoolFireSurface.class_zones), где она неприменима — перебором; меньше —
+        по одному termal_class_zone (накладные расходы numpy больше выигрыша).
+        """
+        import numpy as np
+
+        args = np.broadcast_arrays(*(np.asarray(v, dtype=float)
+                                     for v in (S_spill, m_sg, mol_mass, t_boiling, wind_velocity)))
+        shape = args[0].shape + (4,)
+        cases = np.stack([v.ravel() for v in args], axis=-1)
+
+        if ZONE_INTERPOLATION_ENABLED or not POOL_FIRE_SURFACE_ENABLED or len(cases) < BATCH_CALC_MIN_ROWS:
+            zones = {}
+            for case in map(tuple, cases.tolist()):
+                if case not in zones:
+                    zones[case] = self.termal_class_zone(*case)
+            return np.array([zones[case] for case in map(tuple, cases.tolist())]).reshape(shape)
+
+        from calculations.app._strait_fire_surface import get_pool_fire_surface
+
+        cases, inverse = np.unique(cases, axis=0, return_inverse=True)
+        zones = get_pool_fire_surface().class_zones(*cases.T)
+        for i in np.flatnonzero(np.isnan(zones).any(axis=-1)):
+            zones[i] = self.termal_class_zone_march(*cases[i].tolist())
+        return zones[inverse.ravel()].reshape(shape)
+
+    def termal_class_zone_march(self, S_spill: float, m_sg: float, mol_mass: float,
+                                t_boiling: float, wind_velocity: float):
+        """
+        Зоны перебором радиусов (termal_radiation_array) с шагом 0.1 м.
+
+        :@param S_spill: площадь пролива, м2
+        :@param m_sg: удельная плотность выгорания, кг/(с*м2) (например m_sg = 0.06)
+        :@param mol_mass: молекулярная масса, кг/кмоль (например mol_mass = 95.3)
+        :@param t_boiling: температура кипения, град.С (например t_boiling = 68)
+        :@param wind_velocity: скорость ветра, м/с (например wind_velocity = 2)
+
         :@return: : list: [radius_CZA]: список отсортированных зон
         """
 
@@ -175,11 +199,23 @@ class Strait_fire:
         q_term_array = res_list[1]
         radius_array = res_list[0]
 
-        for CZA in classified_zone_array:
-            ind = q_term_array.index(get_nearest_value(q_term_array, CZA))
+        for ind in nearest_indices(q_term_array, classified_zone_array):
             radius_CZA.append(radius_array[ind])
         return radius_CZA
 
+    def termal_class_zone_interpolated(self, S_spill: float, m_sg: float, mol_mass: float,
+                                       t_boiling: float, wind_velocity: float) -> list:
+        """
+        Зоны интерполяцией по логарифму q между узлами сетки с шагом
+        0.1 * ZONE_INTERPOLATION_STEP_FACTOR м (LethalityProfile.zone_radii):
+        радиус не привязан к узлам сетки перебора.
+
+        :@return: : list: [radius_CZA]: список отсортированных зон
+        """
+        profile = strait_fire_profile(S_spill, m_sg, mol_mass, t_boiling, wind_velocity,
+                                      step=0.1 * ZONE_INTERPOLATION_STEP_FACTOR)
+        return [round(r, 2) for r in profile.zone_radii([10.5, 7.0, 4.2, 1.4], log=True)]
+
 
 if __name__ == '__main__':
     ev_class = Strait_fire()
@@ -0,0 +1,448 @@
+# -----------------------------------------------------------
+# Поверхность отклика зон пожара пролива
+#
+# Интенсивность излучения termal_radiation_point зависит от входных данных
+# только через D_eff (площадь пролива), m_sg и безразмерную скорость ветра
+# u* = w / (m_sg*g*D_eff/po_steam)^(1/3): плотность пара (mol_mass, t_boiling)
+# и ветер входят лишь в u*. При u* < 1 от u* не зависит ничего
+# (cos_tetta = 1, длина пламени без u*), поэтому такие случаи — отдельный
+# слой "штиль", а ось u* начинается с 1 (там у методики разрыв).
+#
+# В узлах логарифмических сеток (S, m_sg, u*) один раз считаются радиусы,
+# на которых непрерывная интенсивность равна 10.5/7.0/4.2/1.4 кВт/м2
+# (поиск корня сразу по всей сетке, numpy), и хранятся в .npy, который
+# открывается через memmap. Между узлами — полилинейная интерполяция
+# log(радиуса); погрешность каждой ячейки оценивается точным расчётом в её
+# центре. Ячейки без оценки или с погрешностью больше
+# POOL_FIRE_SURFACE_MAX_ERROR_M, как и точки вне сетки, считаются перебором.
+#
+# Оценка радиуса — только начальная точка: результат уточняется несколькими
+# вызовами termal_radiation_point на сетке перебора (шаг 0.1 м, округление q,
+# ближайшее значение — march_index), поэтому совпадает с termal_class_zone_march.
+# -----------------------------------------------------------
+
+import bisect
+import math
+import os
+from pathlib import Path
+
+from calculations.app._calc_cache import check_zones, read_json, source_hash, tmp_path, write_json
+from calculations.app._strait_fire import Strait_fire
+from calculations.app._threshold import march_index, march_indices
+from core.config import (
+    POOL_FIRE_SURFACE_AREA_RANGE_M2,
+    POOL_FIRE_SURFACE_MAX_ERROR_M,
+    POOL_FIRE_SURFACE_MSG_RANGE,
+    POOL_FIRE_SURFACE_POINTS_PER_DECADE,
+    POOL_FIRE_SURFACE_USTAR_RANGE,
+)
+from core.path import POOL_FIRE_SURFACE_PATH
+
+# меняем при несовместимом изменении формата файла
+POOL_FIRE_SURFACE_VERSION = 1
+
+CLASSIFIED_ZONES = (10.5, 7.0, 4.2, 1.4)  # кВт/м2, как в termal_class_zone
+Q_STOP = 1.2  # кВт/м2: перебор termal_radiation_array останавливается на q <= 1.2
+E_F = 25  # кВт/м2, как в termal_radiation_point
+
+_U_CALM = 0.5  # любое u* < 1: слой "штиль"
+# q на массивах (_q_term) отличается от termal_radiation_point в последних битах:
+# ближе этого к границе округления (в сотых кВт/м2) или к Q_STOP q пересчитывается скалярно
+_ROUND_GUARD = 1e-6
+_BISECT_ITER = 60
+
+# радиусы перебора: radius += 0.1 от 0.1 (с тем же накоплением ошибки округления)
+_MARCH_RADII = [0.1]
+
+_SURFACES: dict = {}
+
+
+def _log_axis(bounds: tuple) -> list:
+    lo, hi = (math.log(v) for v in bounds)
+    n = max(2, int(round((hi - lo) / math.log(10) * POOL_FIRE_SURFACE_POINTS_PER_DECADE)) + 1)
+    return [lo + (hi - lo) * i / (n - 1) for i in range(n)]
+
+
+def _march_radius(k: int) -> float:
+    while len(_MARCH_RADII) <= k:
+        _MARCH_RADII.append(_MARCH_RADII[-1] + 0.1)
+    return _MARCH_RADII[k]
+
+
+def _u_star(S_spill: float, m_sg: float, mol_mass: float, t_boiling: float, wind_velocity: float) -> float:
+    """u* — как в termal_radiation_point."""
+    D_eff = math.sqrt(4 * S_spill / math.pi)
+    po_steam = mol_mass / (22.413 * (1 + 0.00367 * t_boiling))
+    return wind_velocity / math.pow((m_sg * 9.8 * D_eff) / po_steam, (1 / 3))
+
+
+def _q_term(D_eff, m_sg, u_star, radius):
+    """termal_radiation_point на массивах numpy (аргументы: D_eff, m_sg, u*, радиус)."""
+    import numpy as np
+
+    radius = np.maximum(radius, D_eff / 2 + 0.1)
+    windy = u_star >= 1
+    u = np.where(windy, u_star, 1.0)
+    base = m_sg / (1.15 * np.sqrt(9.81 * D_eff))
+    flame_length = np.where(windy, 55 * D_eff * base ** 0.67 * u ** 0.21, 42 * D_eff * base ** 0.61)
+    tetta = np.arccos(np.where(windy, u ** (-0.5), 1.0))
+    sin_t, cos_t = np.sin(tetta), np.cos(tetta)
+
+    a_pr = 2 * flame_length / D_eff
+    b_pr = 2 * radius / D_eff
+    A_pr = np.sqrt(a_pr * a_pr + (b_pr + 1) ** 2 - 2 * a_pr * (b_pr + 1) * sin_t)
+    B_pr = np.sqrt(a_pr * a_pr + (b_pr - 1) ** 2 - 2 * a_pr * (b_pr - 1) * sin_t)
+    C_pr = np.sqrt(1 + (b_pr ** 2 - 1) * cos_t ** 2)
+    D_pr = np.sqrt((b_pr - 1) / (b_pr + 1))
+    E_pr = (a_pr * cos_t) / (b_pr - a_pr * sin_t)
+    F_pr = np.sqrt(b_pr ** 2 - 1)
+
+    atan_af = np.arctan((a_pr * b_pr - F_pr * F_pr * sin_t) / (F_pr * C_pr)) + np.arctan(F_pr * F_pr * sin_t / (F_pr * C_pr))
+    Fv = (1 / np.pi) * (-E_pr * np.arctan(D_pr)
+                        + E_pr * ((a_pr ** 2 + (b_pr + 1) ** 2 - 2 * b_pr * (1 + a_pr * sin_t)) / (A_pr * B_pr))
+                        * np.arctan((A_pr * D_pr) / B_pr) + (cos_t / C_pr) * atan_af)
+    Fh = (1 / np.pi) * (np.arctan(1 / D_pr) + (sin_t / C_pr) * atan_af
+                        - ((a_pr ** 2 + (b_pr + 1) ** 2 - 2 * (b_pr + 1 + a_pr * b_pr * sin_t)) / (A_pr * B_pr))
+                        * np.arctan(A_pr * D_pr / B_pr))
+    Fq = np.sqrt(Fv ** 2 + Fh ** 2)
+    tay = np.exp(-7 * 10 ** (-4) * (radius - 0.5 * D_eff))
+    return Fq * tay * E_F
+
+
+def _zone_radii(log_S, log_msg, u_star):
+    """
+    Радиусы порогов CLASSIFIED_ZONES (непрерывная q) на сетке, м.
+    Форма (len(log_S), len(log_msg), len(u_star), 4); NaN — порог не
+    достигается и на границе пролива.
+    """
+    import numpy as np
+
+    S, m_sg, u = np.meshgrid(np.exp(log_S), np.exp(log_msg), np.asarray(u_star, dtype=float), indexing="ij")
+    D_eff = np.sqrt(4 * S / np.pi)
+    edge = D_eff / 2 + 0.1
+    q_edge = _q_term(D_eff, m_sg, u, edge)
+
+    out = np.full(S.shape + (len(CLASSIFIED_ZONES),), np.nan)
+    with np.errstate(all="ignore"):
+        for i, q_target in enumerate(CLASSIFIED_ZONES):
+            lo = edge.copy()
+            hi = edge + D_eff
+            while True:
+                above = _q_term(D_eff, m_sg, u, hi) > q_target
+                if not above.any():
+                    break
+                hi = np.where(above, hi * 2, hi)
+            for _ in range(_BISECT_ITER):
+                mid = (lo + hi) / 2
+                above = _q_term(D_eff, m_sg, u, mid) > q_target
+                lo = np.where(above, mid, lo)
+                hi = np.where(above, hi, mid)
+            out[..., i] = np.where(q_edge > q_target, (lo + hi) / 2, np.nan)
+    return out
+
+
+class PoolFireSurface:
+
+    def __init__(self, log_S: list, log_msg: list, log_u: list, data):
+        """
+        :@param log_S: узлы по площади пролива, ln(м2)
+        :@param log_msg: узлы по m_sg, ln(кг/(с*м2))
+        :@param log_u: узлы по u* (>= 1), ln; слой 0 массива — "штиль" (u* < 1)
+        :@param data: массив (S, m_sg, 1 + len(log_u), 5): ln радиусов 4 порогов в узлах
+            и (последний столбец) оценка погрешности ячейки с нижним углом в узле, м
+        """
+        self.log_S = log_S
+        self.log_msg = log_msg
+        self.log_u = log_u
+        self.data = data
+
+    # ---------------------------
+    # построение / хранение
+    # ---------------------------
+
+    @staticmethod
+    def _key() -> dict:
+        return {
+            "version": POOL_FIRE_SURFACE_VERSION,
+            "area_range": [float(v) for v in POOL_FIRE_SURFACE_AREA_RANGE_M2],
+            "msg_range": [float(v) for v in POOL_FIRE_SURFACE_MSG_RANGE],
+            "ustar_range": [float(v) for v in POOL_FIRE_SURFACE_USTAR_RANGE],
+            "points_per_decade": int(POOL_FIRE_SURFACE_POINTS_PER_DECADE),
+            "source": source_hash(Path(__file__).with_name("_strait_fire.py"), Path(__file__)),
+        }
+
+    @classmethod
+    def build(cls) -> "PoolFireSurface":
+        import numpy as np
+
+        log_S = _log_axis(POOL_FIRE_SURFACE_AREA_RANGE_M2)
+        log_msg = _log_axis(POOL_FIRE_SURFACE_MSG_RANGE)
+        log_u = _log_axis(POOL_FIRE_SURFACE_USTAR_RANGE)
+        u_nodes = [_U_CALM] + [math.exp(v) for v in log_u]
+
+        with np.errstate(divide="ignore"):
+            log_r = np.log(_zone_radii(log_S, log_msg, u_nodes))
+
+        # погрешность: точный расчёт в центрах ячеек против интерполяции
+        def centers(axis):
+            return [(a + b) / 2 for a, b in zip(axis, axis[1:])]
+
+        u_mid = [_U_CALM] + [math.exp(v) for v in centers(log_u)]
+        exact = _zone_radii(centers(log_S), centers(log_msg), u_mid)
+        corners = log_r[:-1, :-1] + log_r[1:, :-1] + log_r[:-1, 1:] + log_r[1:, 1:]  # (S-1, M-1, U, 4)
+        approx_calm = np.exp(corners[:, :, :1] / 4)
+        approx_wind = np.exp((corners[:, :, 1:-1] + corners[:, :, 2:]) / 8)
+        approx = np.concatenate([approx_calm, approx_wind], axis=2)
+        error = np.abs(approx - exact).max(axis=-1)
+        error[np.isnan(error)] = np.inf
+
+        data = np.full(log_r.shape[:3] + (len(CLASSIFIED_ZONES) + 1,), np.inf)
+        data[..., :-1] = log_r
+        data[:-1, :-1, :error.shape[2], -1] = error
+        return cls(log_S, log_msg, log_u, data)
+
+    def save(self, path: Path) -> None:
+        import numpy as np
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = tmp_path(path)
+        np.save(tmp, self.data)
+        os.replace(tmp, path)
+        # описание пишется последним: без него массив не используется
+        write_json(path.with_suffix(".json"), dict(self._key(), log_S=self.log_S, log_msg=self.log_msg,
+                                                   log_u=self.log_u, shape=list(self.data.shape)))
+
+    @classmethod
+    def load(cls, path: Path):
+        """Поверхность из файла (memmap) или None, если файла нет или он построен для другой сетки/формул."""
+        meta = read_json(path.with_suffix(".json"), cls._key())
+        if meta is None:
+            return None
+        import numpy as np
+
+        try:
+            data = np.load(path, mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        if list(data.shape) != meta["shape"]:
+            return None
+        return cls(meta["log_S"], meta["log_msg"], meta["log_u"], data)
+
+    def max_error_m(self) -> float:
+        import numpy as np
+
+        error = np.asarray(self.data[..., -1])
+        finite = error[np.isfinite(error)]
+        return float(finite.max()) if finite.size else math.inf
+
+    # ---------------------------
+    # запросы
+    # ---------------------------
+
+    @staticmethod
+    def _cell(axis: list, x: float):
+        """(индекс ячейки, доля внутри) или None вне оси."""
+        if not axis[0] <= x <= axis[-1]:
+            return None
+        i = min(bisect.bisect_right(axis, x) - 1, len(axis) - 2)
+        return i, (x - axis[i]) / (axis[i + 1] - axis[i])
+
+    def radii(self, S_spill: float, m_sg: float, u_star: float):
+        """
+        Оценка радиусов 4 порогов, м, и погрешность ячейки.
+        None — вне сетки, порог не везде достигается или погрешность выше допустимой.
+        """
+        if S_spill <= 0 or m_sg <= 0 or u_star <= 0:
+            return None
+        cell_S = self._cell(self.log_S, math.log(S_spill))
+        cell_m = self._cell(self.log_msg, math.log(m_sg))
+        if cell_S is None or cell_m is None:
+            return None
+        (i, ts), (j, tm) = cell_S, cell_m
+
+        if u_star < 1:
+            block = self.data[i:i + 2, j:j + 2, 0:1].tolist()
+            l, tu = 0, 0.0
+        else:
+            cell_u = self._cell(self.log_u, math.log(u_star))
+            if cell_u is None:
+                return None
+            l, tu = cell_u
+            block = self.data[i:i + 2, j:j + 2, l + 1:l + 3].tolist()
+            l += 1
+
+        error = float(self.data[i, j, l, -1])
+        if not error <= POOL_FIRE_SURFACE_MAX_ERROR_M:
+            return None
+
+        log_r = [0.0] * len(CLASSIFIED_ZONES)
+        for a, wa in ((0, 1 - ts), (1, ts)):
+            for b, wb in ((0, 1 - tm), (1, tm)):
+                for c, wc in ((0, 1 - tu), (1, tu)):
+                    if c >= len(block[a][b]):
+                        continue
+                    w = wa * wb * wc
+                    for n, v in enumerate(block[a][b][c][:-1]):
+                        log_r[n] += w * v
+        return [math.exp(v) for v in log_r], error
+
+    def class_zone(self, S_spill: float, m_sg: float, mol_mass: float,
+                   t_boiling: float, wind_velocity: float):
+        """
+        Зоны как у termal_class_zone_march (радиусы 0.1 + 0.1*k).
+        None — поверхность неприменима (считать перебором).
+        """
+        if 0 in (S_spill, m_sg, mol_mass, wind_velocity):
+            return None
+        estimate = self.radii(S_spill, m_sg, _u_star(S_spill, m_sg, mol_mass, t_boiling, wind_velocity))
+        if estimate is None:
+            return None
+        radii, _ = estimate
+
+        sf = Strait_fire()
+        # перебор начинается, только если q(0.1) > 1.2 — иначе пусть ошибку выдаст перебор
+        if sf.termal_radiation_point(S_spill, m_sg, mol_mass, t_boiling, wind_velocity, _march_radius(0)) <= Q_STOP:
+            return None
+
+        q_cache = {}
+
+        def q_at(k: int) -> float:
+            # округлённая q в узле сетки перебора, как в termal_radiation_array
+            q = q_cache.get(k)
+            if q is None:
+                q = q_cache[k] = round(sf.termal_radiation_point(S_spill, m_sg, mol_mass, t_boiling,
+                                                                 wind_velocity, _march_radius(k)), 2)
+            return q
+
+        return [round(_march_radius(march_index(q_at, CZA, max(0, math.ceil((r - _MARCH_RADII[0]) / 0.1)))), 2)
+                for CZA, r in zip(CLASSIFIED_ZONES, radii)]
+
+    def class_zones(self, S_spill, m_sg, mol_mass, t_boiling, wind_velocity):
+        """
+        class_zone для массивов (одномерных, одной длины): зоны, м, форма (n, 4) —
+        те же, что у termal_class_zone_march. q в узлах сетки перебора считается
+        сразу для всех случаев (_q_term); значения, округление которых зависит
+        от последних битов, пересчитываются termal_radiation_point.
+        Для единичных случаев быстрее class_zone.
+        NaN — поверхность неприменима (считать перебором).
+        """
+        import numpy as np
+
+        S, m, M, t, w = np.broadcast_arrays(*(np.asarray(v, dtype=float)
+                                              for v in (S_spill, m_sg, mol_mass, t_boiling, wind_velocity)))
+        out = np.full(S.shape + (len(CLASSIFIED_ZONES),), np.nan)
+        sf = Strait_fire()
+
+        rows = np.flatnonzero((S != 0) & (m != 0) & (M != 0) & (w != 0))
+        # u* — скалярно, как в termal_radiation_point (ветвь u* >= 1 не должна зависеть от битов)
+        u = np.zeros(S.shape)
+        u[rows] = [_u_star(*case) for case in zip(S[rows].tolist(), m[rows].tolist(), M[rows].tolist(),
+                                                   t[rows].tolist(), w[rows].tolist())]
+        estimate = self.radii_array(S, m, u)
+        rows = rows[~np.isnan(estimate[rows]).any(axis=-1)]
+        D_eff = np.sqrt(4 * S / math.pi)
+
+        def q_exact(i: int, k: int) -> float:
+            return sf.termal_radiation_point(S[i], m[i], M[i], t[i], w[i], _march_radius(k))
+
+        def q_raw(r, k):
+            _march_radius(int(k.max(initial=0)))
+            return _q_term(D_eff[r], m[r], u[r], np.array([_MARCH_RADII[i] for i in k.tolist()]))
+
+        def q_at(r, k):
+            # округлённая q в узлах k сетки перебора, как в termal_radiation_array
+            scaled = q_raw(r, k) * 100
+            q = np.round(scaled) / 100
+            for n in np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < _ROUND_GUARD):
+                q[n] = round(q_exact(r[n], int(k[n])), 2)
+            return q
+
+        # перебор начинается, только если q(0.1) > 1.2 — иначе пусть ошибку выдаст перебор
+        q0 = q_raw(rows, np.zeros(len(rows), dtype=int))
+        for n in np.flatnonzero(np.abs(q0 - Q_STOP) < _ROUND_GUARD):
+            q0[n] = q_exact(rows[n], 0)
+        rows = rows[q0 > Q_STOP]
+
+        for c, CZA in enumerate(CLASSIFIED_ZONES):
+            k = np.maximum(0, np.ceil((estimate[rows, c] - _MARCH_RADII[0]) / 0.1)).astype(int)
+            j = march_indices(lambda idx, kk: q_at(rows[idx], kk), np.full(len(rows), CZA), k)
+            out[rows, c] = [round(_march_radius(i), 2) for i in j.tolist()]
+        return out
+
+    def radii_array(self, S_spill, m_sg, u_star):
+        """
+        radii для массивов numpy: оценка радиусов 4 порогов, м, форма (..., 4).
+        NaN — там, где radii вернул бы None.
+        """
+        import numpy as np
+
+        S, m, u = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (S_spill, m_sg, u_star)))
+        calm = u < 1
+
+        def cell(axis: list, x):
+            a = np.asarray(axis)
+            i = np.clip(np.searchsorted(a, x, side="right") - 1, 0, len(a) - 2)
+            return i, (x - a[i]) / (a[i + 1] - a[i]), (x >= a[0]) & (x <= a[-1])
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            i, ts, in_S = cell(self.log_S, np.log(S))
+            j, tm, in_m = cell(self.log_msg, np.log(m))
+            l, tu, in_u = cell(self.log_u, np.log(np.where(calm, 1.0, u)))
+        valid = (S > 0) & (m > 0) & (u > 0) & in_S & in_m & (calm | in_u)
+        # слой 0 — "штиль", интерполяции по u* нет
+        l = np.where(calm, 0, l + 1)
+        tu = np.where(calm, 0.0, tu)
+        i, j, l = (np.where(valid, k, 0) for k in (i, j, l))
+        valid &= self.data[i, j, l, -1] <= POOL_FIRE_SURFACE_MAX_ERROR_M
+
+        log_r = np.zeros(S.shape + (len(CLASSIFIED_ZONES),))
+        with np.errstate(invalid="ignore"):
+            for a, wa in ((0, 1 - ts), (1, ts)):
+                for b, wb in ((0, 1 - tm), (1, tm)):
+                    for c, wc in ((0, 1 - tu), (1, tu)):
+                        w = (wa * wb * wc)[..., None]
+                        v = self.data[i + a, j + b, np.minimum(l + c, self.data.shape[2] - 1), :-1]
+                        log_r += np.where(w > 0, w * v, 0.0)
+        return np.where(valid[..., None], np.exp(log_r), np.nan)
+
+
+def get_pool_fire_surface(path: Path = POOL_FIRE_SURFACE_PATH) -> PoolFireSurface:
+    """Поверхность: из памяти, с диска (memmap) или построенная заново (и сохранённая)."""
+    surface = _SURFACES.get(path)
+    if surface is None:
+        surface = PoolFireSurface.load(path)
+        if surface is None:
+            surface = PoolFireSurface.build()
+            surface.save(path)
+            surface = PoolFireSurface.load(path)
+            print(f"Поверхность пожара пролива построена: {path}, погрешность до {surface.max_error_m():.3f} м")
+        _SURFACES[path] = surface
+    return surface
+
+
+def check_class_zone(cases) -> float:
+    """
+    Сверка зон по поверхности с перебором termal_class_zone_march.
+    cases: (S_spill, m_sg, mol_mass, t_boiling, wind_velocity).
+    Возвращает долю совпавших сценариев (печатает несовпадения).
+    """
+    return check_zones(cases, get_pool_fire_surface().class_zone, Strait_fire().termal_class_zone_march)
+
+
+if __name__ == '__main__':
+    import random
+    import time
+    from core.config import MSG, WIND
+
+    surface = get_pool_fire_surface()
+    print(f"Погрешность интерполяции до {surface.max_error_m():.3f} м")
+
+    t0 = time.perf_counter()
+    for _ in range(1000):
+        surface.class_zone(200, MSG, 100, 63, WIND)
+    print(f"class_zone: {(time.perf_counter() - t0) / 1000 * 1e6:.0f} мкс")
+
+    random.seed(0)
+    cases = [(10 ** random.uniform(0, 4.5), 10 ** random.uniform(-2, -0.7),
+              random.uniform(16, 200), random.uniform(-160, 200), random.uniform(0.5, 5)) for _ in range(200)]
+    print(f"Совпадение с перебором: {check_class_zone(cases):.1%}")
@@ -0,0 +1,186 @@
+# -----------------------------------------------------------
+# Поиск порогов на профилях "значение по расстоянию"
+#
+# Профили поражения (интенсивность, доза, избыточное давление) убывают
+# с расстоянием, поэтому все пороги ищутся одним numpy.searchsorted
+# вместо min(...) + list.index на каждый порог.
+#
+# nearest_indices — тот же узел сетки, что
+#     values.index(get_nearest_value(values, threshold)),
+#   этим считаются зоны *_class_zone_march (результаты в БД не меняются);
+# march_index / march_indices — тот же узел, но без построения профиля:
+#   значения считаются только в нескольких узлах около начального
+#   приближения (поверхность пожара пролива, таблица огненного шара,
+#   обращённая кривая взрыва ТВС);
+# interpolate_radii — радиус между соседними узлами (линейная или
+#   логарифмическая интерполяция): точность не привязана к шагу сетки;
+#   этим считаются зоны токсического поражения (toxic_zone) и, при
+#   ZONE_INTERPOLATION_ENABLED, *_class_zone_interpolated на редкой сетке.
+# -----------------------------------------------------------
+
+import math
+
+from calculations.app._found_nearest_value import get_nearest_value
+
+
+def _is_nonincreasing(v) -> bool:
+    return bool((v[1:] <= v[:-1]).all())
+
+
+def nearest_indices(values, thresholds) -> list:
+    """
+    Индексы узлов, ближайших к порогам, — как values.index(get_nearest_value(values, t)):
+    при равных расстояниях берётся значение, стоящее раньше, и его первое вхождение.
+
+    :@param values: значения профиля по узлам (невозрастающие; иначе — прямой перебор)
+    :@param thresholds: пороги
+
+    :@return: list: индекс узла для каждого порога
+    :@raise ValueError: пустой профиль (как min() у get_nearest_value)
+    """
+    import numpy as np
+
+    v = np.asarray(values, dtype=float)
+    n = len(v)
+    if n == 0:
+        raise ValueError("Пустой профиль: порог не найти")
+    if not _is_nonincreasing(v):
+        values = list(values)
+        return [values.index(get_nearest_value(values, t)) for t in thresholds]
+
+    t = np.asarray(thresholds, dtype=float)
+    ascending = v[::-1]
+    # первый узел, где значение <= порога (n — таких нет)
+    j = n - np.searchsorted(ascending, t, side="right")
+    above = np.maximum(j - 1, 0)
+    below = np.minimum(j, n - 1)
+    take_above = (j > 0) & ((j == n) | (np.abs(v[above] - t) <= np.abs(v[below] - t)))
+    # первое вхождение значения v[above]
+    first_above = n - np.searchsorted(ascending, v[above], side="right")
+    return np.where(take_above, first_above, below).tolist()
+
+
+def first_index_le(value_at, value: float, k: int, k_max: float = math.inf) -> int:
+    """
+    Первый узел сетки (не дальше k_max + 1), где value_at(k) <= value
+    (value_at по k не возрастает); поиск — от начального приближения k.
+    """
+    k = min(k, k_max + 1)
+    while k > 0 and value_at(k - 1) <= value:
+        k -= 1
+    while k <= k_max and value_at(k) > value:
+        k += 1
+    return k
+
+
+def march_index(value_at, threshold: float, k: int, k_max: float = math.inf) -> int:
+    """
+    Узел сетки перебора, ближайший к порогу, — как nearest_indices на профиле
+    value_at(0), ..., value_at(k_max), но value_at вызывается лишь в узлах около k.
+
+    :@param value_at: значение профиля в узле k (округлённое, как в переборе; по k не возрастает)
+    :@param threshold: порог
+    :@param k: начальное приближение (узел около порога)
+    :@param k_max: последний узел профиля (перебор остановился на нём)
+
+    :@return: int: индекс узла
+    """
+    j = first_index_le(value_at, threshold, k, k_max)
+    if j > 0:
+        above = value_at(j - 1)
+        # как get_nearest_value: при равенстве расстояний (и за концом профиля) — значение, стоящее раньше
+        if j > k_max or abs(above - threshold) <= abs(value_at(j) - threshold):
+            # первое вхождение этого (округлённого) значения
+            j = first_index_le(value_at, above, j - 1, k_max)
+    return j
+
+
+def _first_indices_le(value_at, values, k):
+    # first_index_le для массива случаев (профиль без конца)
+    import numpy as np
+
+    k = np.array(k, dtype=int)
+    active = np.flatnonzero(k > 0)
+    while active.size:
+        active = active[value_at(active, k[active] - 1) <= values[active]]
+        k[active] -= 1
+        active = active[k[active] > 0]
+    active = np.arange(len(k))
+    while active.size:
+        active = active[value_at(active, k[active]) > values[active]]
+        k[active] += 1
+    return k
+
+
+def march_indices(value_at, thresholds, k):
+    """
+    march_index для массива случаев сразу (numpy), профиль без конца (k_max = inf).
+
+    :@param value_at: value_at(idx, k) — значения в узлах k (массив) для случаев idx (массив номеров)
+    :@param thresholds: порог для каждого случая
+    :@param k: начальные приближения для каждого случая
+
+    :@return: numpy.ndarray: индекс узла для каждого случая
+    """
+    import numpy as np
+
+    thresholds = np.asarray(thresholds, dtype=float)
+    j = _first_indices_le(value_at, thresholds, k)
+    sub = np.flatnonzero(j > 0)
+    above, below = value_at(sub, j[sub] - 1), value_at(sub, j[sub])
+    # как get_nearest_value: при равенстве расстояний — значение, стоящее раньше
+    take = np.abs(above - thresholds[sub]) <= np.abs(below - thresholds[sub])
+    sub = sub[take]
+    # первое вхождение этого (округлённого) значения
+    j[sub] = _first_indices_le(lambda idx, kk: value_at(sub[idx], kk), above[take], j[sub] - 1)
+    return j
+
+
+def interpolate_radii(radius, values, thresholds, log: bool = False) -> list:
+    """
+    Радиусы, на которых убывающий профиль values(radius) достигает порогов,
+    с интерполяцией между соседними узлами.
+
+    :@param radius: узлы сетки, м (по возрастанию)
+    :@param values: значения профиля по узлам (невозрастающие)
+    :@param thresholds: пороги
+    :@param log: интерполяция по логарифму значения (значения и пороги > 0):
+        для интенсивности/давления, убывающих примерно степенно, точнее на редкой сетке
+
+    :@return: list: радиус для каждого порога, м;
+        0 — порог выше значения в первом узле, nan — ниже значения в последнем
+    """
+    import numpy as np
+
+    r = np.asarray(radius, dtype=float)
+    v = np.asarray(values, dtype=float)
+    t = np.asarray(thresholds, dtype=float)
+    n = len(v)
+    if n == 0:
+        return [float("nan")] * len(t)
+    if not _is_nonincreasing(v):
+        raise ValueError("Профиль должен не возрастать с расстоянием")
+
+    if log:
+        v, t = np.log(v), np.log(t)
+    # первый узел, где значение <= порога
+    j = n - np.searchsorted(v[::-1], t, side="right")
+    lo = np.clip(j - 1, 0, n - 1)
+    hi = np.clip(j, 0, n - 1)
+    span = v[lo] - v[hi]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        frac = np.where(span > 0, (v[lo] - t) / span, 0.0)
+    result = r[lo] + frac * (r[hi] - r[lo])
+    result = np.where(j == 0, np.where(t > v[0], 0.0, r[0]), result)
+    result = np.where(j == n, np.nan, result)
+    return result.tolist()
+
+
+if __name__ == '__main__':
+    from calculations.app._lethality_profile import fireball_profile
+
+    profile = fireball_profile(2000, 450)
+    thresholds = [600, 320, 220, 120]
+    print("узлы:", [profile.radius[i] for i in nearest_indices(profile.dose, thresholds)])
+    print("линейно:", [round(x, 2) for x in interpolate_radii(profile.radius, profile.dose, thresholds)])
+    print("лог:", [round(x, 2) for x in interpolate_radii(profile.radius, profile.dose, thresholds, log=True)])
@@ -0,0 +1,138 @@
+# -----------------------------------------------------------
+# Токсическое поражение: рассеяние выброса и зоны токсодоз
+#
+# Гауссова модель приземного источника (облако при мгновенном выбросе,
+# шлейф при испарении с пролива). Токсодоза на оси следа на расстоянии x
+# в обоих случаях одна и та же:
+#     D(x) = M / (pi * sigma_y(x) * sigma_z(x) * u),
+# где M — масса в облаке (или интенсивность * время испарения).
+# sigma_y, sigma_z — дисперсии Бриггса (открытая местность) по классу
+# устойчивости атмосферы. Доза считается сразу на всей логарифмической
+# сетке расстояний (numpy), радиусы пороговой и смертельной токсодоз —
+# интерполяцией по логарифму дозы (_threshold.interpolate_radii).
+# Если доза превышена и на границе сетки, сетка продолжается декадами
+# с тем же шагом, пока доза не опустится до порога (доза по расстоянию
+# убывает, поэтому радиус всегда находится).
+# -----------------------------------------------------------
+
+import functools
+import math
+from typing import Optional
+
+from core.config import TOXIC_DISTANCE_RANGE_M, TOXIC_POINTS_PER_DECADE, TOXIC_STABILITY_CLASS
+
+# Дисперсии Бриггса (открытая местность): класс -> (ay, az, bz, pz)
+#   sigma_y = ay * x * (1 + 0.0001 * x) ** -0.5
+#   sigma_z = az * x * (1 + bz * x) ** pz
+BRIGGS_RURAL = {
+    "A": (0.22, 0.20, 0.0, 0.0),
+    "B": (0.16, 0.12, 0.0, 0.0),
+    "C": (0.11, 0.08, 0.0002, -0.5),
+    "D": (0.08, 0.06, 0.0015, -0.5),
+    "E": (0.06, 0.03, 0.0003, -1.0),
+    "F": (0.04, 0.016, 0.0003, -1.0),
+}
+
+KG_S_PER_M3_TO_MG_MIN_PER_L = 1000 / 60  # кг*с/м3 -> мг*мин/л
+
+
+def _distances():
+    import numpy as np
+
+    x_min, x_max = TOXIC_DISTANCE_RANGE_M
+    n = max(2, int(round(math.log10(x_max / x_min) * TOXIC_POINTS_PER_DECADE)) + 1)
+    return np.geomspace(x_min, x_max, n)
+
+
+def _sigmas(x, stability: str):
+    import numpy as np
+
+    ay, az, bz, pz = BRIGGS_RURAL[stability]
+    sigma_y = ay * x / np.sqrt(1 + 0.0001 * x)
+    sigma_z = az * x * (1 + bz * x) ** pz
+    return sigma_y, sigma_z
+
+
+def toxic_dose(x, mass_kg: float, wind_velocity: float, stability: str):
+    """
+    Токсодоза на оси следа, мг*мин/л.
+
+    :@param x: расстояния, м (массив numpy)
+    :@param mass_kg: масса токсичного вещества в облаке/шлейфе, кг
+    :@param wind_velocity: скорость ветра, м/с
+    :@param stability: класс устойчивости атмосферы (A-F)
+    """
+    sigma_y, sigma_z = _sigmas(x, stability)
+    return mass_kg / (math.pi * sigma_y * sigma_z * wind_velocity) * KG_S_PER_M3_TO_MG_MIN_PER_L
+
+
+def _radius_beyond_grid(x_max: float, dose: float, mass_kg: float, wind_velocity: float, stability: str) -> float:
+    """Радиус токсодозы dose дальше границы сетки x_max, м."""
+    from calculations.app._threshold import interpolate_radii
+    import numpy as np
+
+    x0 = x_max
+    while True:
+        x = np.geomspace(x0, x0 * 10, TOXIC_POINTS_PER_DECADE + 1)
+        r = interpolate_radii(x, toxic_dose(x, mass_kg, wind_velocity, stability), [dose], log=True)[0]
+        if not math.isnan(r):
+            return r
+        x0 *= 10
+
+
+def _release_mass(mass_kg: float, rate_kg_s: Optional[float], duration_s: Optional[float]) -> float:
+    """Масса в поражающем факторе: облако целиком или испарение за duration_s (не больше mass_kg)."""
+    if rate_kg_s is None or duration_s is None:
+        return mass_kg
+    return min(mass_kg, rate_kg_s * duration_s)
+
+
+@functools.lru_cache(maxsize=4096)
+def toxic_zone(mass_kg: float, threshold_dose: Optional[float], lethal_dose: Optional[float],
+               wind_velocity: float, rate_kg_s: Optional[float] = None, duration_s: Optional[float] = None,
+               stability: str = TOXIC_STABILITY_CLASS) -> tuple:
+    """
+    Радиусы зон смертельной и пороговой токсодоз.
+
+    :@param mass_kg: масса токсичного вещества в аварии, кг
+    :@param threshold_dose: пороговая токсодоза, мг*мин/л (None — не задана)
+    :@param lethal_dose: смертельная токсодоза, мг*мин/л (None — не задана)
+    :@param wind_velocity: скорость ветра, м/с
+    :@param rate_kg_s: интенсивность испарения с пролива, кг/с (None — мгновенный выброс)
+    :@param duration_s: время испарения, с
+    :@param stability: класс устойчивости атмосферы (A-F)
+
+    :@return: tuple: (l_pt, p_pt) — радиусы, м (None — доза не задана);
+        зоны больше сетки TOXIC_DISTANCE_RANGE_M считаются на её продолжении
+    """
+    from calculations.app._threshold import interpolate_radii
+    import numpy as np
+
+    mass = _release_mass(mass_kg, rate_kg_s, duration_s)
+    doses = [d for d in (lethal_dose, threshold_dose) if d]
+    if mass <= 0 or wind_velocity <= 0 or not doses:
+        return (0.0 if lethal_dose else None, 0.0 if threshold_dose else None)
+
+    x = _distances()
+    radii = iter(interpolate_radii(x, toxic_dose(x, mass, wind_velocity, stability), doses, log=True))
+    result = []
+    for d in (lethal_dose, threshold_dose):
+        if not d:
+            result.append(None)
+            continue
+        r = next(radii)
+        if math.isnan(r):
+            # зона больше сетки расстояний
+            r = _radius_beyond_grid(float(x[-1]), d, mass, wind_velocity, stability)
+        result.append(r)
+    return tuple(result)
+
+
+if __name__ == '__main__':
+    import time
+
+    # аммиак: пороговая 15, смертельная 100 мг*мин/л
+    t0 = time.perf_counter()
+    print("мгновенный выброс 10 т:", toxic_zone(10000, 15, 100, 1))
+    print("испарение 0.5 кг/с, 1 ч:", toxic_zone(10000, 15, 100, 1, 0.5, 3600))
+    print(f"{(time.perf_counter() - t0) * 1e3:.1f} мс")
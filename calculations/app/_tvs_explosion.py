@@ -6,8 +6,20 @@
 # email kuznetsovkm@yandex.ru
 # -----------------------------------------------------------
 
-from calculations.app._probit import Probit
-from calculations.app._found_nearest_value import get_nearest_value
+import math
+
+from calculations.app._calc_cache import check_zones
+from calculations.app._lethality_profile import explosion_profile
+from calculations.app._threshold import march_index, nearest_indices
+from core.config import ZONE_INTERPOLATION_ENABLED, ZONE_INTERPOLATION_STEP_FACTOR
+
+
+# сетка радиусов перебора (explosion_array): от 0.1 м с шагом 0.5 м до ΔP <= 1.9 кПа
+_MARCH_R0 = 0.1
+_MARCH_STEP = 0.5
+_MARCH_STOP_KPA = 1.9
+# нижняя граница приведённого расстояния в explosion_point
+_RX_MIN = 0.34
 
 
 class Explosion:
@@ -104,42 +116,25 @@ class Explosion:
         :@return: : list: [radius, delta_p_arr, impulse_arr, probit, probability]: список списков параметров
         """
 
-        radius_arr = []
-        delta_p_arr = []
-        impulse_arr = []
-        probit_arr = []
-        probability_arr = []
-
-        # максимальная избыточное давление
-        radius = 0.1
-        delta_p = self.explosion_point(class_substance, view_space,
-                                       mass, heat_of_combustion, sigma,
-                                       energy_level, radius)[0]
-
-        # просчитаем значения пока взрыв больше 2.9 кПА
-        while delta_p > 1.9:
-            res = self.explosion_point(class_substance, view_space,
-                                       mass, heat_of_combustion, sigma,
-                                       energy_level, radius)
-            delta_p = res[0]
-            impulse = res[1]
-            probit = round(Probit().probit_explosion(delta_p, impulse), 3)
-            probability = round(Probit().probability(probit), 3)
-            # append
-            radius_arr.append(radius)
-            delta_p_arr.append(delta_p)
-            impulse_arr.append(impulse)
-            probit_arr.append(probit)
-            probability_arr.append(probability)
-            radius += 0.5
-
-        result = (radius_arr, delta_p_arr, impulse_arr, probit_arr, probability_arr)
-
-        return result
+        # один проход по сетке радиусов — explosion_profile
+        profile = explosion_profile(class_substance, view_space, mass, heat_of_combustion, sigma, energy_level)
+        return (profile.radius.tolist(), profile.intensity.tolist(), profile.impulse.tolist(),
+                profile.probit.tolist(), profile.probability.tolist())
 
     def explosion_class_zone(self, class_substance: int, view_space: int, mass: float,
                              heat_of_combustion: float, sigma: int, energy_level: int) -> list:
         """
+        Радиусы зон по избыточному давлению без перебора радиусов.
+
+        ΔP зависит от радиуса только через приведённое расстояние
+        Rx = r / (E/101300)^(1/3): ΔP = C * (0.83/Rx - 0.14/Rx^2), где
+        C = (v/340)^2 * (sigma-1)/sigma * 101.3 при данных скорости горения и sigma.
+        Кривая обращается аналитически (квадратное уравнение относительно 1/Rx),
+        радиус = Rx * (E/101300)^(1/3). Результат совпадает с перебором
+        explosion_class_zone_march (шаг 0.5 м, округление ΔP, ближайшее значение):
+        по обращённой кривой находится нужный узел сетки радиусов и уточняется
+        несколькими вызовами explosion_point.
+
         :@param class_substance: класс взрывоопасности вещества (1-4)
         :@param view_space: класс окружающего пространства (1-4)
         :@param mass: масса испарившегося вещества, кг
@@ -147,6 +142,70 @@ class Explosion:
         :@param sigma: тип смеси  (4- парогазовая, 7 - газовая)
         :@param energy_level: тип ТВС  (1- легкая, 2 - тяжелая)
 
+        :@return: : list: [radius_CZA]: список отсортированных зон
+
+        При ZONE_INTERPOLATION_ENABLED — explosion_class_zone_interpolated.
+        """
+        if ZONE_INTERPOLATION_ENABLED:
+            return self.explosion_class_zone_interpolated(class_substance, view_space, mass,
+                                                          heat_of_combustion, sigma, energy_level)
+
+        def delta_p_at(k: int) -> float:
+            # ΔP в узле сетки перебора: radius = 0.1 + 0.5*k
+            return self.explosion_point(class_substance, view_space, mass, heat_of_combustion,
+                                        sigma, energy_level, _MARCH_R0 + _MARCH_STEP * k)[0]
+
+        scale, coef = self._scaling(class_substance, view_space, mass, heat_of_combustion, sigma, energy_level)
+
+        classified_zone_array = [100, 70, 28, 14, 5, 3.5]  # CZA
+        radius_CZA = []
+        delta_p_0 = delta_p_at(0)
+
+        for CZA in classified_zone_array:
+            # перебор останавливается на первом ΔP <= 1.9, все пороги выше 1.9
+            if delta_p_0 <= _MARCH_STOP_KPA or CZA > delta_p_0:
+                radius_CZA.append(0)
+                continue
+
+            # начальное приближение — узел сетки за радиусом порога на обращённой кривой
+            r = self._radius_for_pressure(CZA + 0.005, scale, coef)
+            j = march_index(delta_p_at, CZA, max(0, math.ceil((r - _MARCH_R0) / _MARCH_STEP)))
+            radius_CZA.append(_MARCH_R0 + _MARCH_STEP * j)
+        return radius_CZA
+
+    def _scaling(self, class_substance: int, view_space: int, mass: float,
+                 heat_of_combustion: float, sigma: int, energy_level: int) -> tuple:
+        """(E/101300)^(1/3) и коэффициент C кривой ΔP(Rx) — как в explosion_point."""
+        v_burn_rate = self.burn_rate(int(class_substance), int(view_space), mass)
+        E = mass * heat_of_combustion * energy_level * 1000
+        if E < 1:
+            E = 0.1 * heat_of_combustion * energy_level * 1000
+        scale = (E / 101300) ** (1 / 3)
+        coef = ((v_burn_rate / 340) ** 2) * ((sigma - 1) / sigma) * 101.3
+        return scale, coef
+
+    @staticmethod
+    def _radius_for_pressure(delta_p: float, scale: float, coef: float) -> float:
+        """
+        Радиус, на котором непрерывная (неокруглённая) ΔP равна delta_p, м.
+        0.83/Rx - 0.14/Rx^2 = a  ->  a*Rx^2 - 0.83*Rx + 0.14 = 0, убывающая ветвь.
+        """
+        if coef <= 0:
+            return 0.0
+        a = delta_p / coef
+        f_max = 0.83 / _RX_MIN - 0.14 / (_RX_MIN ** 2)  # ΔP/C при Rx <= 0.34
+        if a >= f_max:
+            return 0.0
+        if a <= 0:
+            return math.inf
+        rx = (0.83 + math.sqrt(0.83 ** 2 - 4 * 0.14 * a)) / (2 * a)
+        return max(rx, _RX_MIN) * scale
+
+    def explosion_class_zone_march(self, class_substance: int, view_space: int, mass: float,
+                                   heat_of_combustion: float, sigma: int, energy_level: int) -> list:
+        """
+        Радиусы зон перебором радиусов (explosion_array) — эталон для explosion_class_zone.
+
         :@return: : list: [radius_CZA]: список отсортированных зон
         """
 
@@ -160,16 +219,40 @@ class Explosion:
         delta_p_array = res_list[1]
         radius_array = res_list[0]
 
-        for CZA in classified_zone_array:
-            if len(delta_p_array) == 0:
-                radius_CZA.append(0)
-            elif CZA > delta_p_array[0]:
+        if len(delta_p_array) == 0:
+            return [0] * len(classified_zone_array)
+
+        for CZA, ind in zip(classified_zone_array, nearest_indices(delta_p_array, classified_zone_array)):
+            if CZA > delta_p_array[0]:
                 radius_CZA.append(0)
             else:
-                ind = delta_p_array.index(get_nearest_value(delta_p_array, CZA))
                 radius_CZA.append(radius_array[ind])
         return radius_CZA
 
+    def explosion_class_zone_interpolated(self, class_substance: int, view_space: int, mass: float,
+                                          heat_of_combustion: float, sigma: int, energy_level: int) -> list:
+        """
+        Радиусы зон интерполяцией по логарифму ΔP между узлами сетки с шагом
+        0.5 * ZONE_INTERPOLATION_STEP_FACTOR м (LethalityProfile.zone_radii).
+        0 — порог не достигается, как у explosion_class_zone_march.
+
+        :@return: : list: [radius_CZA]: список отсортированных зон
+        """
+        profile = explosion_profile(class_substance, view_space, mass, heat_of_combustion, sigma, energy_level,
+                                    step=_MARCH_STEP * ZONE_INTERPOLATION_STEP_FACTOR)
+        return [0 if math.isnan(r) else round(r, 2)
+                for r in profile.zone_radii([100, 70, 28, 14, 5, 3.5], log=True)]
+
+
+def check_class_zone(cases) -> float:
+    """
+    Сверка explosion_class_zone с перебором explosion_class_zone_march.
+    cases: итерируемое кортежей аргументов explosion_class_zone.
+    Возвращает долю совпавших сценариев (печатает несовпадения).
+    """
+    ev = Explosion()
+    return check_zones(cases, ev.explosion_class_zone, ev.explosion_class_zone_march)
+
 
 if __name__ == '__main__':
     ev_class = Explosion()
@@ -183,3 +266,9 @@ if __name__ == '__main__':
     print(ev_class.explosion_class_zone(class_substance, view_space,
                                         mass, heat_of_combustion, sigma,
                                         energy_level))
+
+    # сверка с перебором на сетке параметров
+    import itertools
+    cases = itertools.product((1, 2, 3, 4), (1, 2, 3, 4), (0.5, 12, 350, 1980, 25000),
+                              (44000, 46000), (4, 7), (1, 2))
+    print(f"Совпадение с перебором: {check_class_zone(cases):.1%}")
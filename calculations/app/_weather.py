@@ -0,0 +1,136 @@
+# -----------------------------------------------------------
+# Классы погоды: скорость ветра x средняя температура воздуха
+#
+# Наблюдения (data/chart_static/Данные.xlsx, по суткам) раскладываются
+# по тем же интервалам, что и на диаграмме weather_probability.py:
+# ветер 1–<2, 2–<3, 3–<4, 4–≤5, >5 м/с (штиль < 1 м/с не учитывается),
+# температура <0, 0–<10, 10–<20, ≥20 °C. Класс — непустая клетка
+# совместного распределения; расчётные ветер и температура класса —
+# средние наблюдений клетки, вероятность — доля суток.
+#
+# Таблица классов хранится в weather_classes.json (пишет
+# weather_probability.py), расчёт читает только её: pandas/openpyxl
+# для чтения Excel расчёту не нужны.
+# -----------------------------------------------------------
+
+import functools
+import json
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from core.path import WEATHER_CLASSES_PATH
+
+WIND_LABELS = ("1–<2", "2–<3", "3–<4", "4–≤5", ">5")
+TEMPERATURE_LABELS = ("<0", "0–<10", "10–<20", "≥20")
+
+
+@dataclass(frozen=True)
+class WeatherClass:
+    """
+    wind_m_s          — расчётная скорость ветра, м/с
+    temperature_c     — расчётная температура воздуха, °C
+    probability       — вероятность класса (доля суток)
+    wind_label        — интервал скорости ветра (WIND_LABELS)
+    temperature_label — интервал температуры (TEMPERATURE_LABELS)
+    """
+    wind_m_s: float
+    temperature_c: float
+    probability: float
+    wind_label: str
+    temperature_label: str
+
+
+def wind_class_index(wind):
+    """Номер интервала скорости ветра (WIND_LABELS); -1 — штиль < 1 м/с или нет данных."""
+    import numpy as np
+
+    wind = np.asarray(wind, dtype=float)
+    return np.select(
+        [(wind >= 1) & (wind < 2), (wind >= 2) & (wind < 3), (wind >= 3) & (wind < 4),
+         (wind >= 4) & (wind <= 5), wind > 5],
+        range(len(WIND_LABELS)),
+        -1,
+    )
+
+
+def temperature_class_index(temperature):
+    """Номер интервала температуры (TEMPERATURE_LABELS); -1 — нет данных."""
+    import numpy as np
+
+    temperature = np.asarray(temperature, dtype=float)
+    return np.select(
+        [temperature < 0, (temperature >= 0) & (temperature < 10),
+         (temperature >= 10) & (temperature < 20), temperature >= 20],
+        range(len(TEMPERATURE_LABELS)),
+        -1,
+    )
+
+
+def class_probabilities(index, n_classes: int):
+    """Доли наблюдений по интервалам (наблюдения с индексом -1 не учитываются)."""
+    import numpy as np
+
+    counts = np.bincount(index[index >= 0], minlength=n_classes).astype(float)
+    return counts / counts.sum()
+
+
+def weather_classes(wind, temperature) -> list:
+    """
+    Классы погоды по суточным наблюдениям.
+
+    :@param wind: скорость ветра по суткам, м/с (массив numpy, nan — нет данных)
+    :@param temperature: средняя температура по тем же суткам, °C
+
+    :@return: list: WeatherClass непустых клеток (ветер, затем температура по возрастанию)
+    """
+    import numpy as np
+
+    wind = np.asarray(wind, dtype=float)
+    temperature = np.asarray(temperature, dtype=float)
+    wi = wind_class_index(wind)
+    ti = temperature_class_index(temperature)
+    valid = (wi >= 0) & (ti >= 0)
+
+    n_cells = len(WIND_LABELS) * len(TEMPERATURE_LABELS)
+    cell = wi[valid] * len(TEMPERATURE_LABELS) + ti[valid]
+    counts = np.bincount(cell, minlength=n_cells)
+    wind_sum = np.bincount(cell, weights=wind[valid], minlength=n_cells)
+    temperature_sum = np.bincount(cell, weights=temperature[valid], minlength=n_cells)
+
+    total = counts.sum()
+    classes = []
+    for c in np.flatnonzero(counts).tolist():
+        w, t = divmod(c, len(TEMPERATURE_LABELS))
+        classes.append(WeatherClass(
+            wind_m_s=round(float(wind_sum[c] / counts[c]), 2),
+            temperature_c=round(float(temperature_sum[c] / counts[c]), 2),
+            probability=float(counts[c] / total),
+            wind_label=WIND_LABELS[w],
+            temperature_label=TEMPERATURE_LABELS[t],
+        ))
+    return classes
+
+
+def save_weather_classes(classes: list, path: Path = WEATHER_CLASSES_PATH, source: str = "") -> None:
+    data = {"source": source, "classes": [asdict(c) for c in classes]}
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+@functools.lru_cache(maxsize=None)
+def load_weather_classes(path: Path = WEATHER_CLASSES_PATH) -> tuple:
+    """
+    Классы погоды из weather_classes.json.
+
+    :@return: tuple: WeatherClass (пустой — файла нет)
+    """
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except OSError:
+        return ()
+    return tuple(WeatherClass(**c) for c in data["classes"])
+
+
+if __name__ == '__main__':
+    for wc in load_weather_classes():
+        print(f"ветер {wc.wind_label:>5} м/с ({wc.wind_m_s:5.2f}), "
+              f"температура {wc.temperature_label:>6} °C ({wc.temperature_c:6.2f}): P = {wc.probability:.3f}")
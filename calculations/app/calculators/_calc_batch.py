@@ -0,0 +1,313 @@
+"""
+Пакетный (поколоночный) расчёт сценариев по всем строкам оборудования пары
+(equipment_type, kind).
+
+calc_for_scenario считает одну строку и один сценарий: каждый раз заново
+разбирает JSON вещества, считает массу в оборудовании и собирает dict.
+Здесь строки пары берутся колонками numpy, а каждая линия сценария
+считается сразу для всех строк: количество ОВ, истечение, пролив,
+испарение, ущерб и риски — поэлементной арифметикой в том же порядке
+операций, что и в прежних обработчиках. Зоны — calculate_zone_columns
+(пожар пролива и вспышка массивами), последствия — calculate_people_damage
+по уникальным (possible_dead, possible_injured).
+
+equipment_type_0_kind_0/1/6/9.calc_for_scenario вызывают этот же расчёт для
+одной строки, так что физика трубопровода с жидкостью описана один раз.
+
+Результат — колонки calculations (struct-of-arrays) для executemany.
+Пока поддержаны пары, уже переведённые на общие калькуляторы (трубопроводы
+с жидкостью, equipment_type_0_kind_0/1/6/9); остальные считаются по строкам.
+"""
+from __future__ import annotations
+
+import functools
+import sqlite3
+
+import numpy as np
+
+from calculations.app._base_cost_for_damage import approx_equipment_cost_array
+from calculations.app._frequency import apply_ac_multiplier
+from calculations.app._liguid_evaporation import evaporation_intensity_kg_m2_s, saturated_vapor_pressure_pa
+from calculations.app._scenario_common import parse_substance_props
+from calculations.app.calculators._calc_people import calculate_people_damage
+from calculations.app.calculators._calc_zone import calculate_zone_columns
+from calculations.app.scenario.scenario_matrix import get_calc_code
+from core.config import (
+    CD,
+    DAMAGE_SCALE,
+    DAMAGE_SIX_SC,
+    KG_TO_T,
+    MASS_IN_CLOUDE,
+    MASS_TO_PART,
+    P0,
+    PEOPLE_COUNT,
+    SPILL_TO_PART,
+)
+
+# Полные и частичные варианты
+FULL_SCENARIO_LINE = (1, 2, 3)
+PART_SCENARIO_LINE = (4, 5, 6)
+# Пары с двумя линиями (полный, частичный вариант) -> линии шестисценарной схемы
+# (полный / частичный вариант и коэффициент ущерба DAMAGE_SIX_SC)
+TWO_LINE_SCHEME = {1: 1, 2: 4}
+
+
+def _column(rows: list[sqlite3.Row], name: str) -> np.ndarray:
+    """Колонка строк оборудования (None -> nan)."""
+    return np.array([np.nan if r[name] is None else float(r[name]) for r in rows])
+
+
+def _interleave(per_line: list[list]) -> list:
+    # [линия][строка] -> порядок записи: строка за строкой, внутри — линии сценариев
+    return [v for row in zip(*per_line) for v in row]
+
+
+def _values(value, n: int) -> list:
+    """Значения колонки: массив -> список чисел Python, скаляр/None -> повтор."""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return [value] * n
+
+
+def liquid_pipeline_columns(rows: list[sqlite3.Row], *, evaporates: bool) -> dict:
+    """
+    Колонки строк трубопровода с жидкостью, не зависящие от линии сценария
+    (calculate_amount, исходные данные calc_spill_area_m2 и calculate_evaporation).
+
+    :@param rows: строки equipment + substances одной пары (0, kind)
+    :@param evaporates: считать интенсивность испарения W
+
+    :@return: dict: row_props, amount_t, base_ov_in_accident_t, spill_area, spill_coefficient,
+        quantity, hazard_components; при evaporates — W, кг/(м2*с), и evaporation_time, с
+    """
+    props = {}
+    for r in rows:
+        if r["substance_id"] not in props:
+            props[r["substance_id"]] = parse_substance_props(r)
+    row_props = [props[r["substance_id"]] for r in rows]
+
+    # -------------------------------------------------------------------------
+    # Количество ОВ (calculate_amount)
+    # -------------------------------------------------------------------------
+    density = np.array([float(p.physical["density_liquid_kg_per_m3"]) for p in row_props])
+    length = _column(rows, "length_m")
+    diameter = _column(rows, "diameter_mm")
+    d_in_mm = diameter - 2.0 * _column(rows, "wall_thickness_mm")
+    d_in_m = d_in_mm / 1000.0
+    with np.errstate(invalid="ignore"):
+        # nan (None в БД) не проходит проверку — как 0.0 в pipeline_internal_volume_m3
+        valid = (length > 0) & (d_in_mm > 0)
+    volume = np.where(valid, np.pi * (d_in_m / 2.0) ** 2 * length, 0.0)
+    amount_t = volume * density * KG_TO_T
+
+    d = diameter / 1000
+    area = np.pi * d ** 2 / 4
+    m_dot_leak = CD * area * np.sqrt(2 * density * (_column(rows, "pressure_mpa") * 1e6))
+
+    columns = {
+        "row_props": row_props,
+        "amount_t": amount_t,
+        "base_ov_in_accident_t": amount_t + m_dot_leak * _column(rows, "shutdown_time_s") * KG_TO_T,
+        "spill_area": _column(rows, "spill_area_m2"),
+        "spill_coefficient": _column(rows, "spill_coefficient"),
+        "quantity": np.array([r["quantity_equipment"] for r in rows]),
+        "hazard_components": [r["hazard_component"] for r in rows],
+    }
+
+    # интенсивность испарения зависит только от строки (calculate_evaporation)
+    if evaporates:
+        intensity = {}
+        for r, p in zip(rows, row_props):
+            key = (r["substance_id"], r["substance_temperature_c"])
+            if key not in intensity:
+                Pn = saturated_vapor_pressure_pa(r["substance_temperature_c"], p.t_boiling,
+                                                 p.evaporation_heat_J_per_kg, p.mol_mass, P0)
+                intensity[key] = evaporation_intensity_kg_m2_s(Pn, p.mol_mass, eta=1.0)
+        columns["W"] = np.array([intensity[(r["substance_id"], r["substance_temperature_c"])] for r in rows])
+        columns["evaporation_time"] = _column(rows, "evaporation_time_s")
+    return columns
+
+
+def line_accident_and_spill(columns: dict, sc_line: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Количество ОВ в аварии, т, и площадь пролива, м2, линии сценария
+    (полный / частичный вариант, calc_spill_area_m2).
+    """
+    base_ov_in_accident_t = columns["base_ov_in_accident_t"]
+    spill_area = columns["spill_area"]
+    if sc_line in FULL_SCENARIO_LINE:
+        ov_in_accident_t = base_ov_in_accident_t
+    elif sc_line in PART_SCENARIO_LINE:
+        ov_in_accident_t = base_ov_in_accident_t * MASS_TO_PART
+    else:
+        ov_in_accident_t = np.zeros(len(base_ov_in_accident_t))
+
+    full_spill = spill_area if sc_line in FULL_SCENARIO_LINE else spill_area * SPILL_TO_PART
+    spill = np.where(spill_area == 0, ov_in_accident_t * columns["spill_coefficient"], full_spill)
+    return ov_in_accident_t, spill
+
+
+def line_scenario_frequency(columns: dict, scenario: dict, ac_applied: bool = False) -> tuple[dict, np.ndarray]:
+    """
+    Частоты линии сценария по составляющим (apply_ac_multiplier) и частота
+    сценария каждой строки с учётом количества оборудования.
+
+    :@param ac_applied: множитель компенсирующих мероприятий уже учтён в scenario
+    """
+    hazard_components = columns["hazard_components"]
+    ac = {hc: scenario if ac_applied else apply_ac_multiplier(scenario, hc) for hc in set(hazard_components)}
+    scenario_frequency = np.array([ac[hc].get("scenario_frequency", 1) for hc in hazard_components]) * columns["quantity"]
+    return ac, scenario_frequency
+
+
+def calc_liquid_pipeline_batch(
+        rows: list[sqlite3.Row],
+        scenarios: list[dict],
+        scenario_no: list[int],
+        *,
+        kind: int,
+        evaporates: bool,
+        line_scheme: dict[int, int] | None = None,
+        ac_applied: bool = False,
+) -> dict[str, list]:
+    """
+    Трубопровод с жидкостью: то же, что equipment_type_0_kind_0/1/6/9.calc_for_scenario,
+    для всех строк сразу.
+
+    :@param rows: строки equipment + substances (как в create_calc.main) одной пары (0, kind)
+    :@param scenarios: типовые сценарии пары (без множителя компенсирующих мероприятий)
+    :@param scenario_no: scenario_no первого сценария каждой строки
+    :@param kind: вид вещества (0, 1 — ЛВЖ и токсичная ЛВЖ с испарением,
+        6, 9 — токсичная и горючая жидкость без испарения)
+    :@param evaporates: учитывать испарение (ov_in_hazard_factor_t взрыва, вспышки
+        и токсичного облака — испарившаяся масса)
+    :@param line_scheme: линия сценария пары -> линия шестисценарной схемы
+        (None — линии пары и есть эта схема; TWO_LINE_SCHEME — две линии)
+    :@param ac_applied: множитель компенсирующих мероприятий уже учтён в scenarios
+        (так их передаёт create_calc в calc_for_scenario)
+
+    :@return: dict: колонка calculations -> список значений
+        (строка за строкой, внутри — сценарии в порядке scenarios)
+    """
+    n = len(rows)
+    columns = liquid_pipeline_columns(rows, evaporates=evaporates)
+    if evaporates:
+        W = columns["W"]
+        evaporation_time = columns["evaporation_time"]
+
+    hazard_components = columns["hazard_components"]
+    equipment_ids = [r["equipment_id"] for r in rows]
+    equipment_names = [r["equipment_name"] for r in rows]
+    amount_values = columns["amount_t"].tolist()
+
+    per_line = []
+    for line_index, scenario in enumerate(scenarios):
+        sc_line = int(scenario.get("scenario_line", 0))
+        six_line = line_scheme.get(sc_line, 0) if line_scheme else sc_line
+        cols: dict = {}
+
+        # ---------------------------------------------------------------------
+        # Обязательные поля + частоты (apply_ac_multiplier, init_result_base)
+        # ---------------------------------------------------------------------
+        ac, scenario_frequency = line_scenario_frequency(columns, scenario, ac_applied)
+        cols["equipment_id"] = equipment_ids
+        cols["equipment_name"] = equipment_names
+        cols["hazard_component"] = hazard_components
+        cols["scenario_no"] = [no + line_index for no in scenario_no]
+        cols["base_frequency"] = [ac[hc].get("base_frequency", 1) for hc in hazard_components]
+        cols["accident_event_probability"] = [ac[hc].get("accident_event_probability", 1) for hc in hazard_components]
+        cols["scenario_frequency"] = scenario_frequency.tolist()
+
+        # ---------------------------------------------------------------------
+        # Количество ОВ в аварии и пролив
+        # ---------------------------------------------------------------------
+        cols["amount_t"] = amount_values
+        ov_in_accident_t, spill = line_accident_and_spill(columns, six_line)
+        cols["ov_in_accident_t"] = ov_in_accident_t.tolist()
+
+        # ---------------------------------------------------------------------
+        # Количество опасного вещества в поражающем факторе
+        # ---------------------------------------------------------------------
+        if evaporates:
+            evaporated_t = W * spill * evaporation_time * KG_TO_T
+            evaporation = np.where(evaporated_t > ov_in_accident_t, ov_in_accident_t, evaporated_t)
+
+        calc_code = get_calc_code(0, kind, sc_line)
+        if calc_code in (1, 7) or (not evaporates and calc_code in (2, 3, 4)):  # пролив
+            ov_in_hazard_factor_t = ov_in_accident_t
+        elif evaporates and calc_code == 2:  # взрыв
+            ov_in_hazard_factor_t = evaporation * MASS_IN_CLOUDE
+        elif evaporates and calc_code in (3, 4):  # вспышка, токсичное облако
+            ov_in_hazard_factor_t = evaporation
+        elif calc_code == 0:  # ликвидация
+            ov_in_hazard_factor_t = 0
+        else:
+            ov_in_hazard_factor_t = None
+        cols["ov_in_hazard_factor_t"] = _values(ov_in_hazard_factor_t, n)
+
+        # ---------------------------------------------------------------------
+        # Зоны (calculate_zone колонками)
+        # ---------------------------------------------------------------------
+        cols.update(calculate_zone_columns(rows, rows, spill.tolist(), calc_code, cols["ov_in_hazard_factor_t"],
+                                           props=columns["row_props"]))
+
+        # ---------------------------------------------------------------------
+        # Последствия
+        # ---------------------------------------------------------------------
+        people = {}
+        people_rows = []
+        for r in rows:
+            key = (r["possible_dead"], r["possible_injured"])
+            if key not in people:
+                people[key] = calculate_people_damage(sc_line, 0, kind, *key)
+            people_rows.append(people[key])
+        cols["fatalities_count"] = [p["fatalities_count"] for p in people_rows]
+        cols["injured_count"] = [p["injured_count"] for p in people_rows]
+
+        # ---------------------------------------------------------------------
+        # Ущерб (calculate_damage + _base_damage_line.damage)
+        # ---------------------------------------------------------------------
+        k = float(DAMAGE_SIX_SC[six_line - 1]) if 1 <= six_line <= len(DAMAGE_SIX_SC) else 0.0
+        direct = approx_equipment_cost_array(ov_in_accident_t) * DAMAGE_SCALE
+        liquidation = direct * 0.1
+        environmental = direct * 0.236
+        # calculate_damage передаёт в damage() нули погибших/пострадавших
+        social = 0 * 3000 + 0 * 250
+        indirect = 0.157 * social
+        direct = direct * k
+        liquidation = liquidation * k
+        environmental = environmental * k
+        total = direct + liquidation + social + indirect + environmental
+
+        cols["direct_losses"] = direct.tolist()
+        cols["liquidation_costs"] = liquidation.tolist()
+        cols["social_losses"] = [social] * n
+        cols["indirect_damage"] = [indirect] * n
+        cols["total_environmental_damage"] = environmental.tolist()
+        cols["total_damage"] = total.tolist()
+
+        # ---------------------------------------------------------------------
+        # Риски (calculate_risk)
+        # ---------------------------------------------------------------------
+        fatalities = np.array([f or 0 for f in cols["fatalities_count"]])
+        injured = np.array([i or 0 for i in cols["injured_count"]])
+        collective_fatalities = fatalities * scenario_frequency
+        collective_injured = injured * scenario_frequency
+        cols["collective_risk_fatalities"] = collective_fatalities.tolist()
+        cols["collective_risk_injured"] = collective_injured.tolist()
+        cols["expected_value"] = (total * scenario_frequency).tolist()
+        cols["individual_risk_fatalities"] = (collective_fatalities / PEOPLE_COUNT).tolist()
+        cols["individual_risk_injured"] = (collective_injured / PEOPLE_COUNT).tolist()
+
+        per_line.append(cols)
+
+    return {name: _interleave([cols[name] for cols in per_line]) for name in per_line[0]}
+
+
+# (equipment_type, kind) -> пакетный расчёт
+BATCH_HANDLERS = {
+    (0, 0): functools.partial(calc_liquid_pipeline_batch, kind=0, evaporates=True),
+    (0, 1): functools.partial(calc_liquid_pipeline_batch, kind=1, evaporates=True),
+    (0, 6): functools.partial(calc_liquid_pipeline_batch, kind=6, evaporates=False, line_scheme=TWO_LINE_SCHEME),
+    (0, 9): functools.partial(calc_liquid_pipeline_batch, kind=9, evaporates=False),
+}
@@ -51,5 +51,38 @@ def calculate_people_damage(
 
             return result
 
+        if kind == 1:
+            if sc_line in (1,):  # пожар
+                result["fatalities_count"] = max(0, possible_dead - 1)
+                result["injured_count"] = max(0, possible_injured - 1)
+            elif sc_line in (2, 3):  # взрыв, токсическое поражение
+                result["fatalities_count"] = possible_dead
+                result["injured_count"] = possible_injured
+            elif sc_line in (4, 5, 6):  # пожар частичный, вспышка, токсическое частичное
+                result["fatalities_count"] = 0
+                result["injured_count"] = 1
+
+            if DEBUG:
+                print("Погибшие/раненые", result["fatalities_count"], result["injured_count"])
+                print(20 * "-")
+
+            return result
+
+        if kind == 6:
+            if sc_line in (1,):  # химически опасный пролив
+                result["fatalities_count"] = max(0, possible_dead - 1)
+                result["injured_count"] = max(0, possible_injured - 1)
+            elif sc_line in (2,):  # химически опасный пролив частичный
+                result["fatalities_count"] = 0
+                result["injured_count"] = 1
+
+            if DEBUG:
+                print("Погибшие/раненые", result["fatalities_count"], result["injured_count"])
+                print(20 * "-")
+
+            return result
+
+        return result
+
     else:
         return result
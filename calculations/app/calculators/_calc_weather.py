@@ -0,0 +1,169 @@
+"""
+Пожар пролива, пожар-вспышка и испарение по классам погоды
+(calculations/app/_weather.py) для трубопроводов с жидкостью.
+
+Основной расчёт (calculations) ведётся при одной погоде: ветер WIND,
+испарение при температуре вещества и η = 1. Здесь линии сценариев с пожаром
+пролива (calc_code 1) и пожаром-вспышкой (calc_code 3) считаются сразу для
+всех строк и всех классов погоды — массивами (строка x класс):
+  - испарение: Pн при max(температура вещества, температура воздуха класса),
+    η = 1, как в основном расчёте (таблица №1 по ветру не применяется: она
+    для ветра не меньше 1 м/с и дала бы расхождение с calculations и при
+    погоде основного расчёта);
+  - пожар-вспышка: масса — испарившаяся за время испарения (не больше массы
+    в аварии), радиусы — LCLP.lower_concentration_limits;
+  - пожар пролива: радиусы — Strait_fire.termal_class_zones (по уникальным
+    входным данным, те же, что у перебора termal_class_zone_march).
+Результат по классам сводится в одну строку на сценарий: радиусы и масса
+ОВ в поражающем факторе — средние, взвешенные по вероятности класса;
+радиусы — целые метры, как в calculations (calculate_zone).
+
+Результат — колонки calculations_weather (массивы numpy: строка за строкой,
+внутри — линии сценария; NaN — зона не считается).
+"""
+from __future__ import annotations
+
+import functools
+import sqlite3
+
+import numpy as np
+
+from calculations.app._liguid_evaporation import (
+    evaporation_intensity_kg_m2_s_array,
+    saturated_vapor_pressure_pa_array,
+)
+from calculations.app._lower_concentration import LCLP
+from calculations.app._strait_fire import Strait_fire
+from calculations.app.calculators._calc_batch import (
+    TWO_LINE_SCHEME,
+    _column,
+    line_accident_and_spill,
+    liquid_pipeline_columns,
+)
+from calculations.app.scenario.scenario_matrix import get_calc_code
+from core.config import KG_TO_T, MSG, P0
+
+WEATHER_COLUMNS = (
+    "equipment_id", "scenario_no", "ov_in_hazard_factor_t",
+    "q_10_5", "q_7_0", "q_4_2", "q_1_4", "r_nkpr", "r_vsp",
+)
+POOL_FIRE_ZONES = ("q_10_5", "q_7_0", "q_4_2", "q_1_4")
+FLASH_FIRE_ZONES = ("r_nkpr", "r_vsp")
+
+POOL_FIRE, FLASH_FIRE = 1, 3  # calc_code
+
+
+def pool_fire_zones(spill, mol_mass, t_boiling, wind):
+    """
+    Радиусы зон 10.5/7.0/4.2/1.4 кВт/м2, м (массивы одной формы -> форма (..., 4)).
+    """
+    return Strait_fire().termal_class_zones(spill, MSG, mol_mass, t_boiling, wind)
+
+
+def calc_liquid_pipeline_weather(
+        rows: list[sqlite3.Row],
+        scenarios: list[dict],
+        scenario_no: list[int],
+        *,
+        kind: int,
+        evaporates: bool,
+        classes: tuple,
+        line_scheme: dict[int, int] | None = None,
+) -> dict[str, np.ndarray]:
+    """
+    Трубопровод с жидкостью: линии пожара пролива и пожара-вспышки
+    calc_liquid_pipeline_batch по всем классам погоды, взвешенно по вероятности класса.
+
+    :@param rows: строки equipment + substances (как в create_calc.main) одной пары (0, kind)
+    :@param scenarios: типовые сценарии пары (без множителя компенсирующих мероприятий)
+    :@param scenario_no: scenario_no первого сценария каждой строки
+    :@param kind: вид вещества (0, 1 — с испарением, 6, 9 — без испарения)
+    :@param evaporates: учитывать испарение (масса пожара-вспышки)
+    :@param classes: классы погоды (WeatherClass)
+    :@param line_scheme: линия сценария пары -> линия шестисценарной схемы (как в calc_liquid_pipeline_batch)
+
+    :@return: dict: колонка calculations_weather (WEATHER_COLUMNS) -> массив значений
+    """
+    n, k = len(rows), len(classes)
+    columns = liquid_pipeline_columns(rows, evaporates=False)
+    row_props = columns["row_props"]
+
+    wind = np.array([c.wind_m_s for c in classes])
+    air_temperature = np.array([c.temperature_c for c in classes])
+    probability = np.array([c.probability for c in classes])
+    probability = probability / probability.sum()
+    winds, wind_index = np.unique(wind, return_inverse=True)
+    wind_probability = np.bincount(wind_index, weights=probability)
+    mol_mass = np.array([p.mol_mass for p in row_props])
+    t_boiling = np.array([p.t_boiling for p in row_props])
+
+    if evaporates:
+        # интенсивность испарения (строка x класс), η = 1
+        heat = np.array([p.evaporation_heat_J_per_kg for p in row_props])
+        t_liquid = np.fmax(_column(rows, "substance_temperature_c")[:, None], air_temperature)
+        Pn = saturated_vapor_pressure_pa_array(t_liquid, t_boiling[:, None], heat[:, None], mol_mass[:, None], P0)
+        W = evaporation_intensity_kg_m2_s_array(Pn, mol_mass[:, None], eta=1.0)
+        evaporation_time = _column(rows, "evaporation_time_s")[:, None]
+
+    grid = functools.partial(np.broadcast_to, shape=(n, k))
+    per_line = []
+    for line_index, scenario in enumerate(scenarios):
+        sc_line = int(scenario.get("scenario_line", 0))
+        calc_code = get_calc_code(0, kind, sc_line)
+        if calc_code not in (POOL_FIRE, FLASH_FIRE):
+            continue
+
+        six_line = line_scheme.get(sc_line, 0) if line_scheme else sc_line
+        ov_in_accident_t, spill = line_accident_and_spill(columns, six_line)
+        cols = {
+            "equipment_id": np.array([r["equipment_id"] for r in rows]),
+            "scenario_no": np.array([no + line_index for no in scenario_no]),
+        }
+        for name in POOL_FIRE_ZONES + FLASH_FIRE_ZONES:
+            cols[name] = np.full(n, np.nan)
+
+        if calc_code == FLASH_FIRE and evaporates:
+            evaporated_t = W * spill[:, None] * evaporation_time * KG_TO_T
+            ov_in_hazard_factor_t = np.where(evaporated_t > ov_in_accident_t[:, None],
+                                             ov_in_accident_t[:, None], evaporated_t)
+            cols["ov_in_hazard_factor_t"] = ov_in_hazard_factor_t @ probability
+        else:
+            ov_in_hazard_factor_t = grid(ov_in_accident_t[:, None])
+            cols["ov_in_hazard_factor_t"] = ov_in_accident_t
+
+        if calc_code == POOL_FIRE:
+            # от температуры воздуха пожар пролива не зависит: считаем по уникальным скоростям ветра
+            shape = (n, len(winds))
+            zones = pool_fire_zones(np.broadcast_to(spill[:, None], shape), np.broadcast_to(mol_mass[:, None], shape),
+                                    np.broadcast_to(t_boiling[:, None], shape), np.broadcast_to(winds, shape))
+            for i, name in enumerate(POOL_FIRE_ZONES):
+                cols[name] = zones[..., i] @ wind_probability
+        else:
+            lel = np.array([float(p.explosion["lel_percent"]) for p in row_props])
+            r_nkpr, r_vsp = LCLP().lower_concentration_limits(
+                ov_in_hazard_factor_t, mol_mass[:, None], t_boiling[:, None], lel[:, None])
+            cols["r_nkpr"], cols["r_vsp"] = r_nkpr @ probability, r_vsp @ probability
+
+        per_line.append(cols)
+
+    if not per_line:
+        return {name: np.empty(0) for name in WEATHER_COLUMNS}
+
+    result = {}
+    for name in WEATHER_COLUMNS:
+        # [линия][строка] -> строка за строкой, внутри — линии
+        result[name] = np.stack([cols[name] for cols in per_line], axis=1).ravel()
+    for name in POOL_FIRE_ZONES + FLASH_FIRE_ZONES:
+        # как int() в calculate_zone (NaN остаётся)
+        result[name] = np.trunc(result[name])
+    return result
+
+
+# (equipment_type, kind) -> расчёт по классам погоды
+# (у kind 6 линий пожара пролива и вспышки нет — строк calculations_weather не будет)
+WEATHER_HANDLERS = {
+    (0, 0): functools.partial(calc_liquid_pipeline_weather, kind=0, evaporates=True),
+    (0, 1): functools.partial(calc_liquid_pipeline_weather, kind=1, evaporates=True),
+    (0, 6): functools.partial(calc_liquid_pipeline_weather, kind=6, evaporates=False, line_scheme=TWO_LINE_SCHEME),
+    (0, 9): functools.partial(calc_liquid_pipeline_weather, kind=9, evaporates=False),
+}
@@ -1,14 +1,27 @@
 import sqlite3
+from collections.abc import Sequence
 
+from calculations.app._liguid_evaporation import evaporation_intensity_kg_m2_s, saturated_vapor_pressure_pa
 from calculations.app._lower_concentration import LCLP
 from calculations.app._scenario_common import parse_substance_props
 from calculations.app._strait_fire import Strait_fire
+from calculations.app._toxic_dispersion import toxic_zone
 from calculations.app._tvs_explosion import Explosion
-from core.config import MSG, WIND, T_TO_KG
+from core.config import MSG, P0, WIND, T_TO_KG
 
 # Включение/отключение отладочного вывода
 DEBUG = False  # True -> печатаем отладку, False -> молчим
 
+# Колонки зон calculations в порядке результата
+ZONE_COLUMNS = (
+    "q_10_5", "q_7_0", "q_4_2", "q_1_4",  # пожар пролива
+    "p_70", "p_28", "p_14", "p_5", "p_2",  # избыточное давление
+    "l_f", "d_f",  # факел
+    "r_nkpr", "r_vsp",  # НКПР / вспышка
+    "l_pt", "p_pt",  # токсическое воздействие
+    "q_600", "q_320", "q_220", "q_120",  # огненный шар / тепловые дозы
+    "s_t",  # токсичный пролив
+)
 
 
 def calculate_zone(
@@ -39,119 +52,118 @@ def calculate_zone(
                                  (нужна для взрыва и вспышки)
 
     На выходе:
-        dict с ключами:
+        dict с ключами ZONE_COLUMNS:
         q_*, p_*, l_f, d_f, r_*, l_pt, p_pt, q_600..q_120, s_t
     """
+    zones = calculate_zone_columns([substance], [equipment], [spill], calc_code, [ov_in_hazard_factor_t])
+    return {name: values[0] for name, values in zones.items()}
 
-    result = {}
 
-    # -------------------------------------------------------------------------
-    # Пожар пролива
-    # -------------------------------------------------------------------------
-    result["q_10_5"] = None
-    result["q_7_0"] = None
-    result["q_4_2"] = None
-    result["q_1_4"] = None
-    # -------------------------------------------------------------------------
-    # Избыточное давление
-    # -------------------------------------------------------------------------
-    result["p_70"] = None
-    result["p_28"] = None
-    result["p_14"] = None
-    result["p_5"] = None
-    result["p_2"] = None
-    # -------------------------------------------------------------------------
-    # Факел
-    # -------------------------------------------------------------------------
-    result["l_f"] = None
-    result["d_f"] = None
-    # -------------------------------------------------------------------------
-    # НКПР / вспышка
-    # -------------------------------------------------------------------------
-    result["r_nkpr"] = None
-    result["r_vsp"] = None
-    # -------------------------------------------------------------------------
-    # Токсическое воздействие
-    # -------------------------------------------------------------------------
-    result["l_pt"] = None
-    result["p_pt"] = None
-    # -------------------------------------------------------------------------
-    # Огненный шар / тепловые дозы
-    # -------------------------------------------------------------------------
-    result["q_600"] = None
-    result["q_320"] = None
-    result["q_220"] = None
-    result["q_120"] = None
-    # -------------------------------------------------------------------------
-    # Токсичный пролив
-    # -------------------------------------------------------------------------
-    result["s_t"] = None
+def calculate_zone_columns(
+    substances: Sequence[sqlite3.Row],
+    equipments: Sequence[sqlite3.Row],
+    spill: Sequence[float],
+    calc_code: int,
+    ov_in_hazard_factor_t: Sequence[float],
+    props: Sequence | None = None,
+) -> dict[str, list]:
+    """
+    calculate_zone для нескольких строк одного calc_code: колонки зон.
+    Пожар пролива и вспышка считаются массивами numpy, взрыв и токсическое
+    поражение — прежними решателями по уникальным входным данным.
 
-    # -------------------------------------------------------------------------
-    # Свойства вещества
-    # -------------------------------------------------------------------------
-    props = parse_substance_props(substance)
-    explosion = props.explosion
-    mol_mass = props.mol_mass
-    t_boiling = props.t_boiling
+    :@param props: разобранные свойства веществ строк (parse_substance_props), если уже есть
 
-    # -------------------------------------------------------------------------
-    # Расчёт по calc_code
-    # -------------------------------------------------------------------------
+    :@return: dict: колонка ZONE_COLUMNS -> список значений по строкам
+    """
+    n = len(equipments)
+    result = {name: [None] * n for name in ZONE_COLUMNS}
 
-    # 0 – ликвидация аварии: просто возвращаем пустые зоны
-    if calc_code == 0:
+    # 0 – ликвидация аварии, 5, 6 – факел, огненный шар (пока заглушки): пустые зоны
+    if calc_code not in (1, 2, 3, 4, 7) or n == 0:
         return result
 
+    # -------------------------------------------------------------------------
+    # Свойства веществ
+    # -------------------------------------------------------------------------
+    if props is None:
+        props = [parse_substance_props(s) for s in substances]
+
     # 1 – пожар пролива
     if calc_code == 1:
-        zone = Strait_fire().termal_class_zone(
+        zones = Strait_fire().termal_class_zones(
             S_spill=spill,
             m_sg=MSG,
-            mol_mass=mol_mass,
-            t_boiling=t_boiling,
+            mol_mass=[p.mol_mass for p in props],
+            t_boiling=[p.t_boiling for p in props],
             wind_velocity=WIND,
         )
-        result["q_10_5"], result["q_7_0"], result["q_4_2"], result["q_1_4"] = map(int, zone)
+        for name, column in zip(("q_10_5", "q_7_0", "q_4_2", "q_1_4"), zones.T.tolist()):
+            result[name] = [int(v) for v in column]
 
         if DEBUG:
-            print("POOL FIRE ZONES:", zone)
-
-        return result
+            print("POOL FIRE ZONES:", zones)
 
     # 2 – взрыв облака ТВС
     elif calc_code == 2:
-        zone = Explosion().explosion_class_zone(
-            int(explosion["explosion_hazard_class"]),
-            equipment["clutter_degree"],
-            ov_in_hazard_factor_t * T_TO_KG,
-            int(explosion["heat_of_combustion_kJ_per_kg"]),
-            int(explosion["expansion_degree"]),
-            int(explosion["energy_reserve_factor"]),
-        )
-        # zone[0] – класс, дальше радиусы
-        result["p_70"], result["p_28"], result["p_14"], result["p_5"], result["p_2"] = map(int, zone[1:6])
+        zones = {}
+        for i, (p, equipment, hf) in enumerate(zip(props, equipments, ov_in_hazard_factor_t)):
+            explosion = p.explosion
+            args = (
+                int(explosion["explosion_hazard_class"]),
+                equipment["clutter_degree"],
+                hf * T_TO_KG,
+                int(explosion["heat_of_combustion_kJ_per_kg"]),
+                int(explosion["expansion_degree"]),
+                int(explosion["energy_reserve_factor"]),
+            )
+            if args not in zones:
+                zones[args] = Explosion().explosion_class_zone(*args)
+            # zone[0] – класс, дальше радиусы
+            for name, r in zip(("p_70", "p_28", "p_14", "p_5", "p_2"), zones[args][1:6]):
+                result[name][i] = int(r)
 
         if DEBUG:
-            print("EXPLOSION ZONES:", zone)
-
-        return result
+            print("EXPLOSION ZONES:", zones)
 
     # 3 – пожар-вспышка
     elif calc_code == 3:
-        zone = LCLP().lower_concentration_limit(
+        zones = LCLP().lower_concentration_limits(
             ov_in_hazard_factor_t,
-            mol_mass,
-            t_boiling,
-            float(explosion["lel_percent"]),
+            [p.mol_mass for p in props],
+            [p.t_boiling for p in props],
+            [float(p.explosion["lel_percent"]) for p in props],
         )
-        result["r_nkpr"], result["r_vsp"] = map(int, zone)
+        result["r_nkpr"], result["r_vsp"] = ([int(v) for v in column.tolist()] for column in zones)
 
         if DEBUG:
-            print("FLASH FIRE ZONES:", zone)
-
-        return result
+            print("FLASH FIRE ZONES:", zones)
 
-    # 4–7 – токсика, факел, огненный шар, токсичный пролив – пока заглушки
+    # 4 – токсическое поражение (облако), 7 – химически опасный пролив (испарение с пролива)
     else:
-        return result
\ No newline at end of file
+        for i, (p, substance, equipment, s, hf) in enumerate(
+                zip(props, substances, equipments, spill, ov_in_hazard_factor_t)):
+            mass_kg = (hf or 0.0) * T_TO_KG
+            rate_kg_s = duration_s = None
+            if calc_code == 7:
+                result["s_t"][i] = s
+                Pn = saturated_vapor_pressure_pa(equipment["substance_temperature_c"], p.t_boiling,
+                                                 p.evaporation_heat_J_per_kg, p.mol_mass, P0)
+                rate_kg_s = evaporation_intensity_kg_m2_s(Pn, p.mol_mass, eta=1.0) * s
+                duration_s = equipment["evaporation_time_s"]
+
+            # toxic_zone кэширует результат по входным данным
+            zone = toxic_zone(
+                mass_kg,
+                substance["toxicity_threshold_tox_dose_mg_min_per_L"],
+                substance["toxicity_lethal_tox_dose_mg_min_per_L"],
+                WIND,
+                rate_kg_s,
+                duration_s,
+            )
+            result["l_pt"][i], result["p_pt"][i] = (None if r is None else int(r) for r in zone)
+
+            if DEBUG:
+                print("TOXIC ZONES:", zone)
+
+    return result
@@ -1,6 +1,7 @@
 # calculations/app/calculators/scenario_matrix.py
 
 from __future__ import annotations
+import functools
 import json
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -16,35 +17,36 @@ def _load_json() -> dict:
         return json.load(f)
 
 
-_raw = _load_json()
-
-
 # --------------------------------------------------------------
 # Автоматическая сборка матрицы (equipment_type, kind) → list of scenarios
+# (при первом обращении, а не при импорте модуля)
 # --------------------------------------------------------------
 
-SCENARIO_MATRIX: Dict[tuple, List[dict]] = {}
+@functools.lru_cache(maxsize=None)
+def get_scenario_matrix() -> Dict[tuple, List[dict]]:
+    matrix: Dict[tuple, List[dict]] = {}
 
-for eq_str, kinds in _raw["scenarios"].items():
-    eq = int(eq_str)
+    for eq_str, kinds in _load_json()["scenarios"].items():
+        eq = int(eq_str)
 
-    for kind_str, scen_list in kinds.items():
-        kind = int(kind_str)
+        for kind_str, scen_list in kinds.items():
+            kind = int(kind_str)
 
-        key = (eq, kind)
-        SCENARIO_MATRIX[key] = []
+            key = (eq, kind)
+            matrix[key] = []
 
-        for scen in scen_list:
-            SCENARIO_MATRIX[key].append(
-                {
-                    "scenario_line": int(scen["scenario_line"]),
-                    "calc_code": int(scen["calc_code"]),
-                    "scenario_text": scen["scenario_text"],
-                    "scenario_frequency": float(scen["scenario_frequency"]),
-                    "base_frequency": float(scen["base_frequency"]),
-                    "accident_event_probability": float(scen["accident_event_probability"]),
-                }
-            )
+            for scen in scen_list:
+                matrix[key].append(
+                    {
+                        "scenario_line": int(scen["scenario_line"]),
+                        "calc_code": int(scen["calc_code"]),
+                        "scenario_text": scen["scenario_text"],
+                        "scenario_frequency": float(scen["scenario_frequency"]),
+                        "base_frequency": float(scen["base_frequency"]),
+                        "accident_event_probability": float(scen["accident_event_probability"]),
+                    }
+                )
+    return matrix
 
 
 # --------------------------------------------------------------
@@ -59,7 +61,7 @@ def get_scenarios_for_pair(equipment_type: int, kind: int) -> List[dict]:
         ...
       ]
     """
-    return SCENARIO_MATRIX.get((equipment_type, kind), [])
+    return get_scenario_matrix().get((equipment_type, kind), [])
 
 
 def get_calc_code(equipment_type: int, kind: int, scenario_line: int) -> Optional[int]:
@@ -71,7 +73,7 @@ def get_calc_code(equipment_type: int, kind: int, scenario_line: int) -> Optiona
 
     Если такого сценария нет — вернёт None.
     """
-    scenarios = SCENARIO_MATRIX.get((equipment_type, kind), [])
+    scenarios = get_scenario_matrix().get((equipment_type, kind), [])
     for scen in scenarios:
         if scen["scenario_line"] == scenario_line:
             return scen["calc_code"]
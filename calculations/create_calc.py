@@ -1,15 +1,34 @@
 import json
 import sqlite3
 from pathlib import Path
-from calculations import equipment_type_0_kind_0, equipment_type_0_kind_2, equipment_type_0_kind_9,  equipment_type_1_kind_0, equipment_type_2_kind_0, \
+from calculations import equipment_type_0_kind_0, equipment_type_0_kind_1, equipment_type_0_kind_2, \
+    equipment_type_0_kind_6, equipment_type_0_kind_9,  equipment_type_1_kind_0, equipment_type_2_kind_0, \
     equipment_type_3_kind_0, equipment_type_4_kind_0, equipment_type_5_kind_2, equipment_type_6_kind_0, \
     equipment_type_7_kind_0, equipment_type_8_kind_0, equipment_type_4_kind_4
 
 
 
-from core.path import DB_PATH, TYPICAL_SCENARIOS_PATH
+from core.config import BATCH_CALC_ENABLED, BATCH_CALC_MIN_ROWS, WEATHER_CLASSES_ENABLED
+from core.path import DB_PATH, SCHEMA_PATH, TYPICAL_SCENARIOS_PATH
 from calculations.app._frequency import apply_ac_multiplier
 
+HANDLERS = {
+    (0, 0): equipment_type_0_kind_0.calc_for_scenario,
+    (0, 1): equipment_type_0_kind_1.calc_for_scenario,
+    (0, 2): equipment_type_0_kind_2.calc_for_scenario,
+    (0, 6): equipment_type_0_kind_6.calc_for_scenario,
+    (0, 9): equipment_type_0_kind_9.calc_for_scenario,
+    (1, 0): equipment_type_1_kind_0.calc_for_scenario,
+    (2, 0): equipment_type_2_kind_0.calc_for_scenario,
+    (3, 0): equipment_type_3_kind_0.calc_for_scenario,
+    (4, 0): equipment_type_4_kind_0.calc_for_scenario,
+    (4, 4): equipment_type_4_kind_4.calc_for_scenario,
+    (5, 2): equipment_type_5_kind_2.calc_for_scenario,
+    (6, 0): equipment_type_6_kind_0.calc_for_scenario,
+    (7, 0): equipment_type_7_kind_0.calc_for_scenario,
+    (8, 0): equipment_type_8_kind_0.calc_for_scenario,
+}
+
 def is_pair_allowed(allowed_pairs: dict, equipment_type: int, kind: int) -> bool:
     """Если для пары есть явный запрет — запрещено. Если записи нет — считаем допустимым."""
     et = str(equipment_type)
@@ -24,30 +43,94 @@ def get_scenarios_for(scenarios_tree: dict, equipment_type: int, kind: int) -> l
     return scenarios_tree.get(str(equipment_type), {}).get(str(kind), []) or []
 
 
+def calculation_columns(cur: sqlite3.Cursor) -> list[str]:
+    """Колонки calculations без id (кэшируются один раз)."""
+    if not hasattr(calculation_columns, "_cols"):
+        # PRAGMA table_info: (cid, name, type, notnull, dflt_value, pk)
+        cols = [r[1] for r in cur.execute("PRAGMA table_info(calculations);").fetchall()]
+        # id автоинкремент — не вставляем
+        calculation_columns._cols = [c for c in cols if c != "id"]
+    return calculation_columns._cols
+
+
 def write_calculation(cur: sqlite3.Cursor, payload: dict) -> None:
     """
     Запись результата расчёта в таблицу calculations.
     payload — словарь, который вернул calc_for_scenario().
     """
+    write_calculations(cur, [[payload.get(c) for c in calculation_columns(cur)]])
 
-    # Кэшируем список колонок calculations один раз
-    if not hasattr(write_calculation, "_cols"):
-        # PRAGMA table_info: (cid, name, type, notnull, dflt_value, pk)
-        cols = [r[1] for r in cur.execute("PRAGMA table_info(calculations);").fetchall()]
-        # id автоинкремент — не вставляем
-        write_calculation._cols = [c for c in cols if c != "id"]
-
-    cols = write_calculation._cols
-
-    # Для отсутствующих ключей подставляем None
-    values = [payload.get(c) for c in cols]
 
+def write_calculations(cur: sqlite3.Cursor, rows: list[list]) -> None:
+    """Пакетная запись строк calculations (значения в порядке calculation_columns)."""
+    cols = calculation_columns(cur)
     placeholders = ",".join(["?"] * len(cols))
     col_list = ",".join(cols)
 
-    cur.execute(
+    cur.executemany(
         f"INSERT INTO calculations ({col_list}) VALUES ({placeholders});",
-        values,
+        rows,
+    )
+
+
+def columns_to_rows(cur: sqlite3.Cursor, columns: dict[str, list]) -> list[list]:
+    """Результат пакетного расчёта (колонка -> значения) в строки для write_calculations."""
+    n = len(columns["scenario_no"])
+    # Для отсутствующих колонок подставляем None
+    return [list(v) for v in zip(*(columns.get(c, [None] * n) for c in calculation_columns(cur)))]
+
+
+def weather_rows(plan: dict, classes: tuple) -> list[tuple]:
+    """
+    Строки calculations_weather (пожар пролива, вспышка и испарение, взвешенно
+    по классам погоды) для пар с расчётом по классам погоды, в порядке scenario_no.
+    """
+    import numpy as np
+
+    from calculations.app.calculators._calc_weather import WEATHER_COLUMNS, WEATHER_HANDLERS
+
+    parts = []
+    for pair, items in plan.items():
+        handler = WEATHER_HANDLERS.get(pair)
+        if handler is not None:
+            parts.append(handler([row for row, _, _ in items], items[0][1], [no for _, _, no in items],
+                                 classes=classes))
+    if not parts:
+        return []
+
+    columns = {name: np.concatenate([part[name] for part in parts]) for name in WEATHER_COLUMNS}
+    order = np.argsort(columns["scenario_no"], kind="stable")
+    values = []
+    for name in WEATHER_COLUMNS:
+        column = columns[name][order]
+        if column.dtype.kind == "f":
+            # NaN — зона не считается (NULL)
+            column = np.where(np.isnan(column), None, column)
+        values.append(column.tolist())
+    return list(zip(*values))
+
+
+def write_weather_calculations(cur: sqlite3.Cursor, plan: dict) -> None:
+    """Классы погоды (weather_classes) и расчёт по ним (calculations_weather)."""
+    from calculations.app._weather import load_weather_classes
+
+    classes = load_weather_classes()
+    if not classes:
+        print("Классы погоды не заданы (weather_classes.json): расчёт по классам погоды пропущен")
+        return
+    cur.executemany(
+        "INSERT INTO weather_classes (id, wind_label, temperature_label, wind_m_s, air_temperature_c, probability) "
+        "VALUES (?, ?, ?, ?, ?, ?);",
+        [(i, c.wind_label, c.temperature_label, c.wind_m_s, c.temperature_c, c.probability)
+         for i, c in enumerate(classes, start=1)],
+    )
+
+    from calculations.app.calculators._calc_weather import WEATHER_COLUMNS
+
+    cur.executemany(
+        f"INSERT INTO calculations_weather ({','.join(WEATHER_COLUMNS)}) "
+        f"VALUES ({','.join(['?'] * len(WEATHER_COLUMNS))});",
+        weather_rows(plan, classes),
     )
 
 
@@ -62,11 +145,18 @@ def main(db_path: Path = DB_PATH, typical_scenarios_path: Path = TYPICAL_SCENARI
     # 1) подключение к БД
     with sqlite3.connect(db_path) as con:
         con.row_factory = sqlite3.Row
+        if WEATHER_CLASSES_ENABLED:
+            # таблица calculations_weather могла появиться в схеме позже самой БД
+            # или с другим набором колонок: она целиком пересчитывается, поэтому пересоздаём
+            con.execute("DROP TABLE IF EXISTS calculations_weather;")
+            con.executescript(SCHEMA_PATH.read_text(encoding="utf-8"))
         cur = con.cursor()
         cur.execute("PRAGMA foreign_keys = ON;")
 
         # 1. очищаем calculations
         cur.execute("DELETE FROM calculations;")
+        if WEATHER_CLASSES_ENABLED:
+            cur.execute("DELETE FROM weather_classes;")
 
         # 2. берем список оборудования (весь)
         # ВАЖНО: ниже выбираем все поля equipment + все поля substances (как минимум kind).
@@ -86,17 +176,13 @@ def main(db_path: Path = DB_PATH, typical_scenarios_path: Path = TYPICAL_SCENARI
             con.commit()
             return
 
-        # 3. Перебираем оборудование в цикле
+        # 3. Перебираем оборудование: сценарии и их номера
+        # (номера идут подряд по оборудованию в порядке id; пары без обработчика номеров не занимают)
+        plan = {}  # (equipment_type, kind) -> [(строка, сценарии, первый scenario_no)]
+        scenario_no_global = 0
         for row in equipment_rows:
             # 3.1. Получаем свойства вещества в оборудовании
             # Поскольку мы сделали SELECT e.* + s.*, "substance properties" лежат в row.
-            # Для читаемости выделим:
-            equipment = row
-            substance = row
-
-            equipment_id = int(row["equipment_id"])
-            equipment_name = row["equipment_name"]
-            hazard_component = row["hazard_component"]
             equipment_type = int(row["equipment_type"])
             kind = int(row["kind"])
 
@@ -105,41 +191,43 @@ def main(db_path: Path = DB_PATH, typical_scenarios_path: Path = TYPICAL_SCENARI
                 continue
 
             scenarios_list = get_scenarios_for(scenarios_tree, equipment_type, kind)
-            if not scenarios_list:
+            if not scenarios_list or (equipment_type, kind) not in HANDLERS:
+                continue
+
+            plan.setdefault((equipment_type, kind), []).append((row, scenarios_list, scenario_no_global + 1))
+            scenario_no_global += len(scenarios_list)
+
+        # 4. Расчёт: крупные группы — пакетно (колонками), остальные — по строкам
+        batch_handlers = {}
+        if BATCH_CALC_ENABLED and any(len(items) >= BATCH_CALC_MIN_ROWS for items in plan.values()):
+            from calculations.app.calculators._calc_batch import BATCH_HANDLERS
+            batch_handlers = BATCH_HANDLERS
+
+        records = []  # (scenario_no, значения строки calculations)
+        for pair, items in plan.items():
+            batch = batch_handlers.get(pair)
+            if batch is not None and len(items) >= BATCH_CALC_MIN_ROWS:
+                columns = batch([row for row, _, _ in items], items[0][1], [no for _, _, no in items])
+                records.extend(zip(columns["scenario_no"], columns_to_rows(cur, columns)))
                 continue
 
-            cur.execute("SELECT COALESCE(MAX(scenario_no), 0) FROM calculations;")
-            scenario_no_global = cur.fetchone()[0]
-
-            # 3.5. Записываем в calculations (пока заглушим pass)
-            for sc in scenarios_list:
-                # следующий свободный scenario_no в таблице
-                scenario_no_global += 1
-                # Проверяем есть ли компенсирующие мероприятия
-                sc = apply_ac_multiplier(sc, hazard_component)
-                # если вам нужно сохранять исходные частоты из json — можно собирать payload уже тут
-                # а расчёт потом расширить
-                HANDLERS = {
-                    (0, 0): equipment_type_0_kind_0.calc_for_scenario,
-                    (0, 2): equipment_type_0_kind_2.calc_for_scenario,
-                    (0, 9): equipment_type_0_kind_9.calc_for_scenario,
-                    (1, 0): equipment_type_1_kind_0.calc_for_scenario,
-                    (2, 0): equipment_type_2_kind_0.calc_for_scenario,
-                    (3, 0): equipment_type_3_kind_0.calc_for_scenario,
-                    (4, 0): equipment_type_4_kind_0.calc_for_scenario,
-                    (4, 4): equipment_type_4_kind_4.calc_for_scenario,
-                    (5, 2): equipment_type_5_kind_2.calc_for_scenario,
-                    (6, 0): equipment_type_6_kind_0.calc_for_scenario,
-                    (7, 0): equipment_type_7_kind_0.calc_for_scenario,
-                    (8, 0): equipment_type_8_kind_0.calc_for_scenario,
-                }
-
-                handler = HANDLERS.get((equipment_type, kind))
-                if handler is None:
-                    continue
-
-                payload = handler(equipment, substance, sc, scenario_no_global)
-                write_calculation(cur, payload)
+            handler = HANDLERS[pair]
+            for row, scenarios_list, first_no in items:
+                equipment = row
+                substance = row
+                for i, sc in enumerate(scenarios_list):
+                    # Проверяем есть ли компенсирующие мероприятия
+                    sc = apply_ac_multiplier(sc, row["hazard_component"])
+                    payload = handler(equipment, substance, sc, first_no + i)
+                    records.append((first_no + i, [payload.get(c) for c in calculation_columns(cur)]))
+
+        # 5. Записываем в calculations в порядке scenario_no
+        records.sort(key=lambda rec: rec[0])
+        write_calculations(cur, [values for _, values in records])
+
+        # 6. Классы погоды: пожар пролива, вспышка и испарение (calculations_weather)
+        if WEATHER_CLASSES_ENABLED:
+            write_weather_calculations(cur, plan)
 
         con.commit()
 
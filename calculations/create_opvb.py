@@ -0,0 +1,177 @@
+"""
+Энергетический потенциал и категория взрывоопасности всех технологических
+блоков (calculations/app/_OPVB.py) по таблицам equipment + substances.
+
+Блок — позиция оборудования:
+  п.1.1 — ПГФ в свободном объёме (газ — весь объём, жидкость — 1 - fill_fraction),
+          плотность по уравнению состояния при P, T блока;
+  п.1.3 — перегретая ЖФ в блоке (T > T кипения): c1 = теплоёмкость ЖФ,
+          θ = T - Tкип, r = теплота испарения (доля 1 - exp(-c*θ/r));
+  п.1.6 — пролив ЖФ (spill_area_m2 или масса * spill_coefficient),
+          η по таблице №1 при WIND и OPVB_AIR_TEMPERATURE_C.
+Потоки от смежных блоков (п.1.2, вторая часть п.1.3) в БД не описаны и не учитываются.
+
+Расчёт одного блока — десятки арифметических операций, поэтому все блоки
+считаются одним проходом (свойства веществ разбираются по одному разу),
+а результат пишется в opvb_blocks одним executemany.
+"""
+import sqlite3
+from pathlib import Path
+
+from calculations.app._OPVB import (
+    BlockData,
+    OverheatedLiquidInBlock,
+    SpillEvaporationData,
+    calculate_all_energies,
+)
+from calculations.app._liguid_evaporation import saturated_vapor_pressure_pa
+from calculations.app._pipeline_volume_m3 import pipeline_internal_volume_m3
+from calculations.app._scenario_common import parse_substance_props
+from core.config import (
+    K_ADIABAT,
+    OPVB_AIR_TEMPERATURE_C,
+    OPVB_LIQUID_HEAT_CAPACITY_KJ_PER_KG_K,
+    OPVB_MAX_EVAPORATION_TIME_S,
+    OPVB_SURFACE,
+    P0,
+    R,
+    WIND,
+)
+from core.path import DB_PATH, SCHEMA_PATH
+
+OPVB_COLUMNS = (
+    "equipment_id", "equipment_name", "hazard_component",
+    "e1_kj", "e2_kj", "e3_kj", "e4_kj", "e_sum_kj", "m_pr_kg", "qv", "category",
+)
+
+GAS_PHASE = "г.ф."
+
+
+def _f(value, default: float = 0.0) -> float:
+    return default if value is None else float(value)
+
+
+def block_inputs(row: sqlite3.Row, props) -> dict:
+    """
+    Исходные данные calculate_all_energies для строки equipment + substances.
+
+    :@param row: строка equipment + substances (как в create_calc.main)
+    :@param props: SubstanceProps вещества строки
+
+    :@return: dict: block, overheated_in_block, spill (None — вклад не считается)
+    """
+    if int(row["equipment_type"]) == 0:
+        volume = pipeline_internal_volume_m3(row["length_m"], row["diameter_mm"], row["wall_thickness_mm"])
+    else:
+        volume = _f(row["volume_m3"])
+
+    is_gas = row["phase_state"] == GAS_PHASE
+    fill = 0.0 if is_gas else min(max(_f(row["fill_fraction"], 1.0), 0.0), 1.0)
+    P0_mpa = P0 / 1e6
+    P_mpa = _f(row["pressure_mpa"]) + P0_mpa  # в БД — избыточное давление
+    T_c = _f(row["substance_temperature_c"], OPVB_AIR_TEMPERATURE_C)
+    T_K = T_c + 273.15
+    Tb_K = props.t_boiling + 273.15
+    q = _f(props.explosion.get("heat_of_combustion_kJ_per_kg"))
+
+    # п.1.1 — ПГФ в свободном объёме
+    block = None
+    V_gas = volume * (1.0 - fill)
+    if V_gas > 0 and props.mol_mass > 0 and q > 0:
+        rho = P_mpa * 1e6 * props.mol_mass / (R * T_K)
+        block = BlockData(P_mpa=P_mpa, P0_mpa=P0_mpa, V_m3=V_gas, T1_K=T_K,
+                          rho_kg_m3=rho, k=K_ADIABAT, q_kj_kg=q)
+
+    liquid_kg = volume * fill * props.density_liquid
+    heat = props.evaporation_heat_J_per_kg
+
+    # п.1.3 — перегретая ЖФ в блоке
+    overheated = None
+    if liquid_kg > 0 and T_K > Tb_K and heat > 0 and q > 0:
+        overheated = OverheatedLiquidInBlock(G_kg=liquid_kg, q_kj_kg=q, c1=OPVB_LIQUID_HEAT_CAPACITY_KJ_PER_KG_K,
+                                             theta_s=T_K - Tb_K, r_m=heat / 1000)
+
+    # п.1.6 — пролив ЖФ
+    spill = None
+    spill_area = _f(row["spill_area_m2"])
+    if spill_area == 0:
+        spill_area = liquid_kg / 1000 * _f(row["spill_coefficient"])
+    if spill_area > 0 and heat > 0 and q > 0 and props.mol_mass > 0:
+        Pn = saturated_vapor_pressure_pa(T_c, props.t_boiling, heat, props.mol_mass, P0)
+        surface_lambda, surface_rho, surface_c = OPVB_SURFACE
+        spill = SpillEvaporationData(
+            T0_K=OPVB_AIR_TEMPERATURE_C + 273.15, Tk_K=Tb_K, r=heat,
+            lambda_W=surface_lambda, rho_kg_m3=surface_rho, c=surface_c,
+            Fp_m2=spill_area, tau_s=min(_f(row["evaporation_time_s"], OPVB_MAX_EVAPORATION_TIME_S),
+                                        OPVB_MAX_EVAPORATION_TIME_S),
+            eta=1.0, Pn_kpa=Pn / 1000, M=props.mol_mass * 1000, q_kj_kg=q,
+            air_speed_m_s=WIND, air_temp_c=OPVB_AIR_TEMPERATURE_C, use_table_eta=True,
+        )
+
+    return {"block": block, "overheated_in_block": overheated, "spill": spill}
+
+
+def calc_blocks(rows: list[sqlite3.Row]) -> list[tuple]:
+    """
+    Энергетический потенциал всех блоков.
+
+    :@param rows: строки equipment + substances
+
+    :@return: list: строки opvb_blocks (значения в порядке OPVB_COLUMNS)
+    """
+    props = {}
+    records = []
+    for row in rows:
+        substance_id = row["substance_id"]
+        if substance_id not in props:
+            props[substance_id] = parse_substance_props(row)
+        try:
+            res = calculate_all_energies(**block_inputs(row, props[substance_id]))
+        except ValueError as e:
+            print(f"ОПВБ: блок {row['equipment_id']} ({row['equipment_name']}) не рассчитан: {e}")
+            records.append((row["equipment_id"], row["equipment_name"], row["hazard_component"]) + (None,) * 8)
+            continue
+        records.append((
+            row["equipment_id"], row["equipment_name"], row["hazard_component"],
+            res["E1_kj"], res["E2_kj"], res["E3_kj"], res["E4_kj"], res["E_sum_kj"],
+            res["m_pr_kg"], res["Qv"], res["category"],
+        ))
+    return records
+
+
+def main(db_path: Path = DB_PATH) -> None:
+    with sqlite3.connect(db_path) as con:
+        con.row_factory = sqlite3.Row
+        # таблица результатов могла появиться в схеме позже самой БД
+        con.executescript(SCHEMA_PATH.read_text(encoding="utf-8"))
+        cur = con.cursor()
+
+        rows = cur.execute(
+            """
+            SELECT
+                e.*,
+                s.*,
+                e.id AS equipment_id
+            FROM equipment e
+            JOIN substances s ON s.id = e.substance_id
+            ORDER BY e.id
+            """
+        ).fetchall()
+
+        records = calc_blocks(rows)
+
+        cur.execute("DELETE FROM opvb_blocks;")
+        cur.executemany(
+            f"INSERT INTO opvb_blocks ({','.join(OPVB_COLUMNS)}) VALUES ({','.join(['?'] * len(OPVB_COLUMNS))});",
+            records,
+        )
+        con.commit()
+
+    categories = {}
+    for r in records:
+        categories[r[-1]] = categories.get(r[-1], 0) + 1
+    print(f"ОПВБ: рассчитано блоков {len(records)}, категории: {categories}")
+
+
+if __name__ == '__main__':
+    main()
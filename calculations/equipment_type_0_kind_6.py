@@ -0,0 +1,39 @@
+import sqlite3
+
+# Включение/отключение отладочного вывода
+DEBUG = False  # True -> печатаем отладку, False -> молчим
+
+
+def calc_for_scenario(
+        equipment: sqlite3.Row,
+        substance: sqlite3.Row,
+        scenario: dict,
+        scenario_no: int,
+) -> dict:
+    """
+    Трубопровод с токсичной жидкостью (практически не испаряется): расчёт одного сценария одной строки.
+    Считается пакетным расчётом пары (calc_liquid_pipeline_batch) для одной строки,
+    чтобы физика была описана в одном месте.
+
+    :@param equipment: строка equipment + substances (как в create_calc.main)
+    :@param substance: та же строка (свойства вещества берутся из equipment)
+    :@param scenario: сценарий с учтённым множителем компенсирующих мероприятий
+    :@param scenario_no: номер сценария
+
+    :@return: dict: колонка calculations -> значение
+    """
+    # numpy загружается только при расчёте, не при импорте create_calc
+    from calculations.app.calculators._calc_batch import TWO_LINE_SCHEME, calc_liquid_pipeline_batch
+
+    if DEBUG:
+        print("Считаем сценарий:", scenario_no, equipment["equipment_name"])
+
+    columns = calc_liquid_pipeline_batch([equipment], [scenario], [scenario_no],
+                                         kind=6, evaporates=False, line_scheme=TWO_LINE_SCHEME,
+                                         ac_applied=True)
+    result = {name: values[0] for name, values in columns.items()}
+
+    if DEBUG:
+        print("result:", result)
+
+    return result
@@ -1,22 +1,5 @@
 import sqlite3
 
-from calculations.app._base_damage_line import damage
-
-from calculations.app.calculators._calc_amount import calculate_amount
-from calculations.app.calculators._calc_damage import calculate_damage
-from calculations.app.calculators._calc_people import calculate_people_damage
-from calculations.app.calculators._calc_risk import calculate_risk
-from calculations.app.calculators._calc_spill_area import calc_spill_area_m2
-from calculations.app.calculators._calc_zone import calculate_zone
-from calculations.app.scenario.scenario_matrix import get_calc_code
-from calculations.app.calculators._calc_base_result import init_result_base
-
-from core.config import (
-    MASS_TO_PART,
-    SPILL_TO_PART,
-    DAMAGE_SIX_SC,
-)
-
 # Включение/отключение отладочного вывода
 DEBUG = False  # True -> печатаем отладку, False -> молчим
 
@@ -28,120 +11,28 @@ def calc_for_scenario(
         scenario_no: int,
 ) -> dict:
     """
-    Заглушка расчёта.
-    Все неизвестные значения временно = 1
-    """
-
-    if DEBUG:
-        print("Считаем сценарий:", scenario_no, equipment["equipment_name"])
-
-    # Номер ветки сценария
-    sc_line = int(scenario.get("scenario_line", 0))
-    # Полные и частичные варианты
-    FULL_SCENARIO_LINE = (1, 2, 3)
-    PART_SCENARIO_LINE = (4, 5, 6)
-    # -------------------------------------------------------------------------
-    # Обязательные поля + частоты
-    # -------------------------------------------------------------------------
-    result = init_result_base(equipment, scenario, scenario_no)
-    # -------------------------------------------------------------------------
-    # Количество ОВ (через общий калькулятор)
-    # -------------------------------------------------------------------------
-    amount_info = calculate_amount(
-        equipment_type=equipment["equipment_type"],
-        kind=9,  # ЛВЖ для этого файла
-        equipment=equipment,
-        substance=substance
-    )
-
-    if DEBUG:
-        print("amount_info:", amount_info)
+    Трубопровод с жидкостью (не испаряется): расчёт одного сценария одной строки.
+    Считается пакетным расчётом пары (calc_liquid_pipeline_batch) для одной строки,
+    чтобы физика была описана в одном месте.
 
-    # базовая масса в оборудовании
-    result["amount_t"] = amount_info["amount_t"]
-    # базовая масса, которая «может выйти» (полный пролив)
-    base_ov_in_accident_t = amount_info["ov_in_accident_t"]
-    # учитываем ПОЛНЫЙ / ЧАСТИЧНЫЙ на уровне сценария
-    if sc_line in FULL_SCENARIO_LINE:  # полностью
-        result["ov_in_accident_t"] = base_ov_in_accident_t
-    elif sc_line in PART_SCENARIO_LINE:  # частичная разгерметизация
-        result["ov_in_accident_t"] = base_ov_in_accident_t * MASS_TO_PART
-    else:
-        result["ov_in_accident_t"] = 0.0
+    :@param equipment: строка equipment + substances (как в create_calc.main)
+    :@param substance: та же строка (свойства вещества берутся из equipment)
+    :@param scenario: сценарий с учтённым множителем компенсирующих мероприятий
+    :@param scenario_no: номер сценария
 
-    if DEBUG:
-        print(f'result["ov_in_accident_t"] = {result["ov_in_accident_t"]}')
+    :@return: dict: колонка calculations -> значение
+    """
+    # numpy загружается только при расчёте, не при импорте create_calc
+    from calculations.app.calculators._calc_batch import calc_liquid_pipeline_batch
 
-    # -------------------------------------------------------------------------
-    # Прогнозирование пролива опасного вещеества
-    # -------------------------------------------------------------------------
-    spill = calc_spill_area_m2(
-        float(result["ov_in_accident_t"]),
-        equipment,
-        is_full_spill=(sc_line in FULL_SCENARIO_LINE),
-        spill_to_part=SPILL_TO_PART,
-    )
     if DEBUG:
-        print(f"spill={spill} м2")
-
-    # -------------------------------------------------------------------------
-    # Испарение (нет т.к. жидкость не испаряется)
-    # -------------------------------------------------------------------------
-
-    # -------------------------------------------------------------------------
-    # Количество опасного вещества в поражающем факторе
-    # -------------------------------------------------------------------------
-    if sc_line in (1, 2, 4, 5):  # пролив полная/частичная
-        result["ov_in_hazard_factor_t"] = result["ov_in_accident_t"]
-    elif sc_line in (3, 6):  # ликвидация
-        result["ov_in_hazard_factor_t"] = 0
+        print("Считаем сценарий:", scenario_no, equipment["equipment_name"])
 
-    if DEBUG:
-        print(f'result["ov_in_hazard_factor_t"] = {result["ov_in_hazard_factor_t"]}')
-        print(20 * "-")
+    columns = calc_liquid_pipeline_batch([equipment], [scenario], [scenario_no],
+                                         kind=9, evaporates=False, ac_applied=True)
+    result = {name: values[0] for name, values in columns.items()}
 
-    # -------------------------------------------------------------------------
-    # Определение расчетного кода (calc_code, см. typical_scenarios.json)
-    # -------------------------------------------------------------------------
-    calc_code = get_calc_code(equipment["equipment_type"], substance['kind'], sc_line)
     if DEBUG:
-        print(f'calc_code = {calc_code}')
-        print(20 * "-")
-    # -------------------------------------------------------------------------
-    # Расчеты
-    # -------------------------------------------------------------------------
-    zones = calculate_zone(substance, equipment, spill, calc_code, result["ov_in_hazard_factor_t"])
-    result.update(zones)
-    # -------------------------------------------------------------------------
-    # Последствия
-    # -------------------------------------------------------------------------
-    people = calculate_people_damage(
-        sc_line=sc_line,
-        equipment_type=equipment["equipment_type"],
-        kind=substance["kind"],
-        possible_dead=equipment["possible_dead"],
-        possible_injured=equipment["possible_injured"],
-    )
-    result.update(people)
-    # -------------------------------------------------------------------------
-    # Ущерб
-    # -------------------------------------------------------------------------
-    damage_scenario = calculate_damage(scenario, damage_coeffs=DAMAGE_SIX_SC, damage_func=damage,
-                                       ov_in_accident_t=result["ov_in_accident_t"])
-    result.update(damage_scenario)
-    if DEBUG:
-        print(
-            "Ущерб, тыс.руб",
-            result["direct_losses"],
-            result["social_losses"],
-            result["total_environmental_damage"],
-            result["total_damage"],
-        )
-        print(20 * "-")
-
-    # -------------------------------------------------------------------------
-    # Риски
-    # -------------------------------------------------------------------------
-    calculate_risk(result)
+        print("result:", result)
 
     return result
@@ -25,3 +25,78 @@ DAMAGE_SCALE = 38.3  # увеличение/усменьшение базово
 
 WITHOUT_ACTIVITES_COMPENSATOIRES = 1.25
 WITH_ACTIVITES_COMPENSATOIRES = 0.6
+
+# --- Расчёт: таблицы откликов (CALC_CACHE_DIR) ---
+FIREBALL_TABLE_ENABLED = True  # зоны огненного шара из таблицы по массе (иначе перебор радиусов)
+FIREBALL_TABLE_MASS_RANGE_KG = (1.0, 1.0e7)  # диапазон масс таблицы; вне его — перебор
+FIREBALL_TABLE_POINTS_PER_DECADE = 40  # узлов сетки масс на порядок
+POOL_FIRE_SURFACE_ENABLED = True  # зоны пожара пролива по поверхности отклика (иначе перебор радиусов)
+POOL_FIRE_SURFACE_AREA_RANGE_M2 = (1.0, 1.0e5)  # диапазон площадей пролива поверхности
+POOL_FIRE_SURFACE_MSG_RANGE = (0.005, 0.5)  # диапазон удельной скорости выгорания, кг/(с*м2)
+POOL_FIRE_SURFACE_USTAR_RANGE = (1.0, 50.0)  # диапазон безразмерной скорости ветра u* (u* < 1 — отдельный слой)
+POOL_FIRE_SURFACE_POINTS_PER_DECADE = 10  # узлов сетки на порядок по каждой оси
+POOL_FIRE_SURFACE_MAX_ERROR_M = 2.0  # ячейки с большей оценкой погрешности считаются перебором
+# Зоны интерполяцией порогов (по логарифму) между узлами редкой сетки радиусов вместо
+# ближайшего узла перебора; меняет радиусы в calculations (при шаге x5 до 0.4 м пожар пролива,
+# 1 м огненный шар, 2 м взрыв — tests/test_zone_interpolation.py). Выключено: по умолчанию зоны
+# совпадают с перебором методики, а поверхность/таблица/обращение кривой дают их не медленнее
+ZONE_INTERPOLATION_ENABLED = False
+ZONE_INTERPOLATION_STEP_FACTOR = 5  # во сколько раз шаг сетки интерполяции больше шага перебора
+
+# --- Расчёт: токсическое поражение ---
+TOXIC_STABILITY_CLASS = "F"  # класс устойчивости атмосферы (A-F), F — инверсия (наихудшие условия рассеяния)
+TOXIC_DISTANCE_RANGE_M = (1.0, 30000.0)  # сетка расстояний расчёта токсодозы; дальше — продолжается декадами
+TOXIC_POINTS_PER_DECADE = 100  # узлов сетки расстояний на порядок
+
+# --- Расчёт: пакетный режим ---
+BATCH_CALC_ENABLED = True  # пары (equipment_type, kind) с пакетным расчётом считаются колонками (numpy)
+BATCH_CALC_MIN_ROWS = 32  # с какого числа строк оборудования пары включать пакетный расчёт
+
+# --- Расчёт: классы погоды ---
+WEATHER_CLASSES_ENABLED = True  # пожар пролива, вспышка и испарение по классам погоды (weather_classes.json) -> calculations_weather
+
+# --- Расчёт: энергетический потенциал блоков (ОПВБ) ---
+OPVB_AIR_TEMPERATURE_C = 20.0  # температура воздуха и подстилающей поверхности, °C
+OPVB_LIQUID_HEAT_CAPACITY_KJ_PER_KG_K = 2.0  # теплоёмкость ЖФ для п.1.3 (в БД не задаётся), кДж/(кг*К)
+OPVB_SURFACE = (1.5, 2200.0, 840.0)  # подстилающая поверхность (бетон): λ, Вт/(м*К); ρ, кг/м3; c, Дж/(кг*К)
+OPVB_MAX_EVAPORATION_TIME_S = 3600  # время испарения пролива для п.1.6 — не более 1 ч
+
+# --- Отчёт ---
+REPORT_DRAFT_MODE = False  # черновой режим отчёта: без диаграмм, крупные таблицы усечены
+DRAFT_TABLE_MAX_ROWS = 30  # сколько строк крупных таблиц выводить в черновом режиме
+FG_DAMAGE_BIN_MLN = None  # шаг группировки ущерба для F/G-диаграммы, млн руб (None — без группировки)
+PARETO_TOP_N = 20  # число столбцов Pareto-диаграмм (остальные сценарии — в "Прочие")
+RISK_MATRIX_LOD_THRESHOLD = 2000  # больше точек — матрицы риска рисуются с агрегацией (совпадающие точки / hexbin)
+REPORT_CHART_WORKERS = 4  # процессов для параллельного построения диаграмм (1 — строить последовательно)
+CHART_CACHE_ENABLED = True  # брать неизменившиеся диаграммы из кэша (REPORT_CHART_CACHE_DIR)
+CHART_CACHE_MAX_AGE_DAYS = 30  # записи кэша диаграмм старше — удаляются (None — без ограничения)
+CHART_CACHE_MAX_SIZE_MB = 200  # предельный размер кэша диаграмм, МБ (None — без ограничения)
+STREAM_LARGE_TABLES = True  # крупные таблицы писать в docx потоково, минуя DOM (ограничивает память)
+STREAM_TABLE_MIN_ROWS = 2000  # с какого числа строк таблица пишется потоково (None — никогда)
+STREAM_TABLE_CHUNK_CELLS = 11000  # размер порции при потоковой записи, ячеек (строк в порции — столько / число колонок)
+FRAGMENT_CACHE_ENABLED = True  # не перестраивать разделы отчёта, данные которых не менялись (ограничения — как у кэша диаграмм)
+QUERY_CACHE_ENABLED = True  # при неизменной БД брать выборки отчёта из снимка (REPORT_QUERY_CACHE_DIR)
+WATCH_POLL_INTERVAL_S = 0.5  # период опроса шаблонов/данных в режиме наблюдения (report/watch_report.py), с
+REPORT_ASYNC_PIPELINE = True  # сборка отчёта через asyncio-граф задач (report/report_pipeline.py) с таймингами шагов
+REPORT_IO_THREADS = 4  # потоки для чтения шаблонов в асинхронной сборке
+CHART_DPI_DEFAULT = 200  # разрешение диаграмм, dpi
+# разрешение отдельных диаграмм (имя PNG без расширения -> dpi): крупные фигуры
+# при ширине 16 см в документе и при 150 dpi остаются чётче 250 dpi на бумаге
+CHART_DPI = {
+    "pareto_damage": 150,
+    "pareto_fatalities": 150,
+    "pareto_injured": 150,
+    "pareto_environmental_damage": 150,
+    "damage_by_component": 150,
+}
+ANNEX_TABLE_MIN_ROWS = 10000  # с какого числа строк зоны/ущерб/риски выносятся в приложение XLSX/CSV (None — никогда)
+ANNEX_SUMMARY_ROWS = 50  # сколько строк таблицы остаётся в документе при выносе в приложение
+ANNEX_FORMAT = "xlsx"  # формат приложений: "xlsx" или "csv"
+CHART_PNG_MODE = "optimize"  # обработка PNG: "optimize" — без потерь, "quantize" — палитра 256 цветов, None — как сохранил matplotlib
+
+# --- Время запуска (python -m core.import_budget) ---
+# модуль -> (бюджет времени импорта, мс; модули, которые при этом не должны загружаться)
+IMPORT_BUDGETS_MS = {
+    "calculations.create_calc": (500, ("matplotlib", "numpy", "docx")),
+    "report.fill_word": (1500, ("matplotlib", "numpy", "docx")),
+}
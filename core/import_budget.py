@@ -0,0 +1,55 @@
+"""
+Проверка времени запуска: python -m core.import_budget
+
+Каждый модуль из IMPORT_BUDGETS_MS импортируется в отдельном процессе
+с `-X importtime`; суммарное время импорта сравнивается с бюджетом,
+и проверяется, что тяжёлые зависимости (matplotlib и т.п.) не загружены.
+При превышении — код выхода 1.
+"""
+from __future__ import annotations
+
+import subprocess
+import sys
+
+from core.config import IMPORT_BUDGETS_MS
+from core.path import PROJECT_DIR
+
+
+def import_times(module: str) -> dict[str, float]:
+    """Имя модуля -> суммарное (cumulative) время импорта, мс."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Не удалось импортировать {module}:\n{proc.stderr}")
+
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _self, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative) / 1000
+    return times
+
+
+def check(budgets: dict = IMPORT_BUDGETS_MS) -> bool:
+    ok = True
+    for module, (budget_ms, forbidden) in budgets.items():
+        times = import_times(module)
+        total = times.get(module, 0.0)
+        loaded = sorted({name.split(".")[0] for name in times} & set(forbidden))
+
+        status = "OK" if total <= budget_ms and not loaded else "ПРЕВЫШЕНИЕ"
+        print(f"{module}: {total:.0f} мс (бюджет {budget_ms} мс) — {status}")
+        if loaded:
+            print(f"  загружены лишние зависимости: {', '.join(loaded)}")
+        ok = ok and status == "OK"
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if check() else 1)
@@ -10,12 +10,19 @@ DATA_DIR = PROJECT_DIR / "data"
 SUBSTANCES_JSON = DATA_DIR / "substances/substances.json"
 EQUIPMENT_JSON = DATA_DIR / "equipments/equipments.json"
 TYPICAL_SCENARIOS_PATH = PROJECT_DIR / "calculations" / "app" / "scenario" / "typical_scenarios.json"
+# классы погоды (ветер x температура) с вероятностями, пишет data/chart_static/weather_probability.py
+WEATHER_CLASSES_PATH = DATA_DIR / "chart_static" / "weather_classes.json"
 
 # --- DATABASE ---
 DB_DIR = PROJECT_DIR / "db"
 DB_PATH = DB_DIR / "iris.sqlite3"
 SCHEMA_PATH = DB_DIR / "schema.sql"
 
+# Таблицы откликов расчётных моделей (строятся автоматически, можно удалять)
+CALC_CACHE_DIR = DB_DIR / "cache"
+FIREBALL_TABLE_PATH = CALC_CACHE_DIR / "fireball_table.json"
+POOL_FIRE_SURFACE_PATH = CALC_CACHE_DIR / "pool_fire_surface.npy"  # + .json с описанием сетки
+
 # --- REPORT ---
 # Какой шаблон использовать
 VARIANT_TEMPLATE = "TAIF/ДПБ_(экспл_СПТ)"
@@ -45,3 +52,8 @@ REPORT_TEMPLATE_FILES = sorted(REPORT_TEMPLATE_DIR.glob("*.docx"))
 REPORT_OUTPUT_DIR = REPORT_DIR / "output"
 REPORT_CHARTS_DIR = REPORT_OUTPUT_DIR / "charts"
 
+# Кэш между запусками (диаграммы и т.п.), можно удалять целиком
+REPORT_CACHE_DIR = REPORT_OUTPUT_DIR / "cache"
+REPORT_CHART_CACHE_DIR = REPORT_CACHE_DIR / "charts"
+REPORT_FRAGMENT_CACHE_DIR = REPORT_CACHE_DIR / "fragments"
+REPORT_QUERY_CACHE_DIR = REPORT_CACHE_DIR / "queries"
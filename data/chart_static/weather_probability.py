@@ -8,15 +8,19 @@ matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 from matplotlib.ticker import MaxNLocator
 
-
-def build_probability_chart(excel_path: Path, out_png: Path, sheet_name: str = "Лист1") -> None:
-    """
-    Строит распределения (доли дней):
-      - Скорость ветра: 1–<2, 2–<3, 3–<4, 4–≤5, >5
-      - Средняя температура: <0, 0–<10, 10–<20, 20–≤30
-    """
-
-    # --- Read ---
+from calculations.app._weather import (
+    TEMPERATURE_LABELS,
+    WIND_LABELS,
+    class_probabilities,
+    save_weather_classes,
+    temperature_class_index,
+    weather_classes,
+    wind_class_index,
+)
+
+
+def read_observations(excel_path: Path, sheet_name: str = "Лист1") -> pd.DataFrame:
+    """Суточные наблюдения: Дата, Средняя (температура), Скорость (ветра)."""
     df0 = pd.read_excel(excel_path, sheet_name=sheet_name, engine="openpyxl")
 
     # Удаляем строку с единицами измерения
@@ -28,7 +32,19 @@ def build_probability_chart(excel_path: Path, out_png: Path, sheet_name: str = "
     df["Дата"] = pd.to_datetime(df["Дата"].astype(str), dayfirst=True, errors="coerce")
     df["Средняя"] = pd.to_numeric(df["Средняя"], errors="coerce")
     df["Скорость"] = pd.to_numeric(df["Скорость"], errors="coerce")
-    df = df.dropna(subset=["Дата"])
+    return df.dropna(subset=["Дата"])
+
+
+def build_probability_chart(excel_path: Path, out_png: Path, sheet_name: str = "Лист1") -> None:
+    """
+    Строит распределения (доли дней):
+      - Скорость ветра: 1–<2, 2–<3, 3–<4, 4–≤5, >5
+      - Средняя температура: <0, 0–<10, 10–<20, ≥20
+    Интервалы — те же, что у классов погоды расчёта (calculations/app/_weather.py).
+    """
+
+    # --- Read ---
+    df = read_observations(excel_path, sheet_name)
 
     temp = df["Средняя"].dropna().to_numpy()
     wind = df["Скорость"].dropna().to_numpy()
@@ -36,27 +52,14 @@ def build_probability_chart(excel_path: Path, out_png: Path, sheet_name: str = "
     # ----------------------------------------------------------------------
     # БИНЫ ДЛЯ ВЕТРА (без <1 м/с)
     # ----------------------------------------------------------------------
-    wind_labels = ["1–<2", "2–<3", "3–<4", "4–≤5", ">5"]
-    wind_counts = np.array([
-        np.sum((wind >= 1) & (wind < 2)),
-        np.sum((wind >= 2) & (wind < 3)),
-        np.sum((wind >= 3) & (wind < 4)),
-        np.sum((wind >= 4) & (wind <= 5)),
-        np.sum(wind > 5),
-    ], dtype=float)
-    wind_probs = wind_counts / wind_counts.sum()
+    wind_labels = WIND_LABELS
+    wind_probs = class_probabilities(wind_class_index(wind), len(WIND_LABELS))
 
     # ----------------------------------------------------------------------
-    # БИНЫ ДЛЯ ТЕМПЕРАТУРЫ (без >=30, объединяем 20–<30)
+    # БИНЫ ДЛЯ ТЕМПЕРАТУРЫ (выше 20 °C — один интервал)
     # ----------------------------------------------------------------------
-    temp_labels = ["<0", "0–<10", "10–<20", "20–≤30,>30"]
-    temp_counts = np.array([
-        np.sum(temp < 0),
-        np.sum((temp >= 0) & (temp < 10)),
-        np.sum((temp >= 10) & (temp < 20)),
-        np.sum((temp >= 20) & (temp <= 30)),
-    ], dtype=float)
-    temp_probs = temp_counts / temp_counts.sum()
+    temp_labels = TEMPERATURE_LABELS
+    temp_probs = class_probabilities(temperature_class_index(temp), len(TEMPERATURE_LABELS))
 
     # ----------------------------------------------------------------------
     # Plot
@@ -119,6 +122,12 @@ def build_probability_chart(excel_path: Path, out_png: Path, sheet_name: str = "
     plt.close(fig)
 
 
+def build_weather_classes(excel_path: Path, sheet_name: str = "Лист1") -> list:
+    """Классы погоды (совместное распределение ветра и температуры) для расчёта."""
+    df = read_observations(excel_path, sheet_name)
+    return weather_classes(df["Скорость"].to_numpy(dtype=float), df["Средняя"].to_numpy(dtype=float))
+
+
 if __name__ == "__main__":
     BASE_DIR = Path(__file__).resolve().parent
     excel_path = BASE_DIR / "Данные.xlsx"
@@ -126,3 +135,6 @@ if __name__ == "__main__":
 
     build_probability_chart(excel_path, out_png)
     print("Saved:", out_png)
+
+    save_weather_classes(build_weather_classes(excel_path), source=excel_path.name)
+    print("Saved: weather_classes.json")
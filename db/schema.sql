@@ -167,3 +167,63 @@ CREATE INDEX IF NOT EXISTS idx_calc_equipment_id
 
 CREATE INDEX IF NOT EXISTS idx_calc_hazard_component
   ON calculations(hazard_component);
+
+-- =========================================================
+-- 4а) Классы погоды (ветер x температура) и расчеты по ним
+-- =========================================================
+CREATE TABLE IF NOT EXISTS weather_classes (
+  id                         INTEGER PRIMARY KEY,  -- номер класса (порядок weather_classes.json, с 1)
+
+  wind_label                 TEXT    NOT NULL,  -- интервал скорости ветра, м/с
+  temperature_label          TEXT    NOT NULL,  -- интервал температуры воздуха, °C
+  wind_m_s                   REAL    NOT NULL,  -- расчётная скорость ветра, м/с
+  air_temperature_c          REAL    NOT NULL,  -- расчётная температура воздуха, °C
+  probability                REAL    NOT NULL   -- вероятность класса
+);
+
+CREATE TABLE IF NOT EXISTS calculations_weather (
+  id                         INTEGER PRIMARY KEY,
+
+  equipment_id               INTEGER NOT NULL,
+  scenario_no                INTEGER NOT NULL UNIQUE,  -- сценарий calculations.scenario_no
+
+  -- средние по классам погоды, взвешенные по вероятности класса (weather_classes.probability)
+  ov_in_hazard_factor_t      REAL,   -- количество ОВ в создании поражающего фактора (т)
+
+  -- радиусы зон, м: целые, как в calculations (NULL — зона не считается)
+  q_10_5                     REAL,
+  q_7_0                      REAL,
+  q_4_2                      REAL,
+  q_1_4                      REAL,
+
+  r_nkpr                     REAL,
+  r_vsp                      REAL,
+
+  FOREIGN KEY (equipment_id) REFERENCES equipment(id)
+);
+
+-- =========================================================
+-- 5) Энергетический потенциал технологических блоков (ОПВБ)
+-- =========================================================
+CREATE TABLE IF NOT EXISTS opvb_blocks (
+  id                         INTEGER PRIMARY KEY,
+
+  -- Блок = позиция оборудования
+  equipment_id               INTEGER NOT NULL,
+  equipment_name             TEXT    NOT NULL,
+  hazard_component           TEXT    NOT NULL,
+
+  e1_kj                      REAL,   -- E1' ПГФ в блоке, кДж
+  e2_kj                      REAL,   -- E2' ПГФ от смежных блоков, кДж
+  e3_kj                      REAL,   -- E3' перегретая ЖФ, кДж
+  e4_kj                      REAL,   -- E4' пролив ЖФ на твёрдую поверхность, кДж
+  e_sum_kj                   REAL,   -- полная энергия, кДж
+  m_pr_kg                    REAL,   -- приведённая масса, кг
+  qv                         REAL,   -- относительный энергетический потенциал Qв
+  category                   TEXT,   -- категория взрывоопасности (I, II, III)
+
+  FOREIGN KEY (equipment_id) REFERENCES equipment(id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_opvb_equipment_id
+  ON opvb_blocks(equipment_id);
@@ -3,7 +3,10 @@ from __future__ import annotations
 # True/False
 CREATE_DB = True  # нужно ли создавать базу данных
 CREATE_CALC = True  # нужно ли проводить расчеты по новой
+CREATE_OPVB = True  # нужно ли рассчитывать энергетический потенциал и категории блоков (таблица opvb_blocks)
 CREATE_BACKUP = True  # нужно ли создавать архив исходных данных
+WATCH_REPORT = False  # после формирования отчёта следить за шаблонами и пересобирать изменённые
+PREVIEW_REPORT = False  # вместо docx — быстрый HTML-предпросмотр таблиц и диаграмм (report/output/preview.html)
 
 
 def main() -> None:
@@ -17,11 +20,28 @@ def main() -> None:
         from calculations.create_calc import main as run_calc
         run_calc()
 
+    if CREATE_OPVB:
+        # 2а) Энергетический потенциал технологических блоков
+        from calculations.create_opvb import main as run_opvb
+        run_opvb()
+
     if CREATE_BACKUP:
         from report.backup import create_backup
         create_backup()
 
     # 3) Формирование отчёта (docx +  диаграммы)
+    if PREVIEW_REPORT:
+        # 3а) только предпросмотр: те же выборки и диаграммы, без Word
+        from report.html_preview import main as preview_report
+        preview_report()
+        return
+
+    if WATCH_REPORT:
+        # 3б) режим наблюдения: собирает все шаблоны, затем пересобирает изменённые
+        from report.watch_report import main as watch_report
+        watch_report()
+        return
+
     from report.fill_word import main as build_report
     build_report()
 
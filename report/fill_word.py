@@ -1,7 +1,12 @@
+from __future__ import annotations
+
+import heapq
 import json
+import os
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
 from pathlib import Path
-from docx.shared import Cm
-from docx import Document
+from typing import TYPE_CHECKING
 
 from report.reportgen.constants import NGK_BACKGROUND_RISK
 from report.reportgen.formatters import risk_to_dbr, format_float_2
@@ -10,18 +15,29 @@ from core.path import (
     DB_PATH,
     REPORT_TEMPLATE_DIR,
     REPORT_OUTPUT_DIR,
+    REPORT_CHARTS_DIR,
+    REPORT_CHART_CACHE_DIR,
+    REPORT_FRAGMENT_CACHE_DIR,
+    REPORT_QUERY_CACHE_DIR,
     TYPICAL_SCENARIOS_PATH,
     ORGANIZATION_PATH,
     ORGANIZATION_SITE_ID,
     PROJECT_COMMON_PATH,
 )
+from core.config import (
+    REPORT_DRAFT_MODE, DRAFT_TABLE_MAX_ROWS, FG_DAMAGE_BIN_MLN, PARETO_TOP_N,
+    RISK_MATRIX_LOD_THRESHOLD, REPORT_CHART_WORKERS,
+    CHART_CACHE_ENABLED, CHART_CACHE_MAX_AGE_DAYS, CHART_CACHE_MAX_SIZE_MB,
+    STREAM_LARGE_TABLES, STREAM_TABLE_MIN_ROWS, STREAM_TABLE_CHUNK_CELLS,
+    FRAGMENT_CACHE_ENABLED, QUERY_CACHE_ENABLED, REPORT_ASYNC_PIPELINE,
+    CHART_DPI_DEFAULT, CHART_DPI, CHART_PNG_MODE,
+    ANNEX_TABLE_MIN_ROWS, ANNEX_SUMMARY_ROWS, ANNEX_FORMAT,
+)
 
 TEMPLATE_DIR = REPORT_TEMPLATE_DIR
 
 # алиасы для минимальных правок ниже по файлу
 
-OUT_PATH = REPORT_OUTPUT_DIR / "template_report_out.docx"
-
 from report.reportgen.db import (
     open_db,
     get_used_substances,
@@ -39,9 +55,7 @@ from report.reportgen.db import (
     get_max_damage_by_hazard_component,
     get_fn_source_rows,
     get_fg_source_rows,
-    get_pareto_risk_source_rows,
-    get_pareto_damage_source_rows,
-    get_pareto_environmental_damage_source_rows,
+    get_pareto_top_rows,
     get_max_losses_by_hazard_component,
     get_risk_matrix_rows,
     get_risk_matrix_damage_rows,
@@ -49,6 +63,7 @@ from report.reportgen.db import (
     get_damage_by_component,
     get_substances_by_component,
     get_calculation_row_for_top_scenario,
+    get_weather_zones_for_top_scenario,
     get_fatalities_injured_for_top_scenario,
     get_total_damage_for_top_scenario,
     get_ov_in_accident_for_top_scenario,
@@ -72,6 +87,20 @@ from report.reportgen.word_utils import (
     set_run_font,
 )
 
+from report.reportgen.docx_stream import StreamedTables
+from report.reportgen.fragment_cache import FragmentCache, evict_fragment_cache
+from report.reportgen.query_cache import QueryCache, db_fingerprint
+from report.reportgen.image_pipeline import optimize_png
+from report.reportgen.annex import write_annex
+from report.reportgen.chart_cache import (
+    chart_cache_key,
+    chart_cache_get,
+    chart_cache_put,
+    evict_chart_cache,
+)
+if TYPE_CHECKING:
+    from docx.document import Document
+
 from report.reportgen.charts import (
     build_fn_points,
     build_fg_points,
@@ -87,6 +116,9 @@ from report.reportgen.charts import (
 
 def set_repeat_table_header(row):
     """Делает строку таблицы повторяемой шапкой на каждой странице."""
+    from docx.oxml import OxmlElement
+    from docx.oxml.ns import qn
+
     tr = row._tr
     trPr = tr.get_or_add_trPr()
     tblHeader = trPr.find(qn("w:tblHeader"))
@@ -110,16 +142,28 @@ def iter_variant_templates(template_dir: Path) -> list[Path]:
     """Все .docx в папке варианта, стабильно отсортировано."""
     if not template_dir.exists():
         return []
-    return sorted([p for p in template_dir.glob("*.docx") if p.is_file()])
+    # ~$*.docx — файлы блокировки Word, пока шаблон открыт на редактирование
+    return sorted([p for p in template_dir.glob("*.docx") if p.is_file() and not p.name.startswith("~$")])
+
+
+# суффиксы имени отчёта (build_report_document): чистовой, черновой
+OUT_SUFFIXES = ("_out", "_draft")
 
 
 def clear_output_docx(output_dir: Path):
-    """Удаляет только .docx в output_dir. Папки (charts) и прочее не трогает."""
+    """
+    Удаляет .docx и приложения к отчётам шаблонов варианта
+    ({шаблон}{суффикс}_*.{ANNEX_FORMAT}) в output_dir. Папки (charts) и прочие файлы не трогает.
+    """
     if not output_dir.exists():
         return
-    for p in output_dir.glob("*.docx"):
-        if p.is_file():
-            p.unlink()
+    patterns = ["*.docx"]
+    for template in iter_variant_templates(TEMPLATE_DIR):
+        patterns += [f"{template.stem}{suffix}_*.{ANNEX_FORMAT}" for suffix in OUT_SUFFIXES]
+    for pattern in patterns:
+        for p in output_dir.glob(pattern):
+            if p.is_file():
+                p.unlink()
 
 
 def delete_paragraph(paragraph):
@@ -129,16 +173,14 @@ def delete_paragraph(paragraph):
     paragraph._p = paragraph._element = None
 
 
-from docx.oxml import OxmlElement
-from docx.oxml.ns import qn
-
-
 def set_table_autofit_to_contents(table):
     """
     Включает автоподбор ширины колонок по содержимому.
     Важно: снимает наши принудительные tblLayout=fixed и tblW=100% (pct),
     иначе Word часто игнорирует autofit.
     """
+    from docx.oxml.ns import qn
+
     tbl = table._tbl
     tblPr = tbl.tblPr
 
@@ -166,6 +208,9 @@ def set_table_full_width(doc: Document, table, cols: int = 2, left_ratio: float
 
     Важно: функция задаёт tblW=100% и tblLayout=fixed на уровне XML.
     """
+    from docx.oxml import OxmlElement
+    from docx.oxml.ns import qn
+
     # 1) фиксированный layout (иначе Word может игнорировать widths)
     tbl = table._tbl
     tblPr = tbl.tblPr
@@ -408,6 +453,8 @@ def render_equipment_one_table_at_marker(
         # заполняем (заголовки секций остаются)
         fill_table(table, item, filtered_sections, json_formatter)
 
+    return table
+
 
 def render_distribution_table_at_marker(
         doc: Document,
@@ -551,6 +598,17 @@ def render_distribution_table_at_marker(
         set_cell_text(row[7], format_float_2(r.get("pressure_mpa")))
         set_cell_text(row[8], format_float_1(r.get("substance_temperature_c")))
 
+    return table
+
+
+def scenario_order_key(r: dict):
+    """Порядок строк сценарных таблиц: С1..Сn, внутри номера — по оборудованию."""
+    sc_no = r.get("scenario_no")
+    return (
+        int(sc_no) if sc_no is not None else 10 ** 9,
+        str(r.get("equipment_name") or ""),
+    )
+
 
 def render_ov_amount_table_at_marker(doc: Document, marker: str, title: str, rows: list[dict]):
     """
@@ -580,13 +638,7 @@ def render_ov_amount_table_at_marker(doc: Document, marker: str, title: str, row
     set_cell_text(hdr[3], "Количество ОВ в создании поражающего фактора, т", bold=True)
 
     # Порядок С1..Сn, внутри номера — по оборудованию
-    rows_sorted = sorted(
-        rows,
-        key=lambda r: (
-            int(r.get("scenario_no")) if r.get("scenario_no") is not None else 10 ** 9,
-            str(r.get("equipment_name") or ""),
-        ),
-    )
+    rows_sorted = sorted(rows, key=scenario_order_key)
 
     for idx, r in enumerate(rows_sorted, start=1):
         row = table.add_row().cells
@@ -599,6 +651,7 @@ def render_ov_amount_table_at_marker(doc: Document, marker: str, title: str, row
         set_cell_text(row[3], format_float_3(r.get("ov_in_hazard_factor_t")))
 
     # пустой абзац после таблицы НЕ добавляем
+    return table
 
 
 def render_personnel_casualties_table_at_marker(doc: Document, marker: str, title: str, rows: list[dict]):
@@ -634,13 +687,7 @@ def render_personnel_casualties_table_at_marker(doc: Document, marker: str, titl
     set_cell_text(hdr[4], "Потерпевшие, чел.", bold=True)
 
     # Порядок: С1..Сn, внутри — по оборудованию (как делали в других таблицах)
-    rows_sorted = sorted(
-        rows,
-        key=lambda r: (
-            int(r.get("scenario_no")) if r.get("scenario_no") is not None else 10 ** 9,
-            str(r.get("equipment_name") or ""),
-        ),
-    )
+    rows_sorted = sorted(rows, key=scenario_order_key)
 
     for r in rows_sorted:
         eq_name = r.get("equipment_name") or "-"
@@ -669,6 +716,8 @@ def render_personnel_casualties_table_at_marker(doc: Document, marker: str, titl
         set_cell_text(row[3], inj_n if inj is not None else "-")
         set_cell_text(row[4], victims)
 
+    return table
+
 
 def _load_typical_scenarios() -> dict:
     """typical_scenarios.json не изменяем; читаем из data/typical_scenarios.json."""
@@ -764,13 +813,7 @@ def render_scenarios_table_at_marker(doc: Document, marker: str, title: str, row
     root = _get_scenarios_root(typical)
 
     # Порядок: С1..Сn, внутри — по оборудованию
-    rows_sorted = sorted(
-        rows,
-        key=lambda r: (
-            int(r.get("scenario_no")) if r.get("scenario_no") is not None else 10 ** 9,
-            str(r.get("equipment_name") or ""),
-        ),
-    )
+    rows_sorted = sorted(rows, key=scenario_order_key)
 
     for i, r in enumerate(rows_sorted, start=1):
         et = r.get("equipment_type")
@@ -792,7 +835,38 @@ def render_scenarios_table_at_marker(doc: Document, marker: str, title: str, row
         set_cell_text(row[4],
                       r.get("accident_event_probability") if r.get("accident_event_probability") is not None else "-")
         set_cell_text(row[5], format_exp(r.get("scenario_frequency")))
-        set_table_full_width(doc, table, cols=6)
+
+    # ширины задаём один раз после заполнения (а не на каждой строке)
+    set_table_full_width(doc, table, cols=6)
+
+    return table
+
+
+# (заголовок, ключ строки): шапка таблицы и колонки приложения (annex)
+IMPACT_ZONES_COLUMNS = [
+    ("Наименование оборудования", "equipment_name"),
+    ("Номер сценария", "scenario_no"),
+    ("q = 10,5", "q_10_5"),
+    ("q = 7,0", "q_7_0"),
+    ("q = 4,2", "q_4_2"),
+    ("q = 1,4", "q_1_4"),
+    ("ΔР = 70", "p_70"),
+    ("ΔР = 28", "p_28"),
+    ("ΔР = 14", "p_14"),
+    ("ΔР = 5", "p_5"),
+    ("ΔР = 2", "p_2"),
+    ("Lf", "l_f"),
+    ("Df", "d_f"),
+    ("Rнкпр", "r_nkpr"),
+    ("Rвсп", "r_vsp"),
+    ("Rlpt", "l_pt"),
+    ("Rppt", "p_pt"),
+    ("Q600", "q_600"),
+    ("Q320", "q_320"),
+    ("Q220", "q_220"),
+    ("Q120", "q_120"),
+    ("St", "s_t"),
+]
 
 
 def render_impact_zones_table(doc: Document, marker: str, rows: list[dict]):
@@ -811,30 +885,7 @@ def render_impact_zones_table(doc: Document, marker: str, rows: list[dict]):
     # Растянуть по ширине окна/страницы
     set_table_full_width(doc, table, cols=22, left_ratio=1 / 22)
 
-    headers = [
-        "Наименование оборудования",
-        "Номер сценария",
-        "q = 10,5",
-        "q = 7,0",
-        "q = 4,2",
-        "q = 1,4",
-        "ΔР = 70",
-        "ΔР = 28",
-        "ΔР = 14",
-        "ΔР = 5",
-        "ΔР = 2",
-        "Lf",
-        "Df",
-        "Rнкпр",
-        "Rвсп",
-        "Rlpt",
-        "Rppt",
-        "Q600",
-        "Q320",
-        "Q220",
-        "Q120",
-        "St",
-    ]
+    headers = [h for h, _ in IMPACT_ZONES_COLUMNS]
 
     for i, h in enumerate(headers):
         set_cell_text(table.rows[0].cells[i], h, bold=True)
@@ -870,6 +921,20 @@ def render_impact_zones_table(doc: Document, marker: str, rows: list[dict]):
 
         set_cell_text(row[21], fmt(r.get("s_t")))
 
+    return table
+
+
+DAMAGE_COLUMNS = [
+    ("Наименование оборудования", "equipment_name"),
+    ("Номер сценария", "scenario_no"),
+    ("Прямые потери, тыс.руб", "direct_losses"),
+    ("Затраты на ликвидацию, тыс.руб", "liquidation_costs"),
+    ("Социальные потери, тыс.руб", "social_losses"),
+    ("Косвенный ущерб, тыс.руб", "indirect_damage"),
+    ("Экологический ущерб, тыс.руб", "total_environmental_damage"),
+    ("Суммарный ущерб, тыс.руб", "total_damage"),
+]
+
 
 def render_damage_table_at_marker(doc, marker: str, rows: list[dict]):
     p_marker = find_paragraph_with_marker(doc, marker)
@@ -885,16 +950,7 @@ def render_damage_table_at_marker(doc, marker: str, rows: list[dict]):
     # растянуть по ширине окна/страницы
     set_table_full_width(doc, table, cols=8, left_ratio=1 / 8)
 
-    headers = [
-        "Наименование оборудования",
-        "Номер сценария",
-        "Прямые потери, тыс.руб",
-        "Затраты на ликвидацию, тыс.руб",
-        "Социальные потери, тыс.руб",
-        "Косвенный ущерб, тыс.руб",
-        "Экологический ущерб, тыс.руб",
-        "Суммарный ущерб, тыс.руб",
-    ]
+    headers = [h for h, _ in DAMAGE_COLUMNS]
     hdr = table.rows[0].cells
     for i, h in enumerate(headers):
         set_cell_text(hdr[i], h, bold=True)
@@ -913,6 +969,14 @@ def render_damage_table_at_marker(doc, marker: str, rows: list[dict]):
 
     # пустой абзац после таблицы НЕ добавляем
     # insert_paragraph_after_table(doc, table, "")
+    return table
+
+
+COLLECTIVE_RISK_COLUMNS = [
+    ("Составляющая ОПО", "hazard_component"),
+    ("Коллективный риск гибели, чел·год⁻¹", "collective_risk_fatalities"),
+    ("Коллективный риск ранения, чел·год⁻¹", "collective_risk_injured"),
+]
 
 
 def render_collective_risk_table(doc, marker: str, rows: list[dict]):
@@ -929,11 +993,7 @@ def render_collective_risk_table(doc, marker: str, rows: list[dict]):
     # растянуть по ширине окна/страницы
     set_table_full_width(doc, table, cols=3, left_ratio=1 / 3)
 
-    headers = [
-        "Составляющая ОПО",
-        "Коллективный риск гибели, чел·год⁻¹",
-        "Коллективный риск ранения, чел·год⁻¹",
-    ]
+    headers = [h for h, _ in COLLECTIVE_RISK_COLUMNS]
 
     for i, h in enumerate(headers):
         set_cell_text(table.rows[0].cells[i], h, bold=True)
@@ -944,6 +1004,15 @@ def render_collective_risk_table(doc, marker: str, rows: list[dict]):
         set_cell_text(row[1], format_exp(r.get("collective_risk_fatalities")))
         set_cell_text(row[2], format_exp(r.get("collective_risk_injured")))
 
+    return table
+
+
+INDIVIDUAL_RISK_COLUMNS = [
+    ("Составляющая ОПО", "hazard_component"),
+    ("Индивидуальный риск гибели, 1·год⁻¹", "individual_risk_fatalities"),
+    ("Индивидуальный риск ранения, 1·год⁻¹", "individual_risk_injured"),
+]
+
 
 def render_individual_risk_table(doc, marker: str, rows: list[dict]):
     p_marker = find_paragraph_with_marker(doc, marker)
@@ -959,11 +1028,7 @@ def render_individual_risk_table(doc, marker: str, rows: list[dict]):
     # растянуть по ширине окна/страницы
     set_table_full_width(doc, table, cols=3, left_ratio=1 / 3)
 
-    headers = [
-        "Составляющая ОПО",
-        "Индивидуальный риск гибели, 1·год⁻¹",
-        "Индивидуальный риск ранения, 1·год⁻¹",
-    ]
+    headers = [h for h, _ in INDIVIDUAL_RISK_COLUMNS]
 
     for i, h in enumerate(headers):
         set_cell_text(table.rows[0].cells[i], h, bold=True)
@@ -974,6 +1039,8 @@ def render_individual_risk_table(doc, marker: str, rows: list[dict]):
         set_cell_text(row[1], format_exp(r.get("individual_risk_fatalities")))
         set_cell_text(row[2], format_exp(r.get("individual_risk_injured")))
 
+    return table
+
 
 def render_fatal_accident_frequency_text(doc, marker: str, min_freq, max_freq):
     p_marker = find_paragraph_with_marker(doc, marker)
@@ -1030,10 +1097,6 @@ def render_max_damage_by_component_table(doc, marker: str, rows: list[dict]):
     # Пустой абзац после таблицы НЕ добавляем
 
 
-from docx.shared import Cm
-from pathlib import Path
-
-
 def render_chart_at_marker(
         doc: Document,
         marker: str,
@@ -1056,191 +1119,344 @@ def render_chart_at_marker(
         return
 
     # Картинку вставляем в этот же абзац
+    from docx.shared import Cm
+
     run = p_marker.add_run()
     run.add_picture(str(image_path), width=Cm(width_cm))
 
 
-def render_fn_chart_at_marker(doc: Document, marker: str, fn_rows: list[dict]):
-    points = build_fn_points(fn_rows)
-    if not points:
-        image_path = None
+def render_chart_stub_at_marker(doc: Document, marker: str):
+    """Черновой режим: вместо диаграммы — короткая текстовая заглушка на месте маркера."""
+    p_marker = find_paragraph_with_marker(doc, marker)
+    if p_marker is None:
+        return
+
+    clear_paragraph(p_marker)
+    p_marker.add_run("Диаграмма не построена (черновой режим).")
+
+
+def render_large_table(
+        doc: Document,
+        render_func,
+        *,
+        rows: list[dict],
+        draft: bool,
+        rows_arg: str = "rows",
+        streamer: StreamedTables | None = None,
+        order_key=None,
+        annex: tuple[str, list] | None = None,
+        summary_key: str | None = None,
+        out_path: Path | None = None,
+        **kwargs,
+):
+    """
+    Обёртка для крупных таблиц (строка на сценарий/оборудование).
+
+    В черновом режиме выводим только первые DRAFT_TABLE_MAX_ROWS строк,
+    а после таблицы пишем, сколько строк опущено.
+
+    Если передан streamer и строк не меньше STREAM_TABLE_MIN_ROWS — строки
+    пишутся потоково (см. docx_stream), не задерживаясь в DOM. order_key —
+    порядок строк, который render_func задаёт сортировкой: при потоковой
+    записи строки сортируются заранее, т.к. render_func видит только порцию.
+
+    annex = (имя, колонки) — если строк не меньше ANNEX_TABLE_MIN_ROWS, полная
+    таблица пишется в приложение (XLSX/CSV рядом с docx), а в документе
+    остаётся сводка: ANNEX_SUMMARY_ROWS строк с наибольшим summary_key
+    (или первые строки) и ссылка на файл приложения. Файл приложения кладётся
+    рядом с out_path — выходным docx (обязателен вместе с annex).
+    """
+    rows = rows or []
+    if annex is not None and annex_needed(rows, draft):
+        return render_table_with_annex(
+            doc, render_func, rows=rows, rows_arg=rows_arg, order_key=order_key,
+            annex=annex, summary_key=summary_key, out_path=out_path, **kwargs,
+        )
+    shown = rows[:DRAFT_TABLE_MAX_ROWS] if draft else rows
+
+    if streamer is not None and STREAM_TABLE_MIN_ROWS is not None and len(shown) >= STREAM_TABLE_MIN_ROWS:
+        if order_key is not None:
+            shown = sorted(shown, key=order_key)
+        table = streamer.render(doc, render_func, rows=shown, rows_arg=rows_arg, **kwargs)
     else:
-        charts_dir = OUT_PATH.parent / "charts"
-        charts_dir.mkdir(parents=True, exist_ok=True)
-        image_path = charts_dir / "fn.png"
-        save_fn_chart(points, image_path)
+        table = render_func(doc=doc, **{rows_arg: shown}, **kwargs)
 
-    render_chart_at_marker(
-        doc=doc,
-        marker=marker,
-        title="F/N - диаграмма",
-        image_path=image_path,
-        width_cm=16.0,
-    )
+    if table is not None and len(shown) < len(rows):
+        insert_paragraph_after_table(
+            doc, table,
+            f"Черновой режим: показано {len(shown)} из {len(rows)} строк.",
+        )
+    return table
 
 
-def render_fg_chart_at_marker(doc: Document, marker: str, fg_rows: list[dict]):
-    points = build_fg_points(fg_rows)
-    if not points:
-        image_path = None
+def annex_needed(rows, draft: bool) -> bool:
+    """Выносить ли таблицу в приложение (в черновом режиме таблицы и так усечены)."""
+    return not draft and ANNEX_TABLE_MIN_ROWS is not None and len(rows or ()) >= ANNEX_TABLE_MIN_ROWS
+
+
+def render_table_with_annex(
+        doc: Document,
+        render_func,
+        *,
+        rows: list[dict],
+        annex: tuple[str, list],
+        out_path: Path,
+        rows_arg: str = "rows",
+        order_key=None,
+        summary_key: str | None = None,
+        **kwargs,
+):
+    """
+    Полная таблица — в файл приложения, в документе — сводка и ссылка на файл.
+    Приложение пишется рядом с выходным docx: <out_path.stem>_<имя>.<ANNEX_FORMAT>.
+    """
+    if find_paragraph_with_marker(doc, kwargs["marker"]) is None:
+        return None
+
+    name, columns = annex
+    annex_path = Path(out_path).with_name(f"{Path(out_path).stem}_{name}.{ANNEX_FORMAT}")
+    ordered = sorted(rows, key=order_key) if order_key is not None else rows
+    n = write_annex(annex_path, columns, ordered, sheet=name)
+
+    if summary_key is not None:
+        top = heapq.nlargest(ANNEX_SUMMARY_ROWS, range(len(rows)), key=lambda i: rows[i].get(summary_key) or 0)
+        summary = [rows[i] for i in sorted(top)]
+        header = dict((k, h) for h, k in columns).get(summary_key, summary_key)
+        what = f"{len(summary)} из {n} строк с наибольшими значениями «{header}»"
     else:
-        charts_dir = OUT_PATH.parent / "charts"
-        charts_dir.mkdir(parents=True, exist_ok=True)
-        image_path = charts_dir / "fg.png"
-        save_fg_chart(points, image_path)
+        summary = rows[:ANNEX_SUMMARY_ROWS]
+        what = f"первые {len(summary)} из {n} строк"
+
+    table = render_func(doc=doc, **{rows_arg: summary}, **kwargs)
+    if table is not None:
+        insert_paragraph_after_table(
+            doc, table,
+            f"Приведены {what}. Полная таблица — в приложении «{annex_path.name}».",
+        )
+    print(f"Приложение: {annex_path.name} ({n} строк)")
+    return table
 
-    render_chart_at_marker(
-        doc=doc,
-        marker=marker,
-        title="F/G - диаграмма",
-        image_path=image_path,
-        width_cm=16.0,
-    )
 
+# ---------------------------
+# Диаграммы
+# ---------------------------
+# build_*_chart строят PNG в charts_dir и возвращают путь (или None, если данных нет).
+# Это обычные функции уровня модуля — их можно отдавать в пул процессов.
 
-def render_pareto_fatalities_chart_at_marker(doc: Document, marker: str, rows: list[dict]):
+def chart_dpi(image_path: Path) -> int:
+    """Разрешение диаграммы по имени её PNG (CHART_DPI), иначе CHART_DPI_DEFAULT."""
+    return CHART_DPI.get(Path(image_path).stem, CHART_DPI_DEFAULT)
+
+
+def build_fn_chart(fn_rows: list[dict], charts_dir: Path) -> Path | None:
+    points = build_fn_points(fn_rows)
+    if not points:
+        return None
+    image_path = charts_dir / "fn.png"
+    save_fn_chart(points, image_path, dpi=chart_dpi(image_path))
+    return image_path
+
+
+def build_fg_chart(fg_rows: list[dict], charts_dir: Path) -> Path | None:
+    points = build_fg_points(fg_rows, bin_mln=FG_DAMAGE_BIN_MLN)
+    if not points:
+        return None
+    image_path = charts_dir / "fg.png"
+    save_fg_chart(points, image_path, dpi=chart_dpi(image_path))
+    return image_path
+
+
+def build_pareto_fatalities_chart(pareto: dict, charts_dir: Path) -> Path | None:
     """Pareto по коллективному риску гибели (collective_risk_fatalities)"""
-    series = build_pareto_series(rows, "collective_risk_fatalities")
-    charts_dir = OUT_PATH.parent / "charts"
-    charts_dir.mkdir(parents=True, exist_ok=True)
-    img_path = charts_dir / "pareto_fatalities.png" if series else None
-    if series:
-        save_pareto_chart(
-            series,
-            img_path,
-            title="Pareto-диаграмма (вклад) сценариев по коллективному риску гибели",
-            ylabel="Коллективный риск гибели, чел·год⁻¹",
-        )
-    render_chart_at_marker(
-        doc=doc,
-        marker=marker,
-        title="Pareto сценариев по коллективному риску гибели",
-        image_path=img_path,
-        width_cm=16.0,
+    series = build_pareto_series(pareto["rows"], "collective_risk_fatalities", top_n=PARETO_TOP_N)
+    if not series:
+        return None
+    image_path = charts_dir / "pareto_fatalities.png"
+    save_pareto_chart(
+        series,
+        image_path,
+        title="Pareto-диаграмма (вклад) сценариев по коллективному риску гибели",
+        ylabel="Коллективный риск гибели, чел·год⁻¹",
+        total=pareto["total"],
+        top_n=PARETO_TOP_N,
+        dpi=chart_dpi(image_path),
     )
+    return image_path
 
 
-def render_pareto_injured_chart_at_marker(doc: Document, marker: str, rows: list[dict]):
+def build_pareto_injured_chart(pareto: dict, charts_dir: Path) -> Path | None:
     """Pareto по коллективному риску ранения (collective_risk_injured)"""
-    series = build_pareto_series(rows, "collective_risk_injured")
-    charts_dir = OUT_PATH.parent / "charts"
-    charts_dir.mkdir(parents=True, exist_ok=True)
-    img_path = charts_dir / "pareto_injured.png" if series else None
-    if series:
-        save_pareto_chart(
-            series,
-            img_path,
-            title="Pareto-диаграмма (вклад) сценариев по коллективному риску ранения",
-            ylabel="Коллективный риск ранения, чел·год⁻¹",
-        )
-    render_chart_at_marker(
-        doc=doc,
-        marker=marker,
-        title="Pareto сценариев по коллективному риску ранения",
-        image_path=img_path,
-        width_cm=16.0,
+    series = build_pareto_series(pareto["rows"], "collective_risk_injured", top_n=PARETO_TOP_N)
+    if not series:
+        return None
+    image_path = charts_dir / "pareto_injured.png"
+    save_pareto_chart(
+        series,
+        image_path,
+        title="Pareto-диаграмма (вклад) сценариев по коллективному риску ранения",
+        ylabel="Коллективный риск ранения, чел·год⁻¹",
+        total=pareto["total"],
+        top_n=PARETO_TOP_N,
+        dpi=chart_dpi(image_path),
     )
+    return image_path
 
 
-def render_pareto_damage_chart_at_marker(doc: Document, marker: str, rows: list[dict]):
+def build_pareto_damage_chart(pareto: dict, charts_dir: Path) -> Path | None:
     # собираем серии: подпись = "equipment / Сn", значение = total_damage
-    series = build_pareto_series(rows, value_key="total_damage")
-    image_path = None
-
-    if series:
-        charts_dir = OUT_PATH.parent / "charts"
-        charts_dir.mkdir(parents=True, exist_ok=True)
-        image_path = charts_dir / "pareto_damage.png"
-
-        save_pareto_chart(
-            series=series,
-            path=image_path,
-            title="Pareto-диаграмма (вклад) сценариев по суммарному ущербу",
-            ylabel="Суммарный ущерб, тыс.руб",
-        )
-
-    render_chart_at_marker(
-        doc=doc,
-        marker=marker,
-        title="Pareto сценариев по суммарному ущербу",
-        image_path=image_path,
-        width_cm=16.0,
+    series = build_pareto_series(pareto["rows"], value_key="total_damage", top_n=PARETO_TOP_N)
+    if not series:
+        return None
+    image_path = charts_dir / "pareto_damage.png"
+    save_pareto_chart(
+        series=series,
+        path=image_path,
+        title="Pareto-диаграмма (вклад) сценариев по суммарному ущербу",
+        ylabel="Суммарный ущерб, тыс.руб",
+        total=pareto["total"],
+        top_n=PARETO_TOP_N,
+        dpi=chart_dpi(image_path),
+    )
+    return image_path
+
+
+def build_pareto_environmental_damage_chart(pareto: dict, charts_dir: Path) -> Path | None:
+    series = build_pareto_series(pareto["rows"], value_key="total_environmental_damage", top_n=PARETO_TOP_N)
+    if not series:
+        return None
+    image_path = charts_dir / "pareto_environmental_damage.png"
+    save_pareto_chart(
+        series=series,
+        path=image_path,
+        title="Pareto-диаграмма (вклад) сценариев по экологическому ущербу",
+        ylabel="Экологический ущерб, тыс.руб",
+        total=pareto["total"],
+        top_n=PARETO_TOP_N,
+        dpi=chart_dpi(image_path),
     )
+    return image_path
 
 
-def render_pareto_environmental_damage_chart_at_marker(doc: Document, marker: str, rows: list[dict]):
-    series = build_pareto_series(rows, value_key="total_environmental_damage")
-    image_path = None
+def build_component_damage_chart(rows: list[dict], charts_dir: Path) -> Path | None:
+    if not rows:
+        return None
+    image_path = charts_dir / "damage_by_component.png"
+    save_component_damage_chart(rows, image_path, dpi=chart_dpi(image_path))
+    return image_path
 
-    if series:
-        charts_dir = OUT_PATH.parent / "charts"
-        charts_dir.mkdir(parents=True, exist_ok=True)
-        image_path = charts_dir / "pareto_environmental_damage.png"
 
-        save_pareto_chart(
-            series=series,
-            path=image_path,
-            title="Pareto-диаграмма (вклад) сценариев по экологическому ущербу",
-            ylabel="Экологический ущерб, тыс.руб",
-        )
+def build_risk_matrix_chart(rows: list[dict], charts_dir: Path) -> Path | None:
+    if not rows:
+        return None
+    image_path = charts_dir / "risk_matrix.png"
+    save_risk_matrix_chart(rows, image_path, lod_threshold=RISK_MATRIX_LOD_THRESHOLD, dpi=chart_dpi(image_path))
+    return image_path
 
-    render_chart_at_marker(
-        doc,
-        marker,
-        "Pareto сценариев по экологическому ущербу",
-        image_path,
-    )
 
+def build_risk_matrix_damage_chart(rows: list[dict], charts_dir: Path) -> Path | None:
+    if not rows:
+        return None
+    image_path = charts_dir / "risk_matrix_damage.png"
+    save_risk_matrix_chart_damage(rows, image_path, lod_threshold=RISK_MATRIX_LOD_THRESHOLD, dpi=chart_dpi(image_path))
+    return image_path
 
-def render_component_damage_chart_at_marker(doc: Document, marker: str, rows: list[dict]):
-    image_path = None
-    if rows:
-        charts_dir = OUT_PATH.parent / "charts"
-        charts_dir.mkdir(parents=True, exist_ok=True)
-        image_path = charts_dir / "damage_by_component.png"
-        save_component_damage_chart(rows, image_path)
 
-    render_chart_at_marker(
-        doc=doc,
-        marker=marker,
-        title="Распределение ущерба по составляющим ОПО",
-        image_path=image_path,
-        width_cm=16.0,
-    )
+# маркер -> (заголовок, функция построения PNG); порядок = порядок вставки в документ
+CHART_BUILDERS = {
+    "{{FN_CHART}}": ("F/N - диаграмма", build_fn_chart),
+    "{{FG_CHART}}": ("F/G - диаграмма", build_fg_chart),
+    "{{PARETO_DAMAGE_CHART}}": ("Pareto сценариев по суммарному ущербу", build_pareto_damage_chart),
+    "{{PARETO_FATALITIES_CHART}}": ("Pareto сценариев по коллективному риску гибели", build_pareto_fatalities_chart),
+    "{{PARETO_INJURED_CHART}}": ("Pareto сценариев по коллективному риску ранения", build_pareto_injured_chart),
+    "{{PARETO_ENV_DAMAGE_CHART}}": ("Pareto сценариев по экологическому ущербу", build_pareto_environmental_damage_chart),
+    "{{DAMAGE_BY_COMPONENT_CHART}}": ("Распределение ущерба по составляющим ОПО", build_component_damage_chart),
+    "{{RISK_MATRIX_CHART}}": ("Матрица риска (частота – последствия)", build_risk_matrix_chart),
+    "{{RISK_MATRIX_DAMAGE_CHART}}": ("Матрица риска (частота – ущерб)", build_risk_matrix_damage_chart),
+}
 
+CHART_MARKERS = tuple(CHART_BUILDERS)
 
-def render_risk_matrix_chart_at_marker(doc: Document, marker: str, rows: list[dict]):
-    image_path = None
-    if rows:
-        charts_dir = OUT_PATH.parent / "charts"
-        charts_dir.mkdir(parents=True, exist_ok=True)
-        image_path = charts_dir / "risk_matrix.png"
-        save_risk_matrix_chart(rows, image_path)
 
-    render_chart_at_marker(
-        doc=doc,
-        marker=marker,
-        title="Матрица риска (частота – последствия)",
-        image_path=image_path,
-        width_cm=16.0,
-    )
+def _chart_style_params() -> dict:
+    """Настройки, влияющие на вид диаграмм (входят в ключ кэша)."""
+    return {
+        "FG_DAMAGE_BIN_MLN": FG_DAMAGE_BIN_MLN,
+        "PARETO_TOP_N": PARETO_TOP_N,
+        "RISK_MATRIX_LOD_THRESHOLD": RISK_MATRIX_LOD_THRESHOLD,
+        "CHART_DPI_DEFAULT": CHART_DPI_DEFAULT,
+        "CHART_DPI": CHART_DPI,
+        "CHART_PNG_MODE": CHART_PNG_MODE,
+    }
 
 
-def render_risk_matrix_damage_chart_at_marker(doc: Document, marker: str, rows: list[dict]):
-    image_path = None
-    if rows:
-        charts_dir = OUT_PATH.parent / "charts"
-        charts_dir.mkdir(parents=True, exist_ok=True)
-        image_path = charts_dir / "risk_matrix_damage.png"
-        save_risk_matrix_chart_damage(rows, image_path)
+def _build_chart_cached(builder, data, charts_dir: Path, cache_dir: Path | None, key: str | None) -> Path | None:
+    """Строит диаграмму, сжимает PNG (CHART_PNG_MODE) и (если кэш включён) кладёт результат в кэш. Выполняется в пуле."""
+    image_path = builder(data, charts_dir)
+    if image_path is not None and CHART_PNG_MODE is not None:
+        before, after = optimize_png(image_path, mode=CHART_PNG_MODE)
+        print(f"PNG {Path(image_path).name}: {before / 1024:.0f} -> {after / 1024:.0f} КБ ({CHART_PNG_MODE})")
+    if cache_dir is not None:
+        chart_cache_put(cache_dir, key, image_path)
+    return image_path
 
-    render_chart_at_marker(
-        doc=doc,
-        marker=marker,
-        title="Матрица риска (частота – ущерб)",
-        image_path=image_path,
-        width_cm=16.0,
-    )
+
+def start_chart_rendering(
+        chart_data: dict,
+        charts_dir: Path,
+        executor: Executor | None = None,
+        *,
+        cache_dir: Path | None = None,
+) -> dict:
+    """
+    Запускает построение всех диаграмм.
+
+    chart_data: маркер -> исходные данные для build_*_chart.
+    С executor задачи уходят в пул и возвращаются Future (документ в это время
+    собирается в основном процессе); без executor PNG строятся сразу.
+    С cache_dir неизменившиеся диаграммы берутся из кэша (см. chart_cache).
+    """
+    charts_dir.mkdir(parents=True, exist_ok=True)
+    if cache_dir is not None:
+        evict_chart_cache(cache_dir, max_age_days=CHART_CACHE_MAX_AGE_DAYS, max_size_mb=CHART_CACHE_MAX_SIZE_MB)
+        params = _chart_style_params()
+
+    charts = {}
+    hits = 0
+    for marker, (_, builder) in CHART_BUILDERS.items():
+        data = chart_data.get(marker)
+        key = None
+        if cache_dir is not None:
+            key = chart_cache_key(builder, data, params)
+            hit, image_path = chart_cache_get(cache_dir, key, charts_dir)
+            print(f"Кэш диаграмм: {marker} — {'попадание' if hit else 'промах'}")
+            if hit:
+                hits += 1
+                charts[marker] = image_path
+                continue
+
+        if executor is None:
+            charts[marker] = _build_chart_cached(builder, data, charts_dir, cache_dir, key)
+        else:
+            charts[marker] = executor.submit(_build_chart_cached, builder, data, charts_dir, cache_dir, key)
+
+    if cache_dir is not None:
+        print(f"Кэш диаграмм: {hits} из {len(CHART_BUILDERS)} из кэша")
+    return charts
+
+
+def render_charts(doc: Document, charts: dict):
+    """Вставляет построенные диаграммы на места маркеров (Future дожидаемся здесь)."""
+    for marker, (title, _) in CHART_BUILDERS.items():
+        image_path = charts.get(marker)
+        if isinstance(image_path, Future):
+            image_path = image_path.result()
+        render_chart_at_marker(
+            doc=doc,
+            marker=marker,
+            title=title,
+            image_path=image_path,
+            width_cm=16.0,
+        )
 
 
 def render_top_scenarios_by_component_table(doc, marker: str, rows: list[dict]):
@@ -1711,7 +1927,7 @@ def render_top_scenarios_pf_by_component_table(doc: Document, marker: str, conn)
         eq_name = r.get("equipment_name")
 
         calc_row = get_calculation_row_for_top_scenario(conn, comp, sc_no, eq_name)
-        zones_txt = _format_pf_zones(calc_row)
+        zones_txt = _format_pf_zones(calc_row, get_weather_zones_for_top_scenario(conn, sc_no))
 
         row = table.add_row().cells
         set_cell_text(row[0], comp if comp is not None else "-")
@@ -1921,7 +2137,7 @@ def render_top_scenarios_final_conclusion_table(doc: Document, marker: str, conn
 
         # --- Поражающие факторы + методика ---
         calc_pf = get_calculation_row_for_top_scenario(conn, comp, sc_no, eq_name)
-        zones_txt = _format_pf_zones(calc_pf)
+        zones_txt = _format_pf_zones(calc_pf, get_weather_zones_for_top_scenario(conn, sc_no))
         method_txt = _detect_method_text(calc_pf)
 
         # --- OV in accident ---
@@ -2064,6 +2280,8 @@ def _clear_run_direct_formatting(run):
     """
     Убирает прямое форматирование run (w:rPr), чтобы текст наследовал стиль абзаца/документа.
     """
+    from docx.oxml.ns import qn
+
     r = run._r
     rPr = r.find(qn("w:rPr"))
     if rPr is not None:
@@ -2369,6 +2587,35 @@ def fill_headers_footers(doc, replacements):
         process_hf(section.even_page_footer)
 
 
+class _NoQueryCache:
+    """Кэш запросов выключен: просто выполняем get_*."""
+
+    @staticmethod
+    def get(func, conn, *args, **kwargs):
+        return func(conn, *args, **kwargs)
+
+    @staticmethod
+    def save():
+        pass
+
+
+# таблицы БД, которые читают render_* с conn (их отпечатки входят в ключ кэша разделов)
+DB_SECTION_TABLES = ("substances", "equipment", "calculations")
+
+
+def render_section(fragments: FragmentCache | None, render, /, *, db_tables=(), **kwargs):
+    """
+    Раздел отчёта на месте маркера: render(**kwargs) либо, если данные
+    раздела не менялись с прошлого запуска, готовый фрагмент из кэша разделов.
+    """
+    if fragments is None:
+        return render(**kwargs)
+    if kwargs.get("annex") is not None and annex_needed(kwargs.get("rows"), kwargs.get("draft", False)):
+        # файл приложения пишет сам render — при попадании в кэш его бы не было
+        return render(**kwargs)
+    return fragments.render(render, db_tables=db_tables, **kwargs)
+
+
 def fill_doc(
         doc: Document,
         *,
@@ -2388,14 +2635,11 @@ def fill_doc(
         top_scenarios_rows,
         fatality_risk_by_component_rows,
         conn,
-        fn_rows,
-        fg_rows,
-        pareto_rows,
-        pareto_damage_rows,
-        pareto_env_rows,
-        component_damage_rows,
-        risk_matrix_rows,
-        risk_matrix_damage_rows,
+        charts: dict | None = None,
+        draft: bool = False,
+        streamer: StreamedTables | None = None,
+        fragments: FragmentCache | None = None,
+        out_path: Path | None = None,
 ):
     # Текстовые данные
     org_root = load_organization_root()
@@ -2412,8 +2656,10 @@ def fill_doc(
     fill_headers_footers(doc, repl)
 
 
-    # Таблицы
-    render_substances_one_table_at_marker(
+    # Таблицы (каждый раздел — через кэш разделов, если он включён)
+    render_section(
+        fragments,
+        render_substances_one_table_at_marker,
         doc=doc,
         marker="{{SUBSTANCES_SECTION}}",
         items=substances,
@@ -2422,110 +2668,370 @@ def fill_doc(
         json_formatter=pretty_json_substance,
     )
 
-    render_substances_info_table_at_marker(
+    render_section(
+        fragments,
+        render_substances_info_table_at_marker,
+        db_tables=DB_SECTION_TABLES,
         doc=doc,
         marker="{{SUBSTANCES_INFO_SECTION}}",
         conn=conn,
     )
 
-    render_equipment_one_table_at_marker(
+    # Крупные таблицы (в черновом режиме усечены)
+    render_section(
+        fragments,
+        render_large_table,
         doc=doc,
+        render_func=render_equipment_one_table_at_marker,
+        rows=equipment,
+        draft=draft,
+        streamer=streamer,
+        rows_arg="items",
         marker="{{EQUIPMENT_SECTION}}",
-        items=equipment,
         item_title_field="equipment_name",
         sections=EQUIPMENT_SECTIONS,
         json_formatter=pretty_json_generic,
     )
 
-    render_distribution_table_at_marker(
+    render_section(
+        fragments,
+        render_large_table,
         doc=doc,
+        render_func=render_distribution_table_at_marker,
+        rows=distribution,
+        draft=draft,
+        streamer=streamer,
         marker="{{DISTRIBUTION_SECTION}}",
         title="Распределение опасного вещества по оборудованию",
-        rows=distribution,
         equipment_items=equipment,
     )
 
-    render_scenarios_table_at_marker(
+    render_section(
+        fragments,
+        render_large_table,
         doc=doc,
+        render_func=render_scenarios_table_at_marker,
+        rows=scenarios,
+        draft=draft,
+        streamer=streamer,
+        order_key=scenario_order_key,
         marker="{{SCENARIOS_SECTION}}",
         title="Сценарии аварий",
-        rows=scenarios,
     )
 
-    render_ov_amount_table_at_marker(
+    render_section(
+        fragments,
+        render_large_table,
         doc=doc,
+        render_func=render_ov_amount_table_at_marker,
+        rows=ov_amounts,
+        draft=draft,
+        streamer=streamer,
+        order_key=scenario_order_key,
         marker="{{OV_AMOUNT_SECTION}}",
         title="Оценка количества опасного вещества в аварии",
-        rows=ov_amounts,
     )
 
-    render_impact_zones_table(doc, "{{IMPACT_ZONES_SECTION}}", impact_zones)
+    render_section(
+        fragments,
+        render_large_table,
+        doc=doc,
+        render_func=render_impact_zones_table,
+        rows=impact_zones,
+        draft=draft,
+        streamer=streamer,
+        annex=("impact_zones", IMPACT_ZONES_COLUMNS),
+        out_path=out_path,
+        marker="{{IMPACT_ZONES_SECTION}}",
+    )
 
-    render_personnel_casualties_table_at_marker(
+    render_section(
+        fragments,
+        render_large_table,
         doc=doc,
+        render_func=render_personnel_casualties_table_at_marker,
+        rows=casualties,
+        draft=draft,
+        streamer=streamer,
+        order_key=scenario_order_key,
         marker="{{CASUALTIES_SECTION}}",
         title="Оценка количества погибших/пострадавших",
-        rows=casualties,
     )
 
-    render_damage_table_at_marker(doc=doc, marker="{{DAMAGE_SECTION}}", rows=damage_rows)
+    render_section(
+        fragments,
+        render_large_table,
+        doc=doc,
+        render_func=render_damage_table_at_marker,
+        rows=damage_rows,
+        draft=draft,
+        streamer=streamer,
+        annex=("damage", DAMAGE_COLUMNS),
+        out_path=out_path,
+        summary_key="total_damage",
+        marker="{{DAMAGE_SECTION}}",
+    )
 
-    render_collective_risk_table(doc=doc, marker="{{COLLECTIVE_RISK_SECTION}}", rows=collective_risk_rows)
-    render_individual_risk_table(doc=doc, marker="{{INDIVIDUAL_RISK_SECTION}}", rows=individual_risk_rows)
+    render_section(
+        fragments,
+        render_large_table,
+        doc=doc,
+        render_func=render_collective_risk_table,
+        rows=collective_risk_rows,
+        draft=draft,
+        streamer=streamer,
+        annex=("collective_risk", COLLECTIVE_RISK_COLUMNS),
+        out_path=out_path,
+        summary_key="collective_risk_fatalities",
+        marker="{{COLLECTIVE_RISK_SECTION}}",
+    )
 
-    render_fatal_accident_frequency_text(
+    render_section(
+        fragments,
+        render_large_table,
+        doc=doc,
+        render_func=render_individual_risk_table,
+        rows=individual_risk_rows,
+        draft=draft,
+        streamer=streamer,
+        annex=("individual_risk", INDIVIDUAL_RISK_COLUMNS),
+        out_path=out_path,
+        summary_key="individual_risk_fatalities",
+        marker="{{INDIVIDUAL_RISK_SECTION}}",
+    )
+
+    render_section(
+        fragments,
+        render_fatal_accident_frequency_text,
         doc=doc,
         marker="{{FATAL_ACCIDENT_FREQUENCY}}",
         min_freq=min_f,
         max_freq=max_f,
     )
 
-    render_max_damage_by_component_table(doc=doc, marker="{{MAX_DAMAGE_BY_COMPONENT_SECTION}}", rows=max_damage_rows)
+    render_section(fragments, render_max_damage_by_component_table,
+                   doc=doc, marker="{{MAX_DAMAGE_BY_COMPONENT_SECTION}}", rows=max_damage_rows)
 
-    render_top_scenarios_by_component_table(
+    render_section(
+        fragments,
+        render_top_scenarios_by_component_table,
         doc=doc,
         marker="{{TOP_SCENARIOS_BY_COMPONENT_SECTION}}",
         rows=top_scenarios_rows,
     )
 
-    render_fatality_risk_by_component_table(
+    render_section(
+        fragments,
+        render_fatality_risk_by_component_table,
         doc=doc,
         marker="{{FATALITY_RISK_BY_COMPONENT_SECTION}}",
         rows=fatality_risk_by_component_rows,
     )
 
-    render_comparative_fatality_risk_table(
+    render_section(
+        fragments,
+        render_comparative_fatality_risk_table,
         doc=doc,
         marker="{{COMPARATIVE_FATALITY_RISK_TABLE}}",
         individual_risk_rows=individual_risk_rows,
     )
 
-    # Эти функции используют conn
-    render_ngk_background_comparison_table(doc=doc, marker="{{NGK_BACKGROUND_RISK_COMPARISON}}", conn=conn)
-    render_substances_by_component_table(doc=doc, marker="{{SUBSTANCES_BY_COMPONENT_TABLE}}", conn=conn)
+    # Эти функции используют conn: в ключ раздела идут отпечатки таблиц БД
+    for marker, render_func in (
+            ("{{NGK_BACKGROUND_RISK_COMPARISON}}", render_ngk_background_comparison_table),
+            ("{{SUBSTANCES_BY_COMPONENT_TABLE}}", render_substances_by_component_table),
+            ("{{TOP_SCENARIOS_DESC_BY_COMPONENT}}", render_top_scenarios_description_by_component_table),
+            ("{{TOP_SCENARIOS_PF_BY_COMPONENT}}", render_top_scenarios_pf_by_component_table),
+            ("{{TOP_SCENARIOS_FATALITIES_INJURED}}", render_top_scenarios_fatalities_injured_by_component_table),
+            ("{{TOP_SCENARIOS_DAMAGE}}", render_top_scenarios_damage_by_component_table),
+            ("{{TOP_SCENARIOS_FINAL_CONCLUSION}}", render_top_scenarios_final_conclusion_table),
+    ):
+        render_section(fragments, render_func, db_tables=DB_SECTION_TABLES, doc=doc, marker=marker, conn=conn)
+
+    # Черновой режим: диаграммы не строим, оставляем заглушки
+    if draft:
+        for marker in CHART_MARKERS:
+            render_chart_stub_at_marker(doc, marker)
+        return
+
+    # Диаграммы: PNG строятся в start_chart_rendering (пул процессов), здесь только вставка
+    render_charts(doc, charts or {})
+
+
+def collect_report_data(conn) -> tuple[dict, dict]:
+    """
+    Все выборки для отчёта (при неизменной БД — из снимка кэша запросов).
+
+    Возвращает (doc_data, chart_data):
+      doc_data   — именованные аргументы fill_doc с данными;
+      chart_data — маркер диаграммы -> исходные данные для build_*_chart.
+    """
+    qc = QueryCache(REPORT_QUERY_CACHE_DIR, DB_PATH) if QUERY_CACHE_ENABLED else _NoQueryCache()
+    substances = qc.get(get_all_substances, conn)
+    equipment = qc.get(get_used_equipment, conn)
+    distribution = qc.get(get_hazard_distribution, conn)
+    scenarios = qc.get(get_scenarios, conn)
+    ov_amounts = qc.get(get_ov_amounts_in_accident, conn)
+    impact_zones = qc.get(get_impact_zones, conn)
+    casualties = qc.get(get_personnel_casualties, conn)
+    damage_rows = qc.get(get_damage, conn)
+    collective_risk_rows = qc.get(get_collective_risk, conn)
+    individual_risk_rows = qc.get(get_individual_risk, conn)
+    min_f, max_f = qc.get(get_fatal_accident_frequency_range, conn)
+    max_damage_rows = qc.get(get_max_damage_by_hazard_component, conn)
+    fn_rows = qc.get(get_fn_source_rows, conn)
+    fg_rows = qc.get(get_fg_source_rows, conn)
+    # Pareto: Top-N + сумма по всем сценариям считаются в SQL
+    pareto_fatalities = qc.get(get_pareto_top_rows, conn, "collective_risk_fatalities", PARETO_TOP_N)
+    pareto_injured = qc.get(get_pareto_top_rows, conn, "collective_risk_injured", PARETO_TOP_N)
+    pareto_damage = qc.get(get_pareto_top_rows, conn, "total_damage", PARETO_TOP_N)
+    pareto_env = qc.get(get_pareto_top_rows, conn, "total_environmental_damage", PARETO_TOP_N, positive_only=True)
+    component_damage_rows = qc.get(get_max_losses_by_hazard_component, conn)
+    risk_matrix_rows = qc.get(get_risk_matrix_rows, conn)
+    risk_matrix_damage_rows = qc.get(get_risk_matrix_damage_rows, conn)
+    top_scenarios_rows = qc.get(get_top_scenarios_by_hazard_component, conn)
+    qc.save()
+
+    # Сводная таблица рисков гибели по составляющим
+    ind_map = {r.get("hazard_component"): r.get("individual_risk_fatalities") for r in individual_risk_rows}
+    coll_map = {r.get("hazard_component"): r.get("collective_risk_fatalities") for r in collective_risk_rows}
+
+    # ВАЖНО: без сортировок. Берём порядок как в исходных выборках из БД (первое появление).
+    components = []
+    seen = set()
+    for src in (individual_risk_rows, collective_risk_rows):
+        for rr in src:
+            comp = rr.get("hazard_component")
+            if comp is None or comp in seen:
+                continue
+            seen.add(comp)
+            components.append(comp)
+
+    fatality_risk_by_component_rows = [
+        {
+            "hazard_component": comp,
+            "individual_risk_fatalities": ind_map.get(comp),
+            "collective_risk_fatalities": coll_map.get(comp),
+        }
+        for comp in components
+    ]
+
+    doc_data = dict(
+        substances=substances,
+        equipment=equipment,
+        distribution=distribution,
+        scenarios=scenarios,
+        ov_amounts=ov_amounts,
+        impact_zones=impact_zones,
+        casualties=casualties,
+        damage_rows=damage_rows,
+        collective_risk_rows=collective_risk_rows,
+        individual_risk_rows=individual_risk_rows,
+        min_f=min_f,
+        max_f=max_f,
+        max_damage_rows=max_damage_rows,
+        top_scenarios_rows=top_scenarios_rows,
+        fatality_risk_by_component_rows=fatality_risk_by_component_rows,
+    )
+
+    # диаграммы одинаковы для всех шаблонов
+    chart_data = {
+        "{{FN_CHART}}": fn_rows,
+        "{{FG_CHART}}": fg_rows,
+        "{{PARETO_DAMAGE_CHART}}": pareto_damage,
+        "{{PARETO_FATALITIES_CHART}}": pareto_fatalities,
+        "{{PARETO_INJURED_CHART}}": pareto_injured,
+        "{{PARETO_ENV_DAMAGE_CHART}}": pareto_env,
+        "{{DAMAGE_BY_COMPONENT_CHART}}": component_damage_rows,
+        "{{RISK_MATRIX_CHART}}": risk_matrix_rows,
+        "{{RISK_MATRIX_DAMAGE_CHART}}": risk_matrix_damage_rows,
+    }
+    return doc_data, chart_data
+
+
+def build_report_document(
+        template_path: Path,
+        *,
+        doc_data: dict,
+        conn,
+        charts: dict,
+        draft: bool,
+        doc=None,
+) -> Path:
+    """
+    Заполняет один шаблон и сохраняет результат. Возвращает путь к docx.
+    doc — уже открытый шаблон (если его прочитали заранее), иначе читается здесь.
+    """
+    suffix = "_draft" if draft else "_out"
+    out_path = REPORT_OUTPUT_DIR / f"{template_path.stem}{suffix}.docx"
+    if doc is None:
+        from docx import Document
+
+        doc = Document(str(template_path))
+    streamer = (
+        StreamedTables(template_path, chunk_cells=STREAM_TABLE_CHUNK_CELLS)
+        if STREAM_LARGE_TABLES else None
+    )
+    fragments = (
+        FragmentCache(
+            REPORT_FRAGMENT_CACHE_DIR,
+            template_path,
+            db_fingerprint=db_fingerprint(DB_PATH, REPORT_QUERY_CACHE_DIR),
+            input_files=(TYPICAL_SCENARIOS_PATH,),
+        )
+        if FRAGMENT_CACHE_ENABLED else None
+    )
 
-    render_top_scenarios_description_by_component_table(doc=doc, marker="{{TOP_SCENARIOS_DESC_BY_COMPONENT}}",
-                                                        conn=conn)
-    render_top_scenarios_pf_by_component_table(doc=doc, marker="{{TOP_SCENARIOS_PF_BY_COMPONENT}}", conn=conn)
-    render_top_scenarios_fatalities_injured_by_component_table(
-        doc=doc, marker="{{TOP_SCENARIOS_FATALITIES_INJURED}}", conn=conn
+    fill_doc(
+        doc,
+        **doc_data,
+        conn=conn,
+        charts=charts,
+        draft=draft,
+        streamer=streamer,
+        fragments=fragments,
+        out_path=out_path,
     )
-    render_top_scenarios_damage_by_component_table(doc=doc, marker="{{TOP_SCENARIOS_DAMAGE}}", conn=conn)
-    render_top_scenarios_final_conclusion_table(doc=doc, marker="{{TOP_SCENARIOS_FINAL_CONCLUSION}}", conn=conn)
-
-    # Диаграммы (используют OUT_PATH.parent/"charts")
-    render_fn_chart_at_marker(doc, "{{FN_CHART}}", fn_rows)
-    render_fg_chart_at_marker(doc, "{{FG_CHART}}", fg_rows)
-    render_pareto_damage_chart_at_marker(doc, "{{PARETO_DAMAGE_CHART}}", pareto_damage_rows)
-    render_pareto_fatalities_chart_at_marker(doc, "{{PARETO_FATALITIES_CHART}}", pareto_rows)
-    render_pareto_injured_chart_at_marker(doc, "{{PARETO_INJURED_CHART}}", pareto_rows)
-    render_pareto_environmental_damage_chart_at_marker(doc, "{{PARETO_ENV_DAMAGE_CHART}}", pareto_env_rows)
-    render_component_damage_chart_at_marker(doc, "{{DAMAGE_BY_COMPONENT_CHART}}", component_damage_rows)
-    render_risk_matrix_chart_at_marker(doc, "{{RISK_MATRIX_CHART}}", risk_matrix_rows)
-    render_risk_matrix_damage_chart_at_marker(doc, "{{RISK_MATRIX_DAMAGE_CHART}}", risk_matrix_damage_rows)
-
-
-def main():
+    if fragments is not None:
+        fragments.report()
+
+    t0 = time.perf_counter()
+    if streamer is not None:
+        streamer.save(doc, out_path)
+    else:
+        doc.save(str(out_path))
+    save_s = time.perf_counter() - t0
+    print("Отчёт сформирован:", out_path)
+    print(f"  сохранение: {save_s:.2f} с, размер {out_path.stat().st_size / 1024 / 1024:.1f} МБ")
+    return out_path
+
+
+def evict_report_caches():
+    """Вытеснение устаревших записей кэша разделов (кэш диаграмм чистится при построении)."""
+    if FRAGMENT_CACHE_ENABLED:
+        evict_fragment_cache(
+            REPORT_FRAGMENT_CACHE_DIR,
+            max_age_days=CHART_CACHE_MAX_AGE_DAYS,
+            max_size_mb=CHART_CACHE_MAX_SIZE_MB,
+        )
+
+
+def main(draft: bool = REPORT_DRAFT_MODE):
+    """
+    Формирует отчёты по всем шаблонам варианта.
+
+    draft=True — черновой режим: плейсхолдеры и небольшие таблицы как обычно,
+    крупные таблицы усечены до DRAFT_TABLE_MAX_ROWS строк, диаграммы не строятся.
+    Файлы сохраняются с суффиксом _draft, чтобы их не спутать с чистовыми.
+
+    При REPORT_ASYNC_PIPELINE сборка идёт через report/report_pipeline.py
+    (те же шаги, но с перекрытием чтения БД, шаблонов, диаграмм и сборки docx).
+    """
+    if REPORT_ASYNC_PIPELINE:
+        from report.report_pipeline import run_report_pipeline
+        run_report_pipeline(draft)
+        return
+
     REPORT_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
     # 1) очищаем output от старых .docx
@@ -2539,88 +3045,23 @@ def main():
 
     with open_db(DB_PATH) as conn:
         # 3) собираем данные ОДИН РАЗ
-        substances = get_all_substances(conn)
-        equipment = get_used_equipment(conn)
-        distribution = get_hazard_distribution(conn)
-        scenarios = get_scenarios(conn)
-        ov_amounts = get_ov_amounts_in_accident(conn)
-        impact_zones = get_impact_zones(conn)
-        casualties = get_personnel_casualties(conn)
-        damage_rows = get_damage(conn)
-        collective_risk_rows = get_collective_risk(conn)
-        individual_risk_rows = get_individual_risk(conn)
-        min_f, max_f = get_fatal_accident_frequency_range(conn)
-        max_damage_rows = get_max_damage_by_hazard_component(conn)
-        fn_rows = get_fn_source_rows(conn)
-        fg_rows = get_fg_source_rows(conn)
-        pareto_rows = get_pareto_risk_source_rows(conn)
-        pareto_damage_rows = get_pareto_damage_source_rows(conn)
-        pareto_env_rows = get_pareto_environmental_damage_source_rows(conn)
-        component_damage_rows = get_max_losses_by_hazard_component(conn)
-        risk_matrix_rows = get_risk_matrix_rows(conn)
-        risk_matrix_damage_rows = get_risk_matrix_damage_rows(conn)
-        top_scenarios_rows = get_top_scenarios_by_hazard_component(conn)
-
-        # Сводная таблица рисков гибели по составляющим
-        ind_map = {r.get("hazard_component"): r.get("individual_risk_fatalities") for r in individual_risk_rows}
-        coll_map = {r.get("hazard_component"): r.get("collective_risk_fatalities") for r in collective_risk_rows}
-
-        # ВАЖНО: без сортировок. Берём порядок как в исходных выборках из БД (первое появление).
-        components = []
-        seen = set()
-        for src in (individual_risk_rows, collective_risk_rows):
-            for rr in src:
-                comp = rr.get("hazard_component")
-                if comp is None or comp in seen:
-                    continue
-                seen.add(comp)
-                components.append(comp)
-
-        fatality_risk_by_component_rows = [
-            {
-                "hazard_component": comp,
-                "individual_risk_fatalities": ind_map.get(comp),
-                "collective_risk_fatalities": coll_map.get(comp),
-            }
-            for comp in components
-        ]
-
-        # 4) генерим все документы
-        global OUT_PATH
-        for template_path in templates:
-            OUT_PATH = REPORT_OUTPUT_DIR / f"{template_path.stem}_out.docx"
-            doc = Document(str(template_path))
-
-            fill_doc(
-                doc,
-                substances=substances,
-                equipment=equipment,
-                distribution=distribution,
-                scenarios=scenarios,
-                ov_amounts=ov_amounts,
-                impact_zones=impact_zones,
-                casualties=casualties,
-                damage_rows=damage_rows,
-                collective_risk_rows=collective_risk_rows,
-                individual_risk_rows=individual_risk_rows,
-                min_f=min_f,
-                max_f=max_f,
-                max_damage_rows=max_damage_rows,
-                top_scenarios_rows=top_scenarios_rows,
-                fatality_risk_by_component_rows=fatality_risk_by_component_rows,
-                conn=conn,
-                fn_rows=fn_rows,
-                fg_rows=fg_rows,
-                pareto_rows=pareto_rows,
-                pareto_damage_rows=pareto_damage_rows,
-                pareto_env_rows=pareto_env_rows,
-                component_damage_rows=component_damage_rows,
-                risk_matrix_rows=risk_matrix_rows,
-                risk_matrix_damage_rows=risk_matrix_damage_rows,
-            )
-
-            doc.save(str(OUT_PATH))
-            print("Отчёт сформирован:", OUT_PATH)
+        doc_data, chart_data = collect_report_data(conn)
+        evict_report_caches()
+
+        # 4) диаграммы строим один раз, параллельно со сборкой документов
+        #    (в черновом режиме не строим вовсе)
+        cache_dir = REPORT_CHART_CACHE_DIR if CHART_CACHE_ENABLED else None
+        workers = min(REPORT_CHART_WORKERS, os.cpu_count() or 1, len(chart_data))
+        executor = ProcessPoolExecutor(max_workers=workers) if not draft and workers > 1 else None
+        try:
+            charts = {} if draft else start_chart_rendering(chart_data, REPORT_CHARTS_DIR, executor, cache_dir=cache_dir)
+
+            # 5) генерим все документы
+            for template_path in templates:
+                build_report_document(template_path, doc_data=doc_data, conn=conn, charts=charts, draft=draft)
+        finally:
+            if executor is not None:
+                executor.shutdown()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,158 @@
+"""
+Быстрый предпросмотр отчёта в HTML (без python-docx).
+
+Берёт те же выборки, что fill_word.main (collect_report_data, при неизменной
+БД — из снимка кэша запросов), и пишет одну статичную страницу
+REPORT_OUTPUT_DIR/preview.html: все таблицы данных и диаграммы (PNG из
+REPORT_CHARTS_DIR, построенные через кэш диаграмм).
+
+Это не копия документа: шаблоны Word, плейсхолдеры и разделы, которые
+render_* достраивают запросами к БД (сравнение с фоновым риском, описания
+топ-сценариев и т.п.), здесь не выводятся — страница нужна, чтобы сверить
+числа до сборки docx.
+
+Запуск: python -m report.html_preview
+"""
+from __future__ import annotations
+
+import html
+import math
+import os
+import time
+from pathlib import Path
+
+from core.config import CHART_CACHE_ENABLED
+from core.path import DB_PATH, REPORT_CHART_CACHE_DIR, REPORT_CHARTS_DIR, REPORT_OUTPUT_DIR
+from report.fill_word import (
+    CHART_BUILDERS,
+    COLLECTIVE_RISK_COLUMNS,
+    DAMAGE_COLUMNS,
+    IMPACT_ZONES_COLUMNS,
+    INDIVIDUAL_RISK_COLUMNS,
+    collect_report_data,
+    start_chart_rendering,
+)
+from report.reportgen.db import open_db
+
+PREVIEW_PATH = REPORT_OUTPUT_DIR / "preview.html"
+
+# ключ doc_data -> (заголовок, колонки [(заголовок, ключ)] или None — все поля строки)
+PREVIEW_TABLES = {
+    "substances": ("Опасные вещества", None),
+    "equipment": ("Оборудование", None),
+    "distribution": ("Распределение опасного вещества по оборудованию", None),
+    "scenarios": ("Сценарии аварий", None),
+    "ov_amounts": ("Количество опасного вещества в аварии", None),
+    "impact_zones": ("Зоны действия поражающих факторов", IMPACT_ZONES_COLUMNS),
+    "casualties": ("Погибшие/пострадавшие", None),
+    "damage_rows": ("Ущерб", DAMAGE_COLUMNS),
+    "collective_risk_rows": ("Коллективный риск", COLLECTIVE_RISK_COLUMNS),
+    "individual_risk_rows": ("Индивидуальный риск", INDIVIDUAL_RISK_COLUMNS),
+    "max_damage_rows": ("Максимальный ущерб по составляющим", None),
+    "top_scenarios_rows": ("Наиболее опасные сценарии по составляющим", None),
+    "fatality_risk_by_component_rows": ("Риск гибели по составляющим", None),
+}
+
+_CSS = """
+body { font-family: sans-serif; font-size: 13px; margin: 16px; }
+nav a { margin-right: 12px; }
+table { border-collapse: collapse; margin: 8px 0 24px; }
+th, td { border: 1px solid #bbb; padding: 2px 6px; }
+th { background: #eee; position: sticky; top: 0; }
+td.num { text-align: right; font-variant-numeric: tabular-nums; }
+img { max-width: 100%; border: 1px solid #ddd; margin: 8px 0 24px; }
+"""
+
+
+def _cell(value) -> tuple[str, bool]:
+    """(текст ячейки, число ли)."""
+    if value is None:
+        return "-", False
+    if isinstance(value, bool):
+        return str(value), False
+    if isinstance(value, int):
+        return str(value), True
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            return str(value), True
+        return f"{value:.4g}", True
+    return str(value), False
+
+
+def _columns_of(rows: list[dict]) -> list[tuple[str, str]]:
+    # *_json дублируют разобранные поля (substances) — в предпросмотре не нужны
+    return [(k, k) for k in rows[0] if not k.endswith("_json")]
+
+
+def _write_table(f, anchor: str, title: str, rows: list[dict], columns) -> None:
+    f.write(f'<h2 id="{anchor}">{html.escape(title)} <small>({len(rows)} строк)</small></h2>\n')
+    if not rows:
+        f.write("<p>Нет данных.</p>\n")
+        return
+    columns = columns or _columns_of(rows)
+    f.write("<table><thead><tr>")
+    f.write("".join(f"<th>{html.escape(h)}</th>" for h, _ in columns))
+    f.write("</tr></thead><tbody>\n")
+    keys = [k for _, k in columns]
+    for r in rows:
+        cells = []
+        for k in keys:
+            text, is_num = _cell(r.get(k))
+            cls = ' class="num"' if is_num else ""
+            cells.append(f"<td{cls}>{html.escape(text)}</td>")
+        f.write("<tr>" + "".join(cells) + "</tr>\n")
+    f.write("</tbody></table>\n")
+
+
+def write_preview(path: Path, doc_data: dict, charts: dict) -> Path:
+    """Пишет страницу предпросмотра. charts: маркер -> путь PNG (или None)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<!DOCTYPE html>\n<html lang="ru"><head><meta charset="utf-8">')
+        f.write(f"<title>Предпросмотр отчёта</title><style>{_CSS}</style></head><body>\n")
+        f.write(f"<h1>Предпросмотр отчёта</h1>\n<p>{time.strftime('%Y-%m-%d %H:%M:%S')}</p>\n<nav>")
+        f.write("".join(f'<a href="#{k}">{html.escape(t)}</a>' for k, (t, _) in PREVIEW_TABLES.items()))
+        if charts:
+            f.write('<a href="#charts">Диаграммы</a>')
+        f.write("</nav>\n")
+
+        f.write(
+            "<h2>Частота аварий с гибелью людей</h2>\n"
+            f"<p>от {_cell(doc_data.get('min_f'))[0]} до {_cell(doc_data.get('max_f'))[0]} 1/год</p>\n"
+        )
+        for key, (title, columns) in PREVIEW_TABLES.items():
+            _write_table(f, key, title, doc_data.get(key) or [], columns)
+
+        if charts:
+            f.write('<h2 id="charts">Диаграммы</h2>\n')
+            for marker, (title, _) in CHART_BUILDERS.items():
+                image_path = charts.get(marker)
+                f.write(f"<h3>{html.escape(title)}</h3>\n")
+                if image_path is None or not Path(image_path).exists():
+                    f.write("<p>Данные для построения диаграммы отсутствуют.</p>\n")
+                    continue
+                src = Path(os.path.relpath(image_path, path.parent)).as_posix()
+                f.write(f'<img src="{html.escape(src)}" alt="{html.escape(title)}">\n')
+
+        f.write("</body></html>\n")
+    return path
+
+
+def main(with_charts: bool = True) -> Path:
+    """Собирает выборки (и диаграммы) и пишет preview.html. Возвращает путь к странице."""
+    t0 = time.perf_counter()
+    with open_db(DB_PATH) as conn:
+        doc_data, chart_data = collect_report_data(conn)
+
+    charts = {}
+    if with_charts:
+        cache_dir = REPORT_CHART_CACHE_DIR if CHART_CACHE_ENABLED else None
+        charts = start_chart_rendering(chart_data, REPORT_CHARTS_DIR, cache_dir=cache_dir)
+
+    path = write_preview(PREVIEW_PATH, doc_data, charts)
+    print(f"Предпросмотр: {path} ({time.perf_counter() - t0:.1f} с)")
+    return path
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Асинхронная сборка отчёта (граф задач на asyncio).
+
+Те же шаги, что в fill_word.main, но независимые шаги перекрываются:
+
+  db               — выборки из БД (поток "db": в нём же живёт соединение SQLite)
+  template:<имя>   — чтение шаблона docx (пул потоков), параллельно с db
+  charts           — постановка диаграмм в пул процессов (после db)
+  chart:<маркер>   — готовность одной диаграммы (после charts)
+  doc:<имя>        — заполнение и сохранение документа (после db и template:<имя>);
+                     тоже в потоке "db": разделы читают БД через conn,
+                     документы собираются по мере готовности шаблонов
+
+Каждая задача ждёт только свои зависимости; по завершении печатается
+таблица таймингов (момент готовности зависимостей от начала сборки
+и длительность, включая ожидание свободного потока/процесса).
+
+Запуск: python -m report.report_pipeline (или fill_word.main при REPORT_ASYNC_PIPELINE)
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import os
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Awaitable, Callable
+
+from docx import Document
+
+from core.config import REPORT_DRAFT_MODE, CHART_CACHE_ENABLED, REPORT_CHART_WORKERS, REPORT_IO_THREADS
+from core.path import DB_PATH, REPORT_CHART_CACHE_DIR, REPORT_CHARTS_DIR, REPORT_OUTPUT_DIR
+from report.fill_word import (
+    CHART_MARKERS,
+    TEMPLATE_DIR,
+    build_report_document,
+    clear_output_docx,
+    collect_report_data,
+    evict_report_caches,
+    iter_variant_templates,
+    start_chart_rendering,
+)
+from report.reportgen.db import open_db
+
+
+class TaskGraph:
+    """
+    Задачи с явными зависимостями.
+
+    graph.add("b", func, deps=("a",))   # func(results) -> awaitable, results: имя -> результат
+    results = asyncio.run(graph.run())
+    """
+
+    def __init__(self):
+        self.tasks: dict[str, tuple[Callable[[dict], Awaitable], tuple]] = {}
+        self.timings: dict[str, tuple[float, float]] = {}
+
+    def add(self, name: str, func: Callable[[dict], Awaitable], *, deps=()):
+        if name in self.tasks:
+            raise ValueError(f"Задача {name} уже добавлена")
+        self.tasks[name] = (func, tuple(deps))
+
+    async def run(self) -> dict:
+        for name, (_, deps) in self.tasks.items():
+            missing = [d for d in deps if d not in self.tasks]
+            if missing:
+                raise ValueError(f"Задача {name}: неизвестные зависимости {missing}")
+
+        t0 = time.perf_counter()
+        running: dict[str, asyncio.Task] = {}
+
+        async def run_one(name: str):
+            func, deps = self.tasks[name]
+            results = {d: await running[d] for d in deps}
+            start = time.perf_counter()
+            try:
+                return await func(results)
+            finally:
+                self.timings[name] = (start - t0, time.perf_counter() - start)
+
+        # задачи стартуют только на первом await, когда словарь уже заполнен
+        for name in self.tasks:
+            running[name] = asyncio.create_task(run_one(name), name=name)
+        values = await asyncio.gather(*running.values())
+        return dict(zip(running, values))
+
+    def report(self) -> None:
+        print("Тайминги сборки отчёта (готовность зависимостей, длительность с ожиданием исполнителя, с):")
+        for name, (start, duration) in sorted(self.timings.items(), key=lambda kv: kv[1][0]):
+            deps = ", ".join(self.tasks[name][1])
+            print(f"  {start:7.2f} {duration:7.2f}  {name}" + (f"  <- {deps}" if deps else ""))
+
+
+async def _in_executor(executor: Executor, func, *args, **kwargs):
+    return await asyncio.get_running_loop().run_in_executor(executor, functools.partial(func, *args, **kwargs))
+
+
+def build_report_graph(
+        templates,
+        *,
+        draft: bool,
+        db_thread: Executor,
+        io_threads: Executor,
+        chart_executor: Executor | None,
+        state: dict,
+) -> TaskGraph:
+    """Граф задач сборки всех шаблонов. state["conn"] — соединение, открытое в потоке db."""
+    graph = TaskGraph()
+
+    def collect():
+        state["conn"] = open_db(DB_PATH)
+        data = collect_report_data(state["conn"])
+        evict_report_caches()
+        return data
+
+    graph.add("db", lambda r: _in_executor(db_thread, collect))
+
+    for template_path in templates:
+        graph.add(
+            f"template:{template_path.stem}",
+            lambda r, p=template_path: _in_executor(io_threads, Document, str(p)),
+        )
+
+    # в черновом режиме диаграммы не строятся
+    if not draft:
+        cache_dir = REPORT_CHART_CACHE_DIR if CHART_CACHE_ENABLED else None
+        graph.add(
+            "charts",
+            lambda r: _in_executor(
+                io_threads, start_chart_rendering,
+                r["db"][1], REPORT_CHARTS_DIR, chart_executor, cache_dir=cache_dir,
+            ),
+            deps=("db",),
+        )
+
+        async def wait_chart(r, marker):
+            image = r["charts"].get(marker)
+            if isinstance(image, Future):
+                image = await asyncio.wrap_future(image)
+            return image
+
+        for marker in CHART_MARKERS:
+            graph.add(f"chart:{marker.strip('{}')}", functools.partial(wait_chart, marker=marker), deps=("charts",))
+
+    for template_path in templates:
+        name = f"template:{template_path.stem}"
+        deps = ("db", name) + (() if draft else ("charts",))
+
+        def build(r, p=template_path, name=name):
+            # Future диаграмм дожидаемся в render_charts, в самом конце документа
+            return _in_executor(
+                db_thread, build_report_document, p,
+                doc_data=r["db"][0], conn=state["conn"], charts=r.get("charts", {}),
+                draft=draft, doc=r[name],
+            )
+
+        graph.add(f"doc:{template_path.stem}", build, deps=deps)
+
+    return graph
+
+
+def run_report_pipeline(draft: bool = REPORT_DRAFT_MODE) -> dict:
+    """Формирует отчёты по всем шаблонам варианта. Возвращает тайминги задач."""
+    REPORT_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    clear_output_docx(REPORT_OUTPUT_DIR)
+    templates = iter_variant_templates(TEMPLATE_DIR)
+
+    db_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="report-db")
+    io_threads = ThreadPoolExecutor(max_workers=REPORT_IO_THREADS, thread_name_prefix="report-io")
+    workers = min(REPORT_CHART_WORKERS, os.cpu_count() or 1)
+    if draft:
+        chart_executor = None
+    elif workers > 1:
+        chart_executor = ProcessPoolExecutor(max_workers=workers)
+    else:
+        # один процессор: диаграммы в отдельном потоке (pyplot — только из одного потока)
+        chart_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="report-charts")
+
+    state: dict = {}
+    graph = build_report_graph(
+        templates,
+        draft=draft,
+        db_thread=db_thread,
+        io_threads=io_threads,
+        chart_executor=chart_executor,
+        state=state,
+    )
+    try:
+        asyncio.run(graph.run())
+    finally:
+        if state.get("conn") is not None:
+            # соединение SQLite закрываем в том же потоке, где оно открыто
+            db_thread.submit(state["conn"].close).result()
+        for executor in (db_thread, io_threads, chart_executor):
+            if executor is not None:
+                executor.shutdown()
+        graph.report()
+    return graph.timings
+
+
+if __name__ == "__main__":
+    run_report_pipeline()
@@ -0,0 +1,152 @@
+"""
+Приложения к отчёту: крупные таблицы в отдельном файле XLSX/CSV.
+
+Строки пишутся потоком (память не зависит от числа строк):
+  - CSV — модулем csv (utf-8 с BOM и ';' — так файл открывается в Excel);
+  - XLSX — минимальная книга из одного листа, лист пишется прямо в zip
+    (как word/document.xml в docx_stream), строки — inline-строки и числа,
+    без общей таблицы строк.
+"""
+from __future__ import annotations
+
+import csv
+import math
+import re
+import zipfile
+from pathlib import Path
+from typing import Iterable, Sequence
+from xml.sax.saxutils import escape
+
+ANNEX_FORMATS = ("xlsx", "csv")
+
+# символы, недопустимые в XML 1.0
+_XML_ILLEGAL_RE = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{sheet}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    '</Relationships>'
+)
+
+# стиль 1 — полужирный (шапка)
+_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/></cellXfs>'
+    '</styleSheet>'
+)
+
+_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<sheetViews><sheetView workbookViewId="0">'
+    '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+    '</sheetView></sheetViews>'
+    '<sheetData>'
+)
+_SHEET_TAIL = '</sheetData></worksheet>'
+
+
+def _xlsx_cell(value, style: int = 0) -> str:
+    s = f' s="{style}"' if style else ""
+    if value is None:
+        return f"<c{s}/>"
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+        return f"<c{s}><v>{value!r}</v></c>"
+    text = escape(_XML_ILLEGAL_RE.sub("", str(value)))
+    return f'<c{s} t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def write_xlsx(path: Path, headers: Sequence[str], rows: Iterable[Sequence], *, sheet: str = "Лист1") -> int:
+    """Пишет XLSX потоком. Возвращает число строк данных."""
+    n = 0
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as z:
+        z.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        z.writestr("_rels/.rels", _ROOT_RELS)
+        z.writestr("xl/workbook.xml", _WORKBOOK.format(sheet=escape(sheet[:31], {'"': "&quot;"})))
+        z.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+        z.writestr("xl/styles.xml", _STYLES)
+        with z.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as f:
+            f.write(_SHEET_HEAD.encode("utf-8"))
+            f.write(("<row>" + "".join(_xlsx_cell(h, 1) for h in headers) + "</row>").encode("utf-8"))
+            for row in rows:
+                f.write(("<row>" + "".join(_xlsx_cell(v) for v in row) + "</row>").encode("utf-8"))
+                n += 1
+            f.write(_SHEET_TAIL.encode("utf-8"))
+    return n
+
+
+def write_csv(path: Path, headers: Sequence[str], rows: Iterable[Sequence]) -> int:
+    """Пишет CSV потоком. Возвращает число строк данных."""
+    n = 0
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        w = csv.writer(f, delimiter=";")
+        w.writerow(headers)
+        for row in rows:
+            w.writerow(["" if v is None else v for v in row])
+            n += 1
+    return n
+
+
+def write_annex(path: Path, columns: Sequence[tuple[str, str]], rows: Iterable[dict], *, sheet: str = "Лист1") -> int:
+    """
+    Приложение по описанию колонок [(заголовок, ключ строки), ...].
+    Формат — по расширению path (.xlsx или .csv). Возвращает число строк.
+    """
+    path = Path(path)
+    kind = path.suffix.lstrip(".").lower()
+    if kind not in ANNEX_FORMATS:
+        raise ValueError(f"Неизвестный формат приложения: {path.suffix!r} (ожидается один из {ANNEX_FORMATS})")
+
+    headers = [h for h, _ in columns]
+    keys = [k for _, k in columns]
+    values = ([r.get(k) for k in keys] for r in rows)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if kind == "xlsx":
+        return write_xlsx(path, headers, values, sheet=sheet)
+    return write_csv(path, headers, values)
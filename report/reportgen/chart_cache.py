@@ -0,0 +1,158 @@
+"""
+Кэш диаграмм между запусками отчёта.
+
+Ключ записи — sha256 от типа диаграммы, её входных данных и параметров
+оформления (настройки из config + исходный код построения). Если данные
+не менялись (обычно правится только текст шаблона), PNG берётся из кэша
+и не перерисовывается.
+
+Запись в кэше:
+    <key>.png   — картинка (нет файла, если данных для диаграммы не было)
+    <key>.json  — {"name": "<имя файла в charts_dir>" | null}
+"""
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+# исходник читаем как файл: импорт charts тянет matplotlib
+_CHARTS_SOURCE = Path(__file__).resolve().parent / "charts.py"
+
+# меняем при несовместимом изменении формата записей
+CHART_CACHE_VERSION = 1
+
+_CHARTS_SOURCE_HASH: str | None = None
+
+
+def _charts_source_hash() -> str:
+    """Хэш исходника charts.py: правка оформления диаграмм сбрасывает кэш."""
+    global _CHARTS_SOURCE_HASH
+    if _CHARTS_SOURCE_HASH is None:
+        src = _CHARTS_SOURCE.read_bytes()
+        _CHARTS_SOURCE_HASH = hashlib.sha256(src).hexdigest()
+    return _CHARTS_SOURCE_HASH
+
+
+def chart_cache_key(builder: Callable, data: Any, params: dict) -> str:
+    """Ключ диаграммы: функция построения + данные + параметры оформления."""
+    try:
+        builder_src = inspect.getsource(builder)
+    except (OSError, TypeError):
+        builder_src = ""
+
+    payload = json.dumps(
+        {
+            "version": CHART_CACHE_VERSION,
+            "builder": f"{builder.__module__}.{builder.__qualname__}",
+            "builder_src": builder_src,
+            "charts_src": _charts_source_hash(),
+            "params": params,
+            "data": data,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def chart_cache_get(cache_dir: Path, key: str, dest_dir: Path) -> tuple[bool, Path | None]:
+    """
+    Достаёт диаграмму из кэша и копирует PNG в dest_dir.
+
+    Возвращает (hit, image_path); image_path=None — в кэше записано,
+    что данных для диаграммы нет.
+    """
+    meta_path = cache_dir / f"{key}.json"
+    if not meta_path.exists():
+        return False, None
+
+    try:
+        name = json.loads(meta_path.read_text(encoding="utf-8")).get("name")
+    except (OSError, ValueError):
+        return False, None
+
+    now = time.time()
+    os.utime(meta_path, (now, now))  # для вытеснения по возрасту: запись "свежая"
+
+    if name is None:
+        return True, None
+
+    png_path = cache_dir / f"{key}.png"
+    if not png_path.exists():
+        return False, None
+
+    os.utime(png_path, (now, now))
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    image_path = dest_dir / name
+    shutil.copyfile(png_path, image_path)
+    return True, image_path
+
+
+def chart_cache_put(cache_dir: Path, key: str, image_path: Path | None) -> None:
+    """Кладёт построенную диаграмму в кэш (None — данных для диаграммы нет)."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    if image_path is not None:
+        # сначала во временный файл: параллельные процессы не увидят недописанный PNG
+        tmp = cache_dir / f"{key}.png.tmp{os.getpid()}"
+        shutil.copyfile(image_path, tmp)
+        os.replace(tmp, cache_dir / f"{key}.png")
+
+    name = Path(image_path).name if image_path is not None else None
+    (cache_dir / f"{key}.json").write_text(json.dumps({"name": name}, ensure_ascii=False), encoding="utf-8")
+
+
+def evict_chart_cache(cache_dir: Path, *, max_age_days: float | None = None, max_size_mb: float | None = None) -> int:
+    """
+    Вытесняет записи старше max_age_days, затем самые старые — пока
+    суммарный размер не станет меньше max_size_mb. Возвращает число удалённых записей.
+    """
+    if not cache_dir.exists():
+        return 0
+
+    # запись = все файлы с одинаковым ключом (имя до первой точки)
+    entries: dict[str, list[Path]] = {}
+    for p in cache_dir.iterdir():
+        if p.is_file():
+            entries.setdefault(p.name.split(".", 1)[0], []).append(p)
+
+    def _mtime(files: list[Path]) -> float:
+        return max(f.stat().st_mtime for f in files)
+
+    def _size(files: list[Path]) -> int:
+        return sum(f.stat().st_size for f in files)
+
+    # от старых к новым
+    ordered = sorted(entries.items(), key=lambda kv: _mtime(kv[1]))
+    removed = 0
+
+    if max_age_days is not None:
+        cutoff = time.time() - max_age_days * 86400
+        keep = []
+        for key, files in ordered:
+            if _mtime(files) < cutoff:
+                for f in files:
+                    f.unlink(missing_ok=True)
+                removed += 1
+            else:
+                keep.append((key, files))
+        ordered = keep
+
+    if max_size_mb is not None:
+        limit = max_size_mb * 1024 * 1024
+        total = sum(_size(files) for _, files in ordered)
+        for key, files in ordered:
+            if total <= limit:
+                break
+            total -= _size(files)
+            for f in files:
+                f.unlink(missing_ok=True)
+            removed += 1
+
+    return removed
@@ -13,20 +13,33 @@ FN / FG диаграммы (ступенчатые):
 
 from __future__ import annotations
 
+import heapq
 from pathlib import Path
-from typing import List, Tuple, Dict, Any
+from typing import TYPE_CHECKING, List, Tuple, Dict, Any
 
-import matplotlib
+from core.config import RISK_MATRIX_LOD_THRESHOLD
 
-matplotlib.use("Agg")  # ВАЖНО: без GUI/backends
-
-import matplotlib.pyplot as plt
-import numpy as np
-from matplotlib.ticker import MultipleLocator, MaxNLocator
+# numpy, как и matplotlib, импортируется в функциях: charts импортирует fill_word,
+# а массивы нужны только при построении кривых и диаграмм
+if TYPE_CHECKING:
+    import numpy as np
 
 Point = Tuple[float, float]
 
 
+def _pyplot():
+    """
+    matplotlib импортируется при первом построении диаграммы, а не при импорте
+    модуля: импорт pyplot занимает ~1 с, а кривые/серии (build_*) без него обходятся.
+    """
+    import matplotlib
+
+    matplotlib.use("Agg")  # ВАЖНО: без GUI/backends
+
+    import matplotlib.pyplot as plt
+    return plt
+
+
 def _safe_float(x) -> float | None:
     try:
         if x is None:
@@ -37,48 +50,94 @@ def _safe_float(x) -> float | None:
 
 
 # ---------------------------
-# F/N
+# Кривые превышения (общий движок F/N и F/G)
 # ---------------------------
 
-def build_fn_points(rows: List[Dict[str, Any]]) -> List[Point]:
+def exceedance_curve(values, freqs) -> Tuple[np.ndarray, np.ndarray]:
     """
-    rows: dict with keys:
-      - fatalities_count
-      - scenario_frequency
-    Возвращает точки (N, F(N)), где F(N)=Σfreq(fatalities>=N).
+    Кривая превышения F(x) = Σfreq(value >= x) для всех различных x.
+
+    Сортировка (np.unique) + обратная накопленная сумма — O(n log n),
+    вместо суммирования хвоста для каждого x (O(n²)).
+
+    :param values: значения последствий (N, G, ...)
+    :param freqs: частоты сценариев, 1/год
+    :return: (x, F) — x по возрастанию
     """
-    freq_by_n: Dict[int, float] = {}
+    import numpy as np
+
+    values = np.asarray(values, dtype=float)
+    freqs = np.asarray(freqs, dtype=float)
+    if values.size == 0:
+        return np.empty(0), np.empty(0)
+
+    x, inverse = np.unique(values, return_inverse=True)
+    f_by_x = np.bincount(inverse, weights=freqs, minlength=x.size)
+    f_cum = np.cumsum(f_by_x[::-1])[::-1]
+    return x, f_cum
 
+
+def _rows_to_arrays(rows: List[Dict[str, Any]], x_key: str, x_conv) -> Tuple[np.ndarray, np.ndarray]:
+    """Достаёт из строк пары (x, scenario_frequency), пропуская пустые/нечисловые."""
+    import numpy as np
+
+    xs: List[float] = []
+    fs: List[float] = []
     for r in rows:
-        n_raw = r.get("fatalities_count")
-        f_raw = r.get("scenario_frequency")
-        f = _safe_float(f_raw)
-        if n_raw is None or f is None:
+        x_raw = r.get(x_key)
+        f = _safe_float(r.get("scenario_frequency"))
+        if x_raw is None or f is None:
             continue
         try:
-            n = int(n_raw)
+            x = x_conv(x_raw)
         except Exception:
             continue
-        freq_by_n[n] = freq_by_n.get(n, 0.0) + f
+        xs.append(x)
+        fs.append(f)
+    return np.asarray(xs, dtype=float), np.asarray(fs, dtype=float)
+
+
+def _finish_curve(x: np.ndarray, f: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Старт с x=0 как F(0)=F(x_min) и отбрасывание F<=0 (на лог шкале нельзя)."""
+    import numpy as np
+
+    if x.size and x[0] > 0:
+        x = np.concatenate(([0.0], x))
+        f = np.concatenate(([f[0]], f))
+    mask = f > 0
+    return x[mask], f[mask]
 
-    if not freq_by_n:
-        return []
 
-    points: List[Point] = []
-    for n in sorted(freq_by_n.keys()):
-        f_sum = sum(v for k, v in freq_by_n.items() if k >= n)
-        points.append((float(n), float(f_sum)))
+def _to_points(x: np.ndarray, f: np.ndarray) -> List[Point]:
+    return list(zip(x.tolist(), f.tolist()))
 
-    # Часто нужно начинать с N=0 как F(0)=F(1) (визуально как в примере)
-    if points and points[0][0] > 0:
-        points = [(0.0, points[0][1])] + points
 
-    # убираем нулевые/отрицательные частоты (на лог шкале нельзя)
-    points = [(x, y) for x, y in points if y > 0]
-    return points
+# ---------------------------
+# F/N
+# ---------------------------
+
+def fn_curve(rows: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    rows: dict with keys:
+      - fatalities_count
+      - scenario_frequency
+    Возвращает массивы (N, F(N)), где F(N)=Σfreq(fatalities>=N).
+    """
+    n, f = _rows_to_arrays(rows, "fatalities_count", int)
+    return _finish_curve(*exceedance_curve(n, f))
+
+
+def build_fn_points(rows: List[Dict[str, Any]]) -> List[Point]:
+    """
+    rows: dict with keys:
+      - fatalities_count
+      - scenario_frequency
+    Возвращает точки (N, F(N)), где F(N)=Σfreq(fatalities>=N).
+    """
+    return _to_points(*fn_curve(rows))
 
 
-def save_fn_chart(points: List[Point], path: Path) -> None:
+def save_fn_chart(points: List[Point], path: Path, *, dpi: int = 200) -> None:
     if not points:
         return
 
@@ -106,6 +165,9 @@ def save_fn_chart(points: List[Point], path: Path) -> None:
         chart_dot_line_y.extend([probability[idx], probability[idx + 1]])
 
     # --- Отрисовка графика ---
+    plt = _pyplot()
+    from matplotlib.ticker import MultipleLocator, MaxNLocator
+
     fig, ax = plt.subplots()
 
     ax.semilogy(chart_line_x, chart_line_y, color='b', linestyle='-', marker='.')
@@ -128,7 +190,7 @@ def save_fn_chart(points: List[Point], path: Path) -> None:
 
     path = Path(path)
     path.parent.mkdir(parents=True, exist_ok=True)
-    fig.savefig(path, dpi=200, bbox_inches="tight")
+    fig.savefig(path, dpi=dpi, bbox_inches="tight")
     plt.close(fig)
 
 
@@ -136,50 +198,49 @@ def save_fn_chart(points: List[Point], path: Path) -> None:
 # F/G
 # ---------------------------
 
-def build_fg_points(rows: List[Dict[str, Any]]) -> List[Point]:
+def fg_curve(rows: List[Dict[str, Any]], bin_mln: float | None = None) -> Tuple[np.ndarray, np.ndarray]:
     """
     rows: dict with keys:
       - total_damage (тыс. руб)
       - scenario_frequency
-    Возвращает точки (G, F(G)), где:
+    Возвращает массивы (G, F(G)), где:
       G = ущерб в млн руб,
       F(G)=Σfreq(total_damage>=G).
+
+    :param bin_mln: ширина интервала группировки ущерба, млн руб.
+        None — без группировки (каждое значение — своя ступень).
+        Значения округляются вниз до границы интервала, поэтому
+        F на границах интервалов остаётся точной.
     """
-    freq_by_g: Dict[float, float] = {}
+    import numpy as np
 
-    for r in rows:
-        g_raw = r.get("total_damage")
-        f_raw = r.get("scenario_frequency")
-        g = _safe_float(g_raw)
-        f = _safe_float(f_raw)
-        if g is None or f is None:
-            continue
+    g, f = _rows_to_arrays(rows, "total_damage", float)
 
-        # тыс.руб -> млн.руб
-        g_mln = g / 1000.0
+    # тыс.руб -> млн.руб
+    g = g / 1000.0
 
-        # Упорядочивание/слияние близких значений (чтобы не было "дрожания" из-за float)
-        g_key = round(g_mln, 6)
-        freq_by_g[g_key] = freq_by_g.get(g_key, 0.0) + f
+    if bin_mln:
+        g = np.floor(g / bin_mln) * bin_mln
 
-    if not freq_by_g:
-        return []
+    # Упорядочивание/слияние близких значений (чтобы не было "дрожания" из-за float)
+    g = np.round(g, 6)
 
-    points: List[Point] = []
-    g_sorted = sorted(freq_by_g.keys())
-    for g in g_sorted:
-        f_sum = sum(v for k, v in freq_by_g.items() if k >= g)
-        points.append((float(g), float(f_sum)))
+    return _finish_curve(*exceedance_curve(g, f))
 
-    # старт с G=0 как F(0)=F(minG)
-    if points and points[0][0] > 0:
-        points = [(0.0, points[0][1])] + points
 
-    points = [(x, y) for x, y in points if y > 0]
-    return points
+def build_fg_points(rows: List[Dict[str, Any]], bin_mln: float | None = None) -> List[Point]:
+    """
+    rows: dict with keys:
+      - total_damage (тыс. руб)
+      - scenario_frequency
+    Возвращает точки (G, F(G)), где:
+      G = ущерб в млн руб,
+      F(G)=Σfreq(total_damage>=G).
+    """
+    return _to_points(*fg_curve(rows, bin_mln=bin_mln))
 
 
-def save_fg_chart(points: List[Point], path: Path) -> None:
+def save_fg_chart(points: List[Point], path: Path, *, dpi: int = 200) -> None:
     """
     Строит и сохраняет F/G диаграмму.
 
@@ -231,6 +292,8 @@ def save_fg_chart(points: List[Point], path: Path) -> None:
         chart_dot_line_y.extend([probability[idx], probability[idx + 1]])
 
     # Отрисовка графика
+    plt = _pyplot()
+
     fig = plt.figure()
     plt.semilogy(chart_line_x, chart_line_y, color='r', linestyle='-', marker='.')
     plt.semilogy(chart_dot_line_x, chart_dot_line_y, color='r', linestyle='--', marker='.')
@@ -241,7 +304,7 @@ def save_fg_chart(points: List[Point], path: Path) -> None:
 
     path = Path(path)
     path.parent.mkdir(parents=True, exist_ok=True)
-    fig.savefig(path, dpi=200, bbox_inches="tight")
+    fig.savefig(path, dpi=dpi, bbox_inches="tight")
     plt.close(fig)
 
 
@@ -282,10 +345,11 @@ if __name__ == '__main__':
 # Pareto (сценарии по риску)
 # ---------------------------
 
-def build_pareto_series(rows, value_key):
+def build_pareto_series(rows, value_key, top_n: int | None = None):
     """
     rows: list of dicts
     value_key: ключ значения (например 'collective_risk_fatalities' или 'total_damage')
+    top_n: если задано — вернуть только Top-N (частичный отбор через кучу, без полной сортировки)
     label формируется как '<equipment_name> / С<scenario_no>'
     """
     series = []
@@ -298,34 +362,35 @@ def build_pareto_series(rows, value_key):
         label = f"{r.get('equipment_name', '')} / С{r.get('scenario_no')}"
         series.append((label, float(val)))
 
-    # сортировка по убыванию вклада
+    # по убыванию вклада
+    if top_n is not None:
+        return heapq.nlargest(top_n, series, key=lambda x: x[1])
+
     series.sort(key=lambda x: x[1], reverse=True)
     return series
 
-def save_pareto_chart(series, path: Path, title: str, ylabel: str):
+
+def save_pareto_chart(series, path: Path, title: str, ylabel: str, *, total: float | None = None,
+                      top_n: int = 20, dpi: int = 200):
+    """
+    series: list of (label, value) — все сценарии или уже отобранный Top-N
+    total: сумма по ВСЕМ сценариям (например, из SQL-агрегата).
+           None — считаем по series (тогда series должен содержать все сценарии).
+    Рисуем Top-N столбцов; "Прочие" не рисуем, но учитываем в total.
+    """
     if not series:
         return
 
-    # series уже отсортирован по убыванию (build_pareto_series)
-    series_full = list(series)  # ВСЕ сценарии (для корректного total)
-
-    # --- ограничиваем Top-20 + ("Прочие", сумма хвоста) ---
-    series_top = limit_pareto_series(series_full, top_n=20)
+    # total должен быть по всем сценариям, включая "прочие"
+    if total is None:
+        total = sum(float(v) for _, v in series)
 
-    # --- "Прочие" НЕ рисуем столбцом, но учитываем в total ---
-    other_value = 0.0
-    if series_top and str(series_top[-1][0]).strip().lower() in ("прочие", "прочее"):
-        other_value = float(series_top[-1][1])
-        series_draw = series_top[:-1]
-    else:
-        series_draw = series_top
+    # --- Top-N без полной сортировки ---
+    series_draw = heapq.nlargest(top_n, series, key=lambda x: x[1])
 
     labels = [s[0] for s in series_draw]
     values = [float(s[1]) for s in series_draw]
 
-    # total должен быть по всем сценариям, включая "прочие"
-    total = sum(float(v) for _, v in series_full)
-
     # накопленная доля считаем по показанным столбцам, но делим на общий total
     cum_values = []
     s = 0.0
@@ -335,6 +400,8 @@ def save_pareto_chart(series, path: Path, title: str, ylabel: str):
 
     x = range(len(values))
 
+    plt = _pyplot()
+
     fig, ax = plt.subplots(figsize=(12, 6))
     ax.bar(x, values)
     ax.set_ylabel(ylabel)
@@ -366,27 +433,33 @@ def save_pareto_chart(series, path: Path, title: str, ylabel: str):
     ax.grid(True, axis="y")
 
 
-    plt.savefig(path, dpi=200, bbox_inches="tight")
+    plt.savefig(path, dpi=dpi, bbox_inches="tight")
     plt.close()
 
-def limit_pareto_series(series, top_n=20):
+def limit_pareto_series(series, top_n=20, total: float | None = None):
     """
-    series: list of (label, value), отсортированный по убыванию value
-    Возвращает Top-N + ('Прочие', сумма остальных)
+    series: list of (label, value) в любом порядке
+    total: сумма по всем сценариям (если series — уже Top-N); None — сумма по series
+    Возвращает Top-N (по убыванию) + ('Прочие', сумма остальных)
     """
-    if not series or len(series) <= top_n:
+    if not series:
         return series
 
-    head = series[:top_n]
-    tail = series[top_n:]
-    other_sum = sum(v for _, v in tail)
+    head = heapq.nlargest(top_n, series, key=lambda x: x[1])
+    if total is None:
+        if len(series) <= top_n:
+            return head
+        total = sum(v for _, v in series)
+
+    other_sum = total - sum(v for _, v in head)
 
-    if other_sum > 0:
+    # total - sum(head) может дать "шум" порядка eps, если хвоста нет
+    if other_sum > 1e-12 * abs(total):
         head.append(("Прочие", other_sum))
     return head
 
 
-def save_component_damage_chart(rows: list[dict], path: Path):
+def save_component_damage_chart(rows: list[dict], path: Path, *, dpi: int = 300):
     import textwrap
     """
     Понятный график ущерба по составляющим ОПО:
@@ -444,6 +517,8 @@ def save_component_damage_chart(rows: list[dict], path: Path):
     n = len(labels)
     # высота фигуры масштабируется от числа строк
     fig_h = max(4.5, 0.55 * n)
+    plt = _pyplot()
+
     plt.figure(figsize=(14, fig_h))
 
     # Две полосы на категорию (рядом)
@@ -468,11 +543,98 @@ def save_component_damage_chart(rows: list[dict], path: Path):
     ax.legend()
 
     plt.tight_layout()
-    plt.savefig(path, dpi=300, bbox_inches="tight")
+    plt.savefig(path, dpi=dpi, bbox_inches="tight")
     plt.close()
 
 
-def save_risk_matrix_chart(rows, path: Path, title: str = "Матрица риска (частота – последствия)"):
+# ---------------------------
+# Матрицы риска
+# ---------------------------
+
+RISK_MATRIX_LABELS_TOP = 5
+
+# фиксированные смещения подписей (чередуются)
+_RISK_MATRIX_LABEL_OFFSETS = [
+    (4, 3),
+    (4, -10),
+    (12, 6),
+    (12, -14),
+]
+
+
+def _risk_matrix_points(rows, x_key: str, x_conv) -> list[tuple]:
+    """Точки (x, freq, scenario_no); x_conv возвращает None для точек вне матрицы."""
+    pts = []
+    for r in rows:
+        try:
+            x = x_conv(r.get(x_key))
+            y = float(r.get("scenario_frequency"))
+        except Exception:
+            continue
+        if x is None or y <= 0:
+            continue
+        pts.append((x, y, r.get("scenario_no")))
+    return pts
+
+
+def _risk_matrix_sizes(ys: np.ndarray) -> np.ndarray:
+    """Размер точки ~ частоте (лог-шкала): 25..85."""
+    import numpy as np
+
+    log_y = np.log10(ys)
+    y_min, y_max = log_y.min(), log_y.max()
+    denom = (y_max - y_min) if y_max > y_min else 1.0
+    t = np.clip((log_y - y_min) / (denom + 1e-12), 0.0, 1.0)
+    return 25 + 60 * t
+
+
+def _risk_matrix_label_ids(pts: list[tuple], top: int = RISK_MATRIX_LABELS_TOP) -> set:
+    """Номера сценариев для подписей: top наиболее вероятных + top наиболее опасных."""
+    # наиболее вероятные: max frequency
+    top_prob = heapq.nlargest(top, pts, key=lambda t: t[1])
+    # наиболее опасные: max последствия, при равенстве — max frequency
+    top_dang = heapq.nlargest(top, pts, key=lambda t: (t[0], t[1]))
+    return {sc_no for _, _, sc_no in top_prob + top_dang if sc_no is not None}
+
+
+def _annotate_risk_matrix(ax, pts: list[tuple], label_ids: set) -> None:
+    """Подписи чередуются фиксированными смещениями (без collision-логики)."""
+    offsets = _RISK_MATRIX_LABEL_OFFSETS
+    k = 0
+    for x, y, sc_no in pts:
+        if sc_no is None or sc_no not in label_ids:
+            continue
+
+        dx, dy = offsets[k % len(offsets)]
+        k += 1
+
+        ax.annotate(
+            f"С{sc_no}",
+            (x, y),
+            textcoords="offset points",
+            xytext=(dx, dy),
+            fontsize=11,
+        )
+
+
+def _fatalities_or_none(v):
+    x = int(v)
+    return x if x >= 1 else None
+
+
+def _damage_mln_or_none(v):
+    x = float(v) / 1000.0  # тыс.руб -> млн.руб
+    return x if x > 0 else None
+
+
+def save_risk_matrix_chart(
+    rows,
+    path: Path,
+    title: str = "Матрица риска (частота – последствия)",
+    *,
+    lod_threshold: int = RISK_MATRIX_LOD_THRESHOLD,
+    dpi: int = 200,
+):
     """
     Специализированная матрица:
       X = fatalities_count (строго целое, без jitter)
@@ -480,41 +642,29 @@ def save_risk_matrix_chart(rows, path: Path, title: str = "Матрица рис
       Размер точки ~ частоте
       Подписи: 5 наиболее вероятных + 5 наиболее опасных
       Подписи чередуются фиксированными смещениями (без collision-логики)
+
+    Если точек больше lod_threshold — совпадающие (N, F) объединяются
+    в один маркер, площадь которого растёт с кратностью (~sqrt(count)).
     """
+    import numpy as np
+
     if not rows:
         return
 
-    pts = []
-    for r in rows:
-        try:
-            x = int(r.get("fatalities_count"))
-            y = float(r.get("scenario_frequency"))
-        except Exception:
-            continue
-        if x < 1 or y <= 0:
-            continue
-        pts.append((x, y, r.get("scenario_no")))
-
+    pts = _risk_matrix_points(rows, "fatalities_count", _fatalities_or_none)
     if not pts:
         return
 
-    xs = [p[0] for p in pts]
-    ys = [p[1] for p in pts]
-
-    import math
-    y_min, y_max = min(ys), max(ys)
-    denom = (math.log10(y_max) - math.log10(y_min)) if y_max > y_min else 1.0
-
-    sizes = []
-    for y in ys:
-        t = (math.log10(y) - math.log10(y_min)) / (denom + 1e-12)
-        t = max(0.0, min(1.0, t))
-        sizes.append(25 + 60 * t)
+    xs = np.fromiter((p[0] for p in pts), dtype=float, count=len(pts))
+    ys = np.fromiter((p[1] for p in pts), dtype=float, count=len(pts))
 
     # линии матрицы (дефолтные пороги)
     freq_levels = [1e-1, 1e-2, 1e-3, 1e-4, 1e-5, 1e-6]
     cons_levels = [1, 3, 10]
 
+    plt = _pyplot()
+    from matplotlib.ticker import MultipleLocator, MaxNLocator
+
     fig, ax = plt.subplots(figsize=(12, 6))
     ax.set_yscale("log")
 
@@ -531,156 +681,97 @@ def save_risk_matrix_chart(rows, path: Path, title: str = "Матрица рис
     for n in cons_levels:
         ax.axvline(n, linewidth=1)
 
-    # ✅ точки строго на целых X (без jitter)
-    ax.scatter(xs, ys, s=sizes)
-
-    # -----------------------------
-    # Подписи: 5 наиболее вероятных + 5 наиболее опасных
-    # -----------------------------
-    # наиболее вероятные: max frequency
-    top_prob = sorted(pts, key=lambda t: t[1], reverse=True)[:5]
-
-    # наиболее опасные: max fatalities, при равенстве — max frequency
-    top_dang = sorted(pts, key=lambda t: (t[0], t[1]), reverse=True)[:5]
-
-    label_ids = set()
-    for _, _, sc_no in top_prob + top_dang:
-        if sc_no is not None:
-            label_ids.add(sc_no)
-
-    # фиксированные смещения (чередуются)
-    offsets = [
-        (4, 3),
-        (4, -10),
-        (12, 6),
-        (12, -14),
-    ]
-
-    k = 0
-    for x, y, sc_no in pts:
-        if sc_no is None or sc_no not in label_ids:
-            continue
-
-        dx, dy = offsets[k % len(offsets)]
-        k += 1
-
-        ax.annotate(
-            f"С{sc_no}",
-            (x, y),
-            textcoords="offset points",
-            xytext=(dx, dy),
-            fontsize=11,
+    if len(pts) > lod_threshold:
+        # LOD: одна точка на уникальную пару (N, F)
+        uniq, counts = np.unique(np.column_stack((xs, ys)), axis=0, return_counts=True)
+        sizes = np.minimum(_risk_matrix_sizes(uniq[:, 1]) * np.sqrt(counts), 600.0)
+        ax.scatter(uniq[:, 0], uniq[:, 1], s=sizes, alpha=0.7)
+        ax.text(
+            0.99, 0.01,
+            f"Сценариев: {len(pts)}; размер маркера ~ числу совпадающих",
+            transform=ax.transAxes, ha="right", va="bottom", fontsize=9,
         )
+    else:
+        # ✅ точки строго на целых X (без jitter)
+        ax.scatter(xs, ys, s=_risk_matrix_sizes(ys))
+
+    _annotate_risk_matrix(ax, pts, _risk_matrix_label_ids(pts))
 
     ax.set_title(title)
     ax.set_xlabel("Последствия: число погибших, чел")
     ax.set_ylabel("Частота сценария, 1/год")
 
-    ax.set_xlim(left=0, right=max(xs) + 1)
-    ax.set_ylim(bottom=min(ys) / 2, top=max(ys) * 2)
+    ax.set_xlim(left=0, right=xs.max() + 1)
+    ax.set_ylim(bottom=ys.min() / 2, top=ys.max() * 2)
 
     # только целые по оси X
-    ax.xaxis.set_major_locator(MultipleLocator(1))
+    if xs.max() > 50:
+        ax.xaxis.set_major_locator(MaxNLocator(integer=True))
+    else:
+        ax.xaxis.set_major_locator(MultipleLocator(1))
 
     ax.grid(True, which="both")
 
     plt.tight_layout()
-    plt.savefig(path, dpi=200, bbox_inches="tight")
+    plt.savefig(path, dpi=dpi, bbox_inches="tight")
     plt.close(fig)
 
 
-
-
-def save_risk_matrix_chart_damage(rows, path: Path, title: str = "Матрица риска (частота – ущерб)"):
+def save_risk_matrix_chart_damage(
+    rows,
+    path: Path,
+    title: str = "Матрица риска (частота – ущерб)",
+    *,
+    lod_threshold: int = RISK_MATRIX_LOD_THRESHOLD,
+    dpi: int = 200,
+):
     """
     X = total_damage (млн руб), без jitter
     Y = scenario_frequency (1/год), лог шкала
     Размер точки ~ частоте
     Подписи: 5 наиболее вероятных + 5 наиболее опасных
     Подписи чередуются с отступами (без collision-логики)
+
+    Если точек больше lod_threshold — вместо scatter рисуется hexbin
+    (плотность сценариев), подписи остаются только у выбранных сценариев.
     """
+    import numpy as np
+
     if not rows:
         return
 
-    pts = []
-    for r in rows:
-        try:
-            x = float(r.get("total_damage")) / 1000.0  # тыс.руб -> млн.руб
-            y = float(r.get("scenario_frequency"))
-        except Exception:
-            continue
-        if x <= 0 or y <= 0:
-            continue
-        pts.append((x, y, r.get("scenario_no")))
-
+    pts = _risk_matrix_points(rows, "total_damage", _damage_mln_or_none)
     if not pts:
         return
 
-    xs = [p[0] for p in pts]
-    ys = [p[1] for p in pts]
-
-    import math
-    y_min, y_max = min(ys), max(ys)
-    denom = (math.log10(y_max) - math.log10(y_min)) if y_max > y_min else 1.0
+    xs = np.fromiter((p[0] for p in pts), dtype=float, count=len(pts))
+    ys = np.fromiter((p[1] for p in pts), dtype=float, count=len(pts))
 
-    sizes = []
-    for y in ys:
-        t = (math.log10(y) - math.log10(y_min)) / (denom + 1e-12)
-        t = max(0.0, min(1.0, t))
-        sizes.append(25 + 60 * t)
+    plt = _pyplot()
 
     fig, ax = plt.subplots(figsize=(12, 6))
     ax.set_yscale("log")
 
-    # точки строго на своих X
-    ax.scatter(xs, ys, s=sizes)
-
-    # -----------------------------
-    # Подписи: 5 наиболее вероятных + 5 наиболее опасных
-    # -----------------------------
-    top_prob = sorted(pts, key=lambda t: t[1], reverse=True)[:5]
-    top_dang = sorted(pts, key=lambda t: (t[0], t[1]), reverse=True)[:5]
-
-    label_ids = set()
-    for _, _, sc_no in top_prob + top_dang:
-        if sc_no is not None:
-            label_ids.add(sc_no)
-
-    # фиксированные смещения (чередуются)
-    offsets = [
-        (4, 3),
-        (4, -10),
-        (12, 6),
-        (12, -14),
-    ]
-
-    k = 0
-    for x, y, sc_no in pts:
-        if sc_no is None or sc_no not in label_ids:
-            continue
-
-        dx, dy = offsets[k % len(offsets)]
-        k += 1
+    if len(pts) > lod_threshold:
+        hb = ax.hexbin(xs, ys, yscale="log", gridsize=60, bins="log", mincnt=1, cmap="Blues")
+        fig.colorbar(hb, ax=ax, label="Число сценариев")
+    else:
+        # точки строго на своих X
+        ax.scatter(xs, ys, s=_risk_matrix_sizes(ys))
 
-        ax.annotate(
-            f"С{sc_no}",
-            (x, y),
-            textcoords="offset points",
-            xytext=(dx, dy),
-            fontsize=11,
-        )
+    _annotate_risk_matrix(ax, pts, _risk_matrix_label_ids(pts))
 
     ax.set_title(title)
     ax.set_xlabel("Последствия: суммарный ущерб, млн руб")
     ax.set_ylabel("Частота сценария, 1/год")
 
-    ax.set_xlim(left=0, right=max(xs) * 1.05)
-    ax.set_ylim(bottom=min(ys) / 2, top=max(ys) * 2)
+    ax.set_xlim(left=0, right=xs.max() * 1.05)
+    ax.set_ylim(bottom=ys.min() / 2, top=ys.max() * 2)
 
     ax.grid(True, which="both")
 
     plt.tight_layout()
-    plt.savefig(path, dpi=200, bbox_inches="tight")
+    plt.savefig(path, dpi=dpi, bbox_inches="tight")
     plt.close(fig)
 
 
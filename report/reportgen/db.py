@@ -309,58 +309,57 @@ def get_fg_source_rows(conn) -> list[dict]:
     return [dict(zip(cols, r)) for r in cur.fetchall()]
 
 
-def get_pareto_risk_source_rows(conn) -> list[dict]:
-    """
-    Источник для Pareto по риску (сценарии/оборудование).
-    Возвращает строки по каждому (equipment, scenario_no) с рассчитанными в calculations показателями риска.
-    """
-    sql = """
-    SELECT
-        e.equipment_name AS equipment_name,
-        c.scenario_no AS scenario_no,
-        c.collective_risk_fatalities AS collective_risk_fatalities,
-        c.collective_risk_injured AS collective_risk_injured
-    FROM calculations c
-    JOIN equipment e ON e.id = c.equipment_id
-    ORDER BY c.scenario_no, e.equipment_name
-    """
-    cur = conn.cursor()
-    cur.execute(sql)
-    cols = [d[0] for d in cur.description]
-    return [dict(zip(cols, r)) for r in cur.fetchall()]
+# Колонки calculations, по которым строятся Pareto-диаграммы
+PARETO_VALUE_COLUMNS = (
+    "collective_risk_fatalities",
+    "collective_risk_injured",
+    "total_damage",
+    "total_environmental_damage",
+)
 
 
-def get_pareto_damage_source_rows(conn) -> list[dict]:
-    sql = """
-    SELECT
-        e.equipment_name AS equipment_name,
-        c.scenario_no AS scenario_no,
-        c.total_damage AS total_damage
-    FROM calculations c
-    JOIN equipment e ON e.id = c.equipment_id
-    WHERE c.total_damage IS NOT NULL
+def get_pareto_top_rows(conn, value_column: str, top_n: int, *, positive_only: bool = False) -> dict:
     """
-    cur = conn.cursor()
-    cur.execute(sql)
-    cols = [d[0] for d in cur.description]
-    return [dict(zip(cols, r)) for r in cur.fetchall()]
-
+    Источник для Pareto без выборки всех сценариев:
+    Top-N строк (ORDER BY ... LIMIT N) + агрегат по всем сценариям.
 
-def get_pareto_environmental_damage_source_rows(conn):
-    sql = """
-    SELECT
-        e.equipment_name AS equipment_name,
-        c.scenario_no AS scenario_no,
-        c.total_environmental_damage AS total_environmental_damage
-    FROM calculations c
-    JOIN equipment e ON e.id = c.equipment_id
-    WHERE c.total_environmental_damage IS NOT NULL
-          AND c.total_environmental_damage > 0
+    Возвращает dict:
+      - rows: Top-N строк (equipment_name, scenario_no, <value_column>) по убыванию значения
+      - total: сумма value_column по всем сценариям (для "Прочих" и накопленной доли)
+      - count: число сценариев, участвующих в сумме
     """
+    if value_column not in PARETO_VALUE_COLUMNS:
+        raise ValueError(f"Неизвестная колонка для Pareto: {value_column}")
+
+    where = f"c.{value_column} IS NOT NULL"
+    if positive_only:
+        where += f" AND c.{value_column} > 0"
+
     cur = conn.cursor()
-    cur.execute(sql)
+    cur.execute(f"""
+        SELECT
+            COALESCE(SUM(c.{value_column}), 0) AS total,
+            COUNT(*) AS cnt
+        FROM calculations c
+        WHERE {where}
+    """)
+    total, count = cur.fetchone()
+
+    cur.execute(f"""
+        SELECT
+            e.equipment_name AS equipment_name,
+            c.scenario_no AS scenario_no,
+            c.{value_column} AS {value_column}
+        FROM calculations c
+        JOIN equipment e ON e.id = c.equipment_id
+        WHERE {where}
+        ORDER BY c.{value_column} DESC, c.scenario_no, e.equipment_name
+        LIMIT ?
+    """, (int(top_n),))
     cols = [d[0] for d in cur.description]
-    return [dict(zip(cols, r)) for r in cur.fetchall()]
+    rows = [dict(zip(cols, r)) for r in cur.fetchall()]
+
+    return {"rows": rows, "total": float(total), "count": int(count)}
 
 
 def get_max_losses_by_hazard_component(conn) -> list[dict]:
@@ -665,6 +664,25 @@ def get_calculation_row_for_top_scenario(conn, hazard_component, scenario_no, eq
     return cur.fetchone()  # tuple или None
 
 
+def get_weather_zones_for_top_scenario(conn, scenario_no):
+    """
+    Радиусы зон сценария, взвешенные по классам погоды (calculations_weather):
+    (q_10_5, q_7_0, q_4_2, q_1_4, r_nkpr, r_vsp) или None — сценарий по классам
+    погоды не считался (или таблицы нет: WEATHER_CLASSES_ENABLED выключен).
+    """
+    cur = conn.cursor()
+    try:
+        cur.execute("""
+            SELECT q_10_5, q_7_0, q_4_2, q_1_4, r_nkpr, r_vsp
+            FROM calculations_weather
+            WHERE scenario_no = ?
+        """, (scenario_no,))
+    except sqlite3.OperationalError:
+        return None
+
+    return cur.fetchone()  # tuple или None
+
+
 def get_fatalities_injured_for_top_scenario(conn, hazard_component, scenario_no, equipment_name):
     """
     Возвращает (fatalities_count, injured_count) для заданного:
@@ -0,0 +1,175 @@
+"""
+Потоковая запись крупных таблиц в docx.
+
+При тысячах строк DOM python-docx для всего отчёта занимает гигабайты,
+а doc.save() работает очень долго. В потоковом режиме:
+
+  1) в основном документе таблица строится только с шапкой (rows=[]),
+     на месте строк ставится XML-комментарий-заглушка;
+  2) строки строятся той же функцией render_* порциями не более чем по
+     chunk_cells ячеек (число строк порции — по ширине таблицы)
+     во вспомогательном документе из того же шаблона (стили, ширины,
+     шрифты — те же), XML строк <w:tr> дописывается во временный файл,
+     а порция удаляется из DOM;
+  3) при сохранении word/document.xml переписывается потоком:
+     заглушки заменяются содержимым временных файлов.
+
+Пиковая память ограничена размером порции, а не числом сценариев.
+"""
+from __future__ import annotations
+
+import io
+import re
+import shutil
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from lxml import etree
+
+from core.config import STREAM_TABLE_CHUNK_CELLS
+from report.reportgen.word_utils import find_paragraph_with_marker
+
+if TYPE_CHECKING:
+    from docx.document import Document
+
+_STREAM_TAG = "STREAM_ROWS:"
+_STREAM_RE = re.compile(r"<!--" + re.escape(_STREAM_TAG) + r"(\d+)-->")
+_XMLNS_RE = re.compile(r'\sxmlns:(\w+)="([^"]*)"')
+
+_COPY_BUFSIZE = 1024 * 1024
+
+
+class StreamedTables:
+    """
+    Потоковые таблицы одного выходного документа.
+
+    streamer = StreamedTables(template_path)
+    streamer.render(doc, render_func, rows=..., marker=..., ...)
+    streamer.save(doc, out_path)   # вместо doc.save(out_path)
+    """
+
+    def __init__(self, template_path: Path, *, chunk_cells: int = STREAM_TABLE_CHUNK_CELLS):
+        self.template_path = Path(template_path)
+        self.chunk_cells = max(1, int(chunk_cells))
+        self._tmp = tempfile.TemporaryDirectory(prefix="docx_stream_")
+        self._spools: list[Path] = []
+        self._scratch: Document | None = None
+
+    # ---------------------------
+    # построение
+    # ---------------------------
+
+    def _scratch_doc(self) -> Document:
+        # вспомогательный документ из того же шаблона: те же стили и поля страницы
+        if self._scratch is None:
+            from docx import Document
+
+            self._scratch = Document(str(self.template_path))
+        return self._scratch
+
+    def render(self, doc: Document, render_func, *, rows: list, rows_arg: str = "rows", marker: str, **kwargs):
+        """
+        Строит таблицу render_func(doc=..., marker=..., <rows_arg>=...) потоково.
+        Возвращает таблицу основного документа (шапка + заглушка строк) или None.
+        """
+        table = render_func(doc=doc, marker=marker, **{rows_arg: []}, **kwargs)
+        if table is None:
+            return None
+
+        header_rows = len(table._tbl.tr_lst)
+        # порция — по числу ячеек: узкие таблицы идут крупными порциями, широкие — мелкими
+        chunk_rows = max(1, self.chunk_cells // max(1, len(table._tbl.tblGrid.gridCol_lst)))
+        stream_id = len(self._spools)
+        spool = Path(self._tmp.name) / f"rows_{stream_id}.xml"
+        self._spools.append(spool)
+
+        # корень основного документа уже объявляет пространства имён —
+        # в строках эти объявления не дублируем
+        root_nsmap = {k: v for k, v in doc.element.nsmap.items() if k}
+
+        scratch = self._scratch_doc()
+        with open(spool, "w", encoding="utf-8") as f:
+            for start in range(0, len(rows), chunk_rows):
+                chunk = rows[start:start + chunk_rows]
+                self._render_chunk(scratch, render_func, chunk, rows_arg, marker, header_rows, root_nsmap, f, kwargs)
+
+        table._tbl.append(etree.Comment(f"{_STREAM_TAG}{stream_id}"))
+        return table
+
+    @staticmethod
+    def _render_chunk(scratch, render_func, chunk, rows_arg, marker, header_rows, root_nsmap, out, kwargs):
+        if find_paragraph_with_marker(scratch, marker) is None:
+            # маркера нет в шаблоне (или уже занят) — добавим в конец тела
+            scratch.add_paragraph(marker)
+
+        table = render_func(doc=scratch, marker=marker, **{rows_arg: chunk}, **kwargs)
+        if table is None:
+            return
+
+        tbl = table._tbl
+        for tr in tbl.tr_lst[header_rows:]:
+            out.write(_strip_root_xmlns(etree.tostring(tr, encoding="unicode"), root_nsmap))
+            # строку удаляем сразу: удаление всей таблицы целиком в lxml
+            # растёт быстрее числа строк и при крупной порции занимает секунды
+            tbl.remove(tr)
+
+        # возвращаем маркер на место таблицы и освобождаем порцию
+        p = scratch.add_paragraph(marker)._p
+        tbl.addprevious(p)
+        tbl.getparent().remove(tbl)
+
+    # ---------------------------
+    # сохранение
+    # ---------------------------
+
+    def save(self, doc: Document, out_path: Path) -> None:
+        """Сохраняет документ, подставляя потоковые строки в word/document.xml."""
+        out_path = Path(out_path)
+        try:
+            if not self._spools:
+                doc.save(str(out_path))
+                return
+
+            buf = io.BytesIO()
+            doc.save(buf)
+            buf.seek(0)
+
+            with zipfile.ZipFile(buf) as zin, \
+                    zipfile.ZipFile(out_path, "w", compression=zipfile.ZIP_DEFLATED) as zout:
+                for item in zin.infolist():
+                    if item.filename == "word/document.xml":
+                        self._write_document_xml(zin.read(item).decode("utf-8"), zout, item)
+                    else:
+                        with zin.open(item) as src, zout.open(item, "w") as dst:
+                            shutil.copyfileobj(src, dst, _COPY_BUFSIZE)
+        finally:
+            self.close()
+
+    def _write_document_xml(self, xml: str, zout: zipfile.ZipFile, item: zipfile.ZipInfo) -> None:
+        info = zipfile.ZipInfo(item.filename, date_time=item.date_time)
+        info.compress_type = zipfile.ZIP_DEFLATED
+
+        with zout.open(info, "w", force_zip64=True) as dst:
+            pos = 0
+            for m in _STREAM_RE.finditer(xml):
+                dst.write(xml[pos:m.start()].encode("utf-8"))
+                with open(self._spools[int(m.group(1))], "rb") as src:
+                    shutil.copyfileobj(src, dst, _COPY_BUFSIZE)
+                pos = m.end()
+            dst.write(xml[pos:].encode("utf-8"))
+
+    def close(self) -> None:
+        self._scratch = None
+        self._tmp.cleanup()
+
+
+def _strip_root_xmlns(xml: str, root_nsmap: dict) -> str:
+    """Убирает из открывающего тега <w:tr> объявления xmlns, уже объявленные в корне документа."""
+    end = xml.index(">")
+    head = _XMLNS_RE.sub(
+        lambda m: "" if root_nsmap.get(m.group(1)) == m.group(2) else m.group(0),
+        xml[:end],
+    )
+    return head + xml[end:]
@@ -0,0 +1,193 @@
+"""
+Кэш разделов отчёта (инкрементальная пересборка).
+
+Каждый раздел — результат одной функции render_* на месте своего маркера.
+Ключ раздела: шаблон (хэш файла) + маркер + абзац маркера (в нём уже
+подставлены плейсхолдеры организации/проекта) + функция + её аргументы
+(данные раздела) + отпечаток БД (query_cache.db_fingerprint), если функция
+читает её сама через conn, + хэши файлов данных, которые читают render_*
+(typical_scenarios.json), + версия кода отчёта.
+
+При промахе раздел строится как обычно, а XML-элементы, появившиеся
+в теле документа на месте маркера, сохраняются. При попадании эти
+элементы вставляются вместо маркера без вызова render_*.
+
+Не кэшируются фрагменты со ссылками на связи пакета (r:id, r:embed —
+картинки, гиперссылки) и потоковые таблицы (строки пишутся при сохранении).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
+
+from lxml import etree
+
+from core.path import CORE_DIR, REPORT_DIR
+from report.reportgen.chart_cache import evict_chart_cache
+from report.reportgen.word_utils import find_paragraph_with_marker
+
+if TYPE_CHECKING:
+    from docx.document import Document
+
+# меняем при несовместимом изменении формата записей
+FRAGMENT_CACHE_VERSION = 2
+
+_R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_STREAM_MARK = "STREAM_ROWS:"
+
+# аргументы, не влияющие на содержимое раздела
+_SKIP_ARGS = {"doc", "conn", "streamer"}
+
+_CODE_HASH: str | None = None
+
+
+def _code_hash() -> str:
+    """Версия кода отчёта: правка render_*/форматтеров/config сбрасывает кэш разделов."""
+    global _CODE_HASH
+    if _CODE_HASH is None:
+        h = hashlib.sha256()
+        files = [REPORT_DIR / "fill_word.py", CORE_DIR / "config.py"]
+        files += sorted((REPORT_DIR / "reportgen").glob("*.py"))
+        for p in files:
+            h.update(p.name.encode("utf-8"))
+            h.update(p.read_bytes())
+        _CODE_HASH = h.hexdigest()
+    return _CODE_HASH
+
+
+def _json_default(v):
+    if callable(v):
+        return f"{getattr(v, '__module__', '')}.{getattr(v, '__qualname__', repr(v))}"
+    return str(v)
+
+
+def _files_hash(paths) -> str:
+    """Хэш файлов данных (отсутствующий файл — отдельное значение)."""
+    h = hashlib.sha256()
+    for p in paths:
+        p = Path(p)
+        h.update(p.name.encode("utf-8"))
+        h.update(p.read_bytes() if p.exists() else b"<missing>")
+    return h.hexdigest()
+
+
+class FragmentCache:
+    """Кэш разделов одного шаблона."""
+
+    def __init__(self, cache_dir: Path, template_path: Path, *, db_fingerprint: str = "", input_files=()):
+        """
+        :@param db_fingerprint: отпечаток файла БД (query_cache.db_fingerprint)
+        :@param input_files: файлы данных, которые читают render_* помимо аргументов
+        """
+        self.cache_dir = Path(cache_dir)
+        self.template_hash = hashlib.sha256(Path(template_path).read_bytes()).hexdigest()
+        self.template_name = Path(template_path).stem
+        self.db_fingerprint = db_fingerprint
+        self.files_hash = _files_hash(input_files)
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, marker: str, render: Callable, kwargs: dict, db_tables=(), paragraph: str = "") -> str:
+        payload = json.dumps(
+            {
+                "version": FRAGMENT_CACHE_VERSION,
+                "code": _code_hash(),
+                "template": self.template_hash,
+                "files": self.files_hash,
+                "marker": marker,
+                "paragraph": paragraph,
+                "render": _json_default(render),
+                "args": {k: v for k, v in kwargs.items() if k not in _SKIP_ARGS},
+                # db_tables — таблицы, которые раздел читает сам; отпечаток — всего файла БД
+                "db": self.db_fingerprint if db_tables else "",
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+            default=_json_default,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def render(self, render: Callable, /, *, db_tables=(), **kwargs):
+        """
+        Вызывает render(**kwargs) либо подставляет сохранённый раздел.
+        kwargs должны содержать doc и marker (как у всех render_*).
+        """
+        doc: Document = kwargs["doc"]
+        marker: str = kwargs["marker"]
+
+        p_marker = find_paragraph_with_marker(doc, marker)
+        if p_marker is None:
+            # маркера в шаблоне нет — кэшировать нечего
+            return render(**kwargs)
+
+        # абзац маркера — вместе с уже подставленным текстом вокруг маркера
+        paragraph = etree.tostring(p_marker._p, encoding="unicode")
+        key = self.key(marker, render, kwargs, db_tables, paragraph)
+        entry = self.cache_dir / f"{key}.json"
+
+        if entry.exists():
+            try:
+                elements = json.loads(entry.read_text(encoding="utf-8"))["elements"]
+            except (OSError, ValueError, KeyError):
+                elements = None
+            if elements is not None:
+                from docx.oxml import parse_xml
+
+                anchor = p_marker._p
+                for xml in elements:
+                    anchor.addprevious(parse_xml(xml))
+                anchor.getparent().remove(anchor)
+                entry.touch()  # для вытеснения по возрасту: запись "свежая"
+                self.hits += 1
+                return None
+
+        self.misses += 1
+
+        # всё, что render вставит между соседями маркера, и есть раздел
+        prev_el = p_marker._p.getprevious()
+        next_el = p_marker._p.getnext()
+        body = p_marker._p.getparent()
+
+        result = render(**kwargs)
+
+        el = prev_el.getnext() if prev_el is not None else body[0]
+        elements = []
+        while el is not None and el is not next_el:
+            elements.append(el)
+            el = el.getnext()
+
+        if _is_cacheable(elements):
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            data = {
+                "marker": marker,
+                "elements": [etree.tostring(e, encoding="unicode") for e in elements],
+            }
+            tmp = entry.with_suffix(".tmp")
+            tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+            tmp.replace(entry)
+
+        return result
+
+    def report(self) -> None:
+        total = self.hits + self.misses
+        print(f"Кэш разделов ({self.template_name}): {self.hits} из {total} из кэша")
+
+
+def _is_cacheable(elements) -> bool:
+    """Фрагмент без ссылок на связи пакета и без заглушек потоковых таблиц."""
+    for root in elements:
+        for el in root.iter():
+            if isinstance(el, etree._Comment):
+                if el.text and el.text.startswith(_STREAM_MARK):
+                    return False
+                continue
+            if any(name.startswith(f"{{{_R_NS}}}") for name in el.attrib):
+                return False
+    return True
+
+
+def evict_fragment_cache(cache_dir: Path, *, max_age_days: float | None = None, max_size_mb: float | None = None) -> int:
+    # формат записей (<key>.*) тот же, что у кэша диаграмм
+    return evict_chart_cache(cache_dir, max_age_days=max_age_days, max_size_mb=max_size_mb)
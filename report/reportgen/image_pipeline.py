@@ -0,0 +1,61 @@
+"""
+Обработка PNG диаграмм перед вставкой в docx.
+
+matplotlib сохраняет RGBA со сжатием zlib по умолчанию. Для диаграмм
+на белом фоне альфа-канал не нужен, а сжатие можно усилить:
+
+  "optimize" — без потерь: непрозрачный RGBA -> RGB, zlib уровня 9;
+               если цветов не больше 256 — палитра (тоже без потерь);
+  "quantize" — палитра из 256 цветов (FASTOCTREE): в 2–4 раза меньше,
+               на сглаживании текста возможны едва заметные отличия.
+
+Одинаковые картинки в одном документе python-docx и так хранит одной
+частью пакета (по sha1), поэтому каждую диаграмму достаточно один раз
+сохранить в один и тот же файл.
+"""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+PNG_MODES = ("optimize", "quantize")
+
+
+def optimize_png(path: Path, *, mode: str | None = "optimize") -> tuple[int, int]:
+    """
+    Переписывает PNG на месте. Возвращает (размер до, размер после), байт.
+    Если результат не меньше исходного, файл не меняется.
+    """
+    path = Path(path)
+    before = path.stat().st_size
+    if mode is None:
+        return before, before
+    if mode not in PNG_MODES:
+        raise ValueError(f"Неизвестный режим обработки PNG: {mode!r} (ожидается один из {PNG_MODES})")
+
+    from PIL import Image
+
+    with Image.open(path) as src:
+        img = src.copy()
+
+    if img.mode == "RGBA" and img.getextrema()[3][0] == 255:
+        img = img.convert("RGB")
+
+    if mode == "quantize" and img.mode in ("RGB", "RGBA"):
+        img = img.quantize(256, method=Image.Quantize.FASTOCTREE)
+    elif img.mode == "RGB":
+        colors = img.getcolors(256)
+        if colors is not None:
+            # точная палитра из цветов самого изображения
+            palette = Image.new("P", (1, 1))
+            palette.putpalette([ch for _, rgb in colors for ch in rgb])
+            img = img.quantize(palette=palette, dither=Image.Dither.NONE)
+
+    tmp = path.with_suffix(f".tmp{os.getpid()}.png")
+    img.save(tmp, "PNG", compress_level=9)
+    after = tmp.stat().st_size
+    if after < before:
+        os.replace(tmp, path)
+        return before, after
+    tmp.unlink()
+    return before, before
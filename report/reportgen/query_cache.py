@@ -0,0 +1,157 @@
+"""
+Кэш результатов запросов отчёта (get_* из report/reportgen/db.py).
+
+Пока БД не менялась (обычно правятся только шаблоны Word), выборки
+берутся из бинарного снимка, а не выполняются заново в SQLite.
+
+Снимок — один файл на отпечаток БД: <fingerprint>.pkl. Отпечаток —
+sha256 файла БД (и -wal, если есть) + исходника db.py (правка SQL
+сбрасывает кэш). Чтобы не хэшировать большой файл БД при каждом запуске,
+хэш запоминается вместе с размером и mtime файла.
+
+Строки хранятся колоночно (имена колонок один раз + кортежи значений),
+при чтении снова превращаются в list[dict], как возвращают get_*.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+from pathlib import Path
+from typing import Callable
+
+from report.reportgen import db as _db_module
+
+# меняем при несовместимом изменении формата снимка
+QUERY_CACHE_VERSION = 1
+
+_HASH_BUFSIZE = 1024 * 1024
+
+
+def _file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(_HASH_BUFSIZE)
+            if not chunk:
+                break
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def db_fingerprint(db_path: Path, cache_dir: Path | None = None) -> str:
+    """
+    Отпечаток БД для ключа кэша.
+    cache_dir — где запомнить (size, mtime) -> sha256, чтобы не перечитывать файл.
+    """
+    db_path = Path(db_path)
+    files = [db_path] + [p for p in (Path(f"{db_path}-wal"),) if p.exists()]
+
+    stamp = [[p.name, p.stat().st_size, p.stat().st_mtime_ns] for p in files]
+    memo_path = cache_dir / "db_fingerprint.json" if cache_dir is not None else None
+
+    file_hash = None
+    if memo_path is not None and memo_path.exists():
+        try:
+            memo = json.loads(memo_path.read_text(encoding="utf-8"))
+            if memo.get("stamp") == stamp:
+                file_hash = memo.get("sha256")
+        except (OSError, ValueError):
+            pass
+
+    if file_hash is None:
+        h = hashlib.sha256()
+        for p in files:
+            h.update(_file_sha256(p).encode("ascii"))
+        file_hash = h.hexdigest()
+        if memo_path is not None:
+            memo_path.parent.mkdir(parents=True, exist_ok=True)
+            memo_path.write_text(json.dumps({"stamp": stamp, "sha256": file_hash}), encoding="utf-8")
+
+    h = hashlib.sha256()
+    h.update(f"v{QUERY_CACHE_VERSION}".encode("ascii"))
+    h.update(file_hash.encode("ascii"))
+    h.update(Path(_db_module.__file__).read_bytes())
+    return h.hexdigest()
+
+
+def _pack(value):
+    """list[dict] с одинаковыми ключами -> ("rows", cols, [tuple]); остальное как есть."""
+    if isinstance(value, list) and value and all(isinstance(r, dict) for r in value):
+        cols = tuple(value[0].keys())
+        if all(tuple(r.keys()) == cols for r in value):
+            return ("rows", cols, [tuple(r.values()) for r in value])
+    if isinstance(value, dict) and isinstance(value.get("rows"), list):
+        # get_pareto_top_rows: {"rows": [...], "total": ..., "count": ...}
+        return ("dict", {k: _pack(v) for k, v in value.items()})
+    return ("raw", value)
+
+
+def _unpack(packed):
+    kind = packed[0]
+    if kind == "rows":
+        _, cols, rows = packed
+        return [dict(zip(cols, r)) for r in rows]
+    if kind == "dict":
+        return {k: _unpack(v) for k, v in packed[1].items()}
+    return packed[1]
+
+
+class QueryCache:
+    """
+    qc = QueryCache(cache_dir, DB_PATH)
+    rows = qc.get(get_scenarios, conn)
+    ...
+    qc.save()
+    """
+
+    def __init__(self, cache_dir: Path, db_path: Path):
+        self.cache_dir = Path(cache_dir)
+        self.fingerprint = db_fingerprint(db_path, self.cache_dir)
+        self.path = self.cache_dir / f"{self.fingerprint}.pkl"
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._data: dict = {}
+
+        if self.path.exists():
+            try:
+                with open(self.path, "rb") as f:
+                    self._data = pickle.load(f)
+            except Exception:
+                self._data = {}
+
+    @staticmethod
+    def _key(func: Callable, args, kwargs) -> str:
+        return repr((func.__module__, func.__qualname__, args, sorted(kwargs.items())))
+
+    def get(self, func: Callable, conn, *args, **kwargs):
+        """func(conn, *args, **kwargs) из снимка либо из БД (с записью в снимок)."""
+        key = self._key(func, args, kwargs)
+        if key in self._data:
+            self.hits += 1
+            return _unpack(self._data[key])
+
+        self.misses += 1
+        value = func(conn, *args, **kwargs)
+        self._data[key] = _pack(value)
+        self._dirty = True
+        return value
+
+    def save(self) -> None:
+        """Записывает снимок (если появились новые выборки) и удаляет снимки других версий БД."""
+        print(f"Кэш запросов: {self.hits} из {self.hits + self.misses} из снимка")
+        if not self._dirty:
+            return
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(f".tmp{os.getpid()}")
+        with open(tmp, "wb") as f:
+            pickle.dump(self._data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+        for p in self.cache_dir.glob("*.pkl"):
+            if p != self.path:
+                p.unlink(missing_ok=True)
@@ -62,10 +62,11 @@ EQUIPMENT_SECTIONS = [
 ]
 
 
-def _format_pf_zones(calc_row_tuple):
+def _format_pf_zones(calc_row_tuple, weather_row_tuple=None):
     """
     Формирует многострочный текст зон поражающих факторов.
     calc_row_tuple — tuple из get_calculation_row_for_top_scenario()
+    weather_row_tuple — tuple из get_weather_zones_for_top_scenario() (зоны с учётом классов погоды)
     """
     if calc_row_tuple is None:
         return "—"
@@ -118,6 +119,17 @@ def _format_pf_zones(calc_row_tuple):
     # Пролив
     add_m2(s_t, "площадь пролива опасного вещества")
 
+    # Средневзвешенные по вероятности классов погоды
+    if weather_row_tuple is not None and any(v is not None for v in weather_row_tuple):
+        w_q_10_5, w_q_7_0, w_q_4_2, w_q_1_4, w_r_nkpr, w_r_vsp = weather_row_tuple
+        lines.append("с учётом классов погоды (средневзвешенно):")
+        add_m(w_q_10_5, "10,5 кВт/м2")
+        add_m(w_q_7_0,  "7,0 кВт/м2")
+        add_m(w_q_4_2,  "4,2 кВт/м2")
+        add_m(w_q_1_4,  "1,4 кВт/м2")
+        add_m(w_r_nkpr, "радиус НКПР")
+        add_m(w_r_vsp,  "радиус пожара-вспышки")
+
     return "\n".join(lines) if lines else "—"
 
 
@@ -1,13 +1,33 @@
-from docx import Document
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.shared import Pt
-from docx.text.paragraph import Paragraph
-from docx.oxml.ns import qn
-from docx.oxml import OxmlElement
+# python-docx импортируется при первом обращении к документу, а не при
+# импорте модуля: без него обходятся выборки и предпросмотр отчёта.
+from __future__ import annotations
+
+import functools
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from docx.document import Document
+    from docx.text.paragraph import Paragraph
+
+
+@functools.lru_cache(maxsize=None)
+def _body_p_contains():
+    """
+    Кандидаты: абзацы тела, в тексте которых (string(.)) встречается маркер.
+    Отбор идёт в lxml, без построения p.text для каждого абзаца документа.
+    """
+    from docx.oxml.ns import nsmap
+    from lxml import etree
+
+    return etree.XPath("./w:p[contains(string(.), $marker)]", namespaces={"w": nsmap["w"]})
 
 
 def find_paragraph_with_marker(doc: Document, marker: str) -> Paragraph | None:
-    for p in doc.paragraphs:
+    from docx.text.paragraph import Paragraph
+
+    for p_el in _body_p_contains()(doc.element.body, marker=marker):
+        p = Paragraph(p_el, doc._body)
+        # точная проверка тем же способом, что и раньше (p.text)
         if marker in p.text:
             return p
     return None
@@ -44,6 +64,9 @@ def _set_repeat_table_header(table, header_rows: int = 1) -> None:
     Делает первые header_rows строк таблицы повторяемыми (как заголовок на каждой странице).
     Работает через OOXML, совместимо со старыми версиями python-docx.
     """
+    from docx.oxml import OxmlElement
+    from docx.oxml.ns import qn
+
     try:
         for i in range(min(header_rows, len(table.rows))):
             tr = table.rows[i]._tr
@@ -66,6 +89,8 @@ def insert_paragraph_after_table(doc: Document, table, text: str = "") -> Paragr
 
 
 def add_section_header_row(table, title: str):
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+
     row = table.add_row().cells
     row[0].merge(row[1])
 
@@ -77,6 +102,9 @@ def add_section_header_row(table, title: str):
 
 
 def set_run_font(run, bold=False):
+    from docx.oxml.ns import qn
+    from docx.shared import Pt
+
     run.font.name = "Times New Roman"
     run._element.rPr.rFonts.set(qn("w:eastAsia"), "Times New Roman")
     run.font.size = Pt(11)
@@ -0,0 +1,187 @@
+"""
+Режим наблюдения за шаблонами отчёта.
+
+Долгоживущий процесс: данные из БД, построенные диаграммы и кэши разделов
+остаются "тёплыми", а папка шаблонов и файлы данных опрашиваются по mtime.
+
+  - изменён/добавлен шаблон .docx      -> пересобирается только он;
+  - изменена БД                        -> перечитываются выборки,
+                                          перестраиваются диаграммы, все шаблоны;
+  - изменены json организации/проекта/
+    типовых сценариев                  -> пересобираются все шаблоны.
+
+Запуск: python -m report.watch_report   (остановка — Ctrl+C)
+"""
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+from core.config import REPORT_DRAFT_MODE, CHART_CACHE_ENABLED, WATCH_POLL_INTERVAL_S
+from core.path import (
+    DB_PATH,
+    ORGANIZATION_PATH,
+    PROJECT_COMMON_PATH,
+    REPORT_CHART_CACHE_DIR,
+    REPORT_CHARTS_DIR,
+    REPORT_OUTPUT_DIR,
+    TYPICAL_SCENARIOS_PATH,
+)
+from report.fill_word import (
+    TEMPLATE_DIR,
+    build_report_document,
+    collect_report_data,
+    evict_report_caches,
+    iter_variant_templates,
+    start_chart_rendering,
+)
+from report.reportgen.db import open_db
+
+# файлы, которые fill_doc читает сам (помимо БД)
+DATA_FILES = (ORGANIZATION_PATH, PROJECT_COMMON_PATH, TYPICAL_SCENARIOS_PATH)
+
+
+def _mtime(p: Path):
+    try:
+        st = p.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _db_stamp():
+    return _mtime(DB_PATH), _mtime(Path(f"{DB_PATH}-wal"))
+
+
+class ReportWatcher:
+    def __init__(self, *, draft: bool = REPORT_DRAFT_MODE):
+        self.draft = draft
+        self.conn = None
+        self.doc_data: dict = {}
+        self.charts: dict = {}
+        self.db_stamp = None
+        self.data_stamps: dict = {}
+        self.template_stamps: dict = {}
+
+    # ---------------------------
+    # тёплое состояние
+    # ---------------------------
+
+    def load_data(self):
+        """(Пере)подключение к БД, выборки и диаграммы."""
+        t0 = time.perf_counter()
+        if self.conn is not None:
+            self.conn.close()
+        # БД может быть пересоздана целиком (create_sqlite_db) — переоткрываем
+        self.conn = open_db(DB_PATH)
+        self.db_stamp = _db_stamp()
+
+        self.doc_data, chart_data = collect_report_data(self.conn)
+        evict_report_caches()
+        if self.draft:
+            self.charts = {}
+        else:
+            cache_dir = REPORT_CHART_CACHE_DIR if CHART_CACHE_ENABLED else None
+            # без пула: в режиме наблюдения почти все диаграммы приходят из кэша
+            self.charts = start_chart_rendering(chart_data, REPORT_CHARTS_DIR, cache_dir=cache_dir)
+        print(f"Данные загружены за {time.perf_counter() - t0:.1f} с")
+
+    def build(self, template_path: Path):
+        t0 = time.perf_counter()
+        try:
+            build_report_document(
+                template_path,
+                doc_data=self.doc_data,
+                conn=self.conn,
+                charts=self.charts,
+                draft=self.draft,
+            )
+        except Exception as e:
+            # шаблон мог быть сохранён не до конца — дождёмся следующего изменения
+            print(f"Ошибка сборки {template_path.name}: {e}")
+            return
+        print(f"{template_path.name}: {time.perf_counter() - t0:.1f} с")
+
+    # ---------------------------
+    # наблюдение
+    # ---------------------------
+
+    def _scan_templates(self) -> dict:
+        return {p: _mtime(p) for p in iter_variant_templates(TEMPLATE_DIR)}
+
+    def _scan_data_files(self) -> dict:
+        return {p: _mtime(Path(p)) for p in DATA_FILES}
+
+    def run(self, interval: float = WATCH_POLL_INTERVAL_S):
+        REPORT_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+        self.load_data()
+        self.template_stamps = self._scan_templates()
+        self.data_stamps = self._scan_data_files()
+        for p in self.template_stamps:
+            self.build(p)
+
+        print(f"Наблюдение за {TEMPLATE_DIR} (Ctrl+C — выход)")
+        pending: dict = {}
+        try:
+            while True:
+                time.sleep(interval)
+                pending = self.poll(pending)
+        except KeyboardInterrupt:
+            print("Наблюдение остановлено")
+        finally:
+            if self.conn is not None:
+                self.conn.close()
+
+    def poll(self, pending: dict) -> dict:
+        """
+        Один опрос. Изменение обрабатывается, когда mtime не менялся
+        между двумя опросами (Word сохраняет файл в несколько шагов).
+        pending: что -> штамп, замеченный на прошлом опросе.
+        """
+        changes = {}
+
+        db_stamp = _db_stamp()
+        if db_stamp != self.db_stamp:
+            changes["db"] = db_stamp
+
+        data_stamps = self._scan_data_files()
+        if data_stamps != self.data_stamps:
+            changes["data"] = tuple(data_stamps.items())
+
+        for p, stamp in self._scan_templates().items():
+            if stamp != self.template_stamps.get(p):
+                changes[p] = stamp
+
+        ready = {k: v for k, v in changes.items() if pending.get(k) == v}
+        if not ready:
+            return changes
+
+        if "db" in ready:
+            print("Изменилась БД — перечитываем данные")
+            self.load_data()
+            self.data_stamps = data_stamps
+            self.template_stamps = self._scan_templates()
+            for p in self.template_stamps:
+                self.build(p)
+            return {}
+
+        if "data" in ready:
+            print("Изменились файлы данных — пересобираем все шаблоны")
+            self.data_stamps = data_stamps
+            self.template_stamps = self._scan_templates()
+            for p in self.template_stamps:
+                self.build(p)
+            return {}
+
+        for p, stamp in ready.items():
+            self.template_stamps[p] = stamp
+            self.build(p)
+        return {k: v for k, v in changes.items() if k not in ready}
+
+
+def main():
+    ReportWatcher().run()
+
+
+if __name__ == "__main__":
+    main()
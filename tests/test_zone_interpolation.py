@@ -0,0 +1,69 @@
+# -----------------------------------------------------------
+# Зоны интерполяцией на редкой сетке (ZONE_INTERPOLATION_ENABLED)
+# против перебора *_class_zone_march: расхождение не больше допуска.
+#
+# Допуски — с запасом над наибольшим расхождением на случайных
+# сценариях при ZONE_INTERPOLATION_STEP_FACTOR = 5 (0.4 / 1.0 / 2.0 м):
+# перебор берёт узел с ближайшим округлённым значением, поэтому в
+# пологой части профиля узел может уйти на несколько шагов сетки.
+# -----------------------------------------------------------
+
+import random
+
+import pytest
+
+from calculations.app._fireball import Fireball
+from calculations.app._strait_fire import Strait_fire
+from calculations.app._tvs_explosion import Explosion
+from core.config import ZONE_INTERPOLATION_STEP_FACTOR
+
+POOL_FIRE_TOLERANCE_M = 0.5  # шаг перебора 0.1 м
+FIREBALL_TOLERANCE_M = 1.5  # шаг перебора 0.5 м
+EXPLOSION_TOLERANCE_M = 2.5  # шаг перебора 0.5 м
+
+pytestmark = pytest.mark.skipif(ZONE_INTERPOLATION_STEP_FACTOR != 5,
+                                reason="допуски подобраны для ZONE_INTERPOLATION_STEP_FACTOR = 5")
+
+
+def _max_diff(zones, march) -> float:
+    assert len(zones) == len(march)
+    return max(abs(a - b) for a, b in zip(zones, march))
+
+
+def _pool_fire_cases(n: int):
+    rnd = random.Random(0)
+    # S_spill, m_sg, mol_mass, t_boiling, wind_velocity
+    return [(10 ** rnd.uniform(0, 4), 10 ** rnd.uniform(-2, -0.7), rnd.uniform(16, 200),
+             rnd.uniform(-160, 200), rnd.uniform(0.5, 5)) for _ in range(n)]
+
+
+@pytest.mark.parametrize("case", _pool_fire_cases(60))
+def test_pool_fire(case):
+    sf = Strait_fire()
+    assert _max_diff(sf.termal_class_zone_interpolated(*case),
+                     sf.termal_class_zone_march(*case)) <= POOL_FIRE_TOLERANCE_M
+
+
+@pytest.mark.parametrize("mass", [10 ** random.Random(1).uniform(-1, 5.5) for _ in range(60)])
+@pytest.mark.parametrize("ef", [120, 350])
+def test_fireball(mass, ef):
+    fb = Fireball()
+    assert _max_diff(fb.termal_class_zone_interpolated(mass, ef),
+                     fb.termal_class_zone_march(mass, ef)) <= FIREBALL_TOLERANCE_M
+
+
+@pytest.mark.parametrize("case", [
+    # class_substance, view_space, mass, heat_of_combustion, sigma, energy_level
+    (1, 1, 0.5, 46000, 4, 1),
+    (2, 2, 12, 46000, 7, 1),
+    (3, 2, 1980, 44000, 7, 2),
+    (3, 3, 12547.8, 46000, 4, 2),
+    (4, 4, 350, 44000, 4, 1),
+    (4, 1, 25000, 46000, 7, 2),
+    (2, 4, 2284.5, 46000, 7, 2),
+    (1, 3, 80, 44000, 4, 2),
+])
+def test_explosion(case):
+    ev = Explosion()
+    assert _max_diff(ev.explosion_class_zone_interpolated(*case),
+                     ev.explosion_class_zone_march(*case)) <= EXPLOSION_TOLERANCE_M